@@ -1,5 +1,107 @@
+from collections.abc import Iterable
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication as BaseJWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from accounts.models import User
+from profiles.models import Profile
+
+# bump when cached users become incompatible with the model (e.g. after changing `get_auth_user_fields`)
+AUTH_USER_CACHE_VERSION = 3
+
+
+def get_auth_user_cache_key(user_id: int | str) -> str:
+    return f'accounts:auth_user:{user_id}'
+
+
+def invalidate_auth_user(user_id: int | str) -> None:
+    """
+    Removes cached user right away and once again after the transaction commits,
+    so that concurrent requests cannot cache its outdated state in the meantime.
+    """
+    key = get_auth_user_cache_key(user_id)
+    cache.delete(key, version=AUTH_USER_CACHE_VERSION)
+    transaction.on_commit(lambda: cache.delete(key, version=AUTH_USER_CACHE_VERSION))
+
+
+def invalidate_auth_users(user_ids: Iterable[int | str], *, batch_size: int = 1000) -> None:
+    """
+    Bulk version of `invalidate_auth_user`, e.g. for users deleted without signals.
+    """
+    user_ids = iter(user_ids)
+
+    while batch := list(islice(user_ids, batch_size)):
+        keys = [get_auth_user_cache_key(user_id) for user_id in batch]
+        cache.delete_many(keys, version=AUTH_USER_CACHE_VERSION)
+        transaction.on_commit(lambda keys=keys: cache.delete_many(keys, version=AUTH_USER_CACHE_VERSION))
+
+
+# fields read by permissions, serializers and views, credentials (password, last login) are never cached,
+# listed in the order of model fields, which `Model.from_db` expects
+AUTH_USER_FIELDS = (
+    'id', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active', 'date_joined',
+)
+
+
+def get_auth_user_fields(user: User) -> tuple:
+    return *(getattr(user, field) for field in AUTH_USER_FIELDS), user.profile.pk
+
+
+def build_auth_user(*fields) -> User:
+    """
+    Builds user and its profile out of cached fields, profile's fields other than its id are loaded when accessed.
+    """
+    *user_fields, profile_id = fields
+    user = User.from_db(None, list(AUTH_USER_FIELDS), user_fields)
+    profile = Profile.from_db(None, ['id', 'user_id'], [profile_id, user.pk])
+    User.profile.related.field.set_cached_value(profile, user)
+    User.profile.related.set_cached_value(user, profile)
+    return user
 
 
 class JWTAuthentication(BaseJWTAuthentication):
-    pass
+    """
+    Caches `AUTH_USER_FIELDS` of authenticated users and ids of their profiles in Django's cache,
+    so that authenticating a request and accessing `request.user.username` or `request.user.profile.pk`
+    does not hit the database.
+
+    Neither credentials nor profile data are cached, they are loaded from the database when accessed.
+    Cached fields are invalidated whenever user or profile is saved or deleted (see `accounts.signals`),
+    but only in the cache of the current process, unless a cache shared between processes is configured.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = get_auth_user_cache_key(user_id)
+        fields = cache.get(key, version=AUTH_USER_CACHE_VERSION)
+
+        if fields is None:
+            user = self.get_user_from_db(user_id)
+            fields = get_auth_user_fields(user)
+            cache.set(key, fields, timeout=settings.AUTH_USER_CACHE_TIMEOUT, version=AUTH_USER_CACHE_VERSION)
+        else:
+            user = build_auth_user(*fields)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+    def get_user_from_db(self, user_id: int | str) -> User:
+        queryset = self.user_model.objects.select_related('profile').only(*AUTH_USER_FIELDS, 'profile__id')
+
+        try:
+            return queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
@@ -0,0 +1,125 @@
+import math
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from hashlib import blake2b
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from core.shared.views import bump_versions, get_version
+
+TOKEN_BLACKLIST_VERSION_CACHE_KEY = 'accounts:token_blacklist_version'
+
+
+class BloomFilter:
+    """
+    Probabilistic set of strings: `in` never returns false negatives,
+    false positives happen with (at most) `error_rate` probability until `capacity` items were added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+
+    def _get_positions(self, item: str) -> Iterable[int]:
+        digest = blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return ((h1 + i * h2) % self.size for i in range(self.hashes_count))
+
+    def add(self, item: str) -> None:
+        for position in self._get_positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(item)
+        )
+
+
+class TokenBlacklistFilter:
+    """
+    In-process filter of blacklisted token ids (`jti`), which lets valid tokens skip the blacklist query.
+
+    Tokens blacklisted since the last refresh are loaded every `TOKEN_BLACKLIST_REFRESH_INTERVAL` seconds,
+    or as soon as the blacklist version in cache changes, the whole filter is rebuilt (without expired tokens)
+    every `TOKEN_BLACKLIST_REBUILD_INTERVAL` seconds or when it fills up.
+    Tokens blacklisted by this process bump the version, so that other processes sharing the cache
+    pick them up on their next lookup. Without a shared cache they may be accepted until the next refresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter: BloomFilter | None = None
+        self._last_blacklisted_at: datetime | None = None
+        self._version: str | None = None
+        self._refresh_at = 0.0
+        self._rebuild_at = 0.0
+
+    def might_contain(self, jti: str) -> bool:
+        self.refresh_if_due()
+        return jti in self._filter
+
+    def add(self, jti: str) -> None:
+        self.refresh_if_due()
+
+        with self._lock:
+            self._filter.add(jti)
+
+        bump_versions([TOKEN_BLACKLIST_VERSION_CACHE_KEY])
+
+    def invalidate(self) -> None:
+        """
+        Makes the next lookup rebuild the whole filter.
+        """
+        with self._lock:
+            self._rebuild_at = self._refresh_at = 0.0
+
+    def refresh_if_due(self) -> None:
+        now = time.monotonic()
+        # read before loading tokens, so that tokens blacklisted meanwhile change it again
+        version = get_version(TOKEN_BLACKLIST_VERSION_CACHE_KEY)
+
+        if now < self._refresh_at and version == self._version:
+            return
+
+        with self._lock:
+            if now < self._refresh_at and version == self._version:
+                return
+
+            if now >= self._rebuild_at or self._filter.count >= self._filter.capacity:
+                self._rebuild()
+                self._rebuild_at = now + settings.TOKEN_BLACKLIST_REBUILD_INTERVAL
+            else:
+                self._load(BlacklistedToken.objects.filter(
+                    # overlap covers tokens from transactions committed out of order
+                    blacklisted_at__gte=self._last_blacklisted_at - timedelta(
+                        seconds=settings.TOKEN_BLACKLIST_REFRESH_INTERVAL
+                    )
+                ))
+
+            self._version = version
+            self._refresh_at = now + settings.TOKEN_BLACKLIST_REFRESH_INTERVAL
+
+    def _rebuild(self) -> None:
+        queryset = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        capacity = max(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, 2 * queryset.count())
+        self._filter = BloomFilter(capacity, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        self._last_blacklisted_at = timezone.now()
+        self._load(queryset)
+
+    def _load(self, queryset) -> None:
+        for jti, blacklisted_at in queryset.values_list('token__jti', 'blacklisted_at').iterator():
+            self._filter.add(jti)
+            self._last_blacklisted_at = max(self._last_blacklisted_at, blacklisted_at)
+
+
+token_blacklist_filter = TokenBlacklistFilter()
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired outstanding and blacklisted tokens in chunks.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of outstanding tokens deleted in a single transaction',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        now = timezone.now()
+
+        start_time = time.perf_counter()
+
+        self.stdout.write('Purging expired tokens...')
+        outstanding_count, blacklisted_count = purge_expired_tokens(now, chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged {outstanding_count} outstanding tokens, {blacklisted_count} of them blacklisted.\n'
+        ))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
+
+
+def purge_expired_tokens(now, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[int, int]:
+    """
+    Deletes tokens which expired before `now`, one chunk of primary keys per transaction,
+    so that locks are held briefly and only primary keys of deleted rows are loaded.
+    """
+    expired_pks = OutstandingToken.objects.filter(expires_at__lt=now).order_by('pk').values_list('pk', flat=True)
+    outstanding_count = blacklisted_count = 0
+
+    while chunk := list(expired_pks[:chunk_size]):
+        with transaction.atomic():
+            blacklisted_count += BlacklistedToken.objects.filter(token_id__in=chunk).delete()[0]
+            outstanding_count += OutstandingToken.objects.filter(pk__in=chunk).only('pk').delete()[0]
+
+    return outstanding_count, blacklisted_count
@@ -6,6 +6,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.shared.models import TrackedFieldsMixin
+
 username_validator = UnicodeUsernameValidator()
 
 
@@ -67,6 +69,9 @@ class AbstractUser(AbstractBaseUser, PermissionsMixin):
         return self.first_name
 
 
-class User(AbstractUser):
+class User(TrackedFieldsMixin, AbstractUser):
+    # part of search vectors of user's posts (see `posts.signals`)
+    tracked_fields = ("username",)
+
     class Meta(AbstractUser.Meta):
         swappable = "AUTH_USER_MODEL"
@@ -7,8 +7,13 @@ from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
     TokenBlacklistSerializer as BaseTokenBlacklistSerializer
 )
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import UntypedToken
 
+from accounts.blacklist import token_blacklist_filter
 from accounts.models import User
+from accounts.tokens import RefreshToken
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -80,6 +85,8 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
 
 class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    token_class = RefreshToken
+
     @classmethod
     def get_token(cls, user: User):
         token = super().get_token(user)
@@ -95,6 +102,7 @@ class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
 
 
 class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    token_class = RefreshToken
 
     def validate(self, attrs: dict) -> dict:
         return super().validate(attrs)
@@ -109,7 +117,18 @@ class TokenRefreshSerializer(BaseTokenRefreshSerializer):
 class TokenVerifySerializer(BaseTokenVerifySerializer):
 
     def validate(self, attrs: dict) -> dict:
-        return super().validate(attrs)
+        token = UntypedToken(attrs['token'])
+        jti = token.get(api_settings.JTI_CLAIM)
+
+        if (
+            api_settings.BLACKLIST_AFTER_ROTATION
+            and jti is not None
+            and token_blacklist_filter.might_contain(jti)
+            and BlacklistedToken.objects.filter(token__jti=jti).exists()
+        ):
+            raise serializers.ValidationError("Token is blacklisted")
+
+        return {}
 
     def create(self, validated_data):
         raise NotImplementedError
@@ -119,6 +138,7 @@ class TokenVerifySerializer(BaseTokenVerifySerializer):
 
 
 class TokenBlacklistSerializer(BaseTokenBlacklistSerializer):
+    token_class = RefreshToken
 
     def validate(self, attrs: dict) -> dict:
         return super().validate(attrs)
@@ -1,10 +1,11 @@
 from typing import Any
 
 from django.db.models.base import ModelBase
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from profiles.models import Profile
+from .authentication import invalidate_auth_user
 from .models import User
 
 
@@ -12,3 +13,15 @@ from .models import User
 def create_user_profile(sender: ModelBase, instance: User, created: bool, *args: Any, **kwargs: Any) -> None:
     if instance and created:
         instance.profile = Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender: ModelBase, instance: User, *args: Any, **kwargs: Any) -> None:
+    invalidate_auth_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile_user(sender: ModelBase, instance: Profile, *args: Any, **kwargs: Any) -> None:
+    invalidate_auth_user(instance.user_id)
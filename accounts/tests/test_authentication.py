@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import AUTH_USER_CACHE_VERSION, JWTAuthentication, get_auth_user_cache_key
+from core.shared.factories import UserFactory
+
+
+class JWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.authentication = JWTAuthentication()
+
+    def test_get_user_is_cached(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+
+        with self.assertNumQueries(1):
+            self.authentication.get_user(token)
+
+        with self.assertNumQueries(0):
+            cached_user = self.authentication.get_user(token)
+            self.assertEqual(cached_user, user)
+            self.assertEqual(cached_user.profile, user.profile)
+            self.assertTrue(cached_user.is_active)
+
+    def test_credentials_are_not_cached(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        fields = cache.get(get_auth_user_cache_key(user.pk), version=AUTH_USER_CACHE_VERSION)
+        self.assertEqual(fields[-1], user.profile.pk)
+        self.assertNotIn(user.password, fields)
+
+    def test_authenticated_request_reads_user_fields_without_queries(self):
+        user = UserFactory()
+        request = Request(APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'))
+
+        for expected_queries in (1, 0):
+            with self.assertNumQueries(expected_queries):
+                authenticated_user, _ = self.authentication.authenticate(request)
+                self.assertEqual(authenticated_user.username, user.username)
+                self.assertEqual(authenticated_user.email, user.email)
+                self.assertFalse(authenticated_user.is_staff)
+                self.assertEqual(authenticated_user.profile.pk, user.profile.pk)
+
+    def test_cached_user_loads_credentials_from_db(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        cached_user = self.authentication.get_user(token)
+        self.assertEqual(cached_user.password, user.password)
+        self.assertEqual(cached_user.profile.user, cached_user)
+
+    def test_cached_profile_counters_are_loaded_from_db(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        user.profile.followers.add(UserFactory().profile)
+
+        cached_user = self.authentication.get_user(token)
+        self.assertEqual(cached_user.profile.followers_count, 1)
+
+    def test_user_save_invalidates_cache(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        user.username = 'renamed'
+        user.save()
+
+        with self.assertNumQueries(1):
+            cached_user = self.authentication.get_user(token)
+
+        self.assertEqual(cached_user.username, 'renamed')
+
+    def test_profile_save_invalidates_cache(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        user.profile.bio = 'Updated bio'
+        user.profile.save()
+
+        self.assertEqual(self.authentication.get_user(token).profile.bio, 'Updated bio')
+
+    def test_deactivated_user_is_rejected(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        self.authentication.get_user(token)
+
+        user.is_active = False
+        user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(token)
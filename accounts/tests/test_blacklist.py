@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.blacklist import TOKEN_BLACKLIST_VERSION_CACHE_KEY, BloomFilter, token_blacklist_filter
+from accounts.utils import get_token_for_user, get_tokens_for_user
+from core.shared.factories import UserFactory
+from core.shared.unit_tests import APITestCase
+from core.shared.views import bump_versions
+
+
+class BloomFilterTests(TestCase):
+
+    def test_contains_added_items(self):
+        bloom_filter = BloomFilter(capacity=100, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(100)]
+
+        for item in items:
+            bloom_filter.add(item)
+
+        self.assertTrue(all(item in bloom_filter for item in items))
+        self.assertEqual(bloom_filter.count, 100)
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+
+        for i in range(1000):
+            bloom_filter.add(f'jti-{i}')
+
+        false_positives = sum(f'other-{i}' in bloom_filter for i in range(10_000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistTests(APITestCase):
+    token_refresh_url = reverse_lazy('accounts:token_refresh')
+    logout_url = reverse_lazy('accounts:logout')
+
+    def setUp(self):
+        super().setUp()
+        token_blacklist_filter.invalidate()
+
+    def test_refresh_token_after_logout(self):
+        _, refresh = get_tokens_for_user(UserFactory())
+
+        response = self.client.post(self.logout_url, {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(self.token_refresh_url, {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_not_blacklisted_token_skips_blacklist_query(self):
+        token = get_token_for_user(UserFactory())
+        # filter gets loaded by the first check
+        token.check_blacklist()
+
+        with self.assertNumQueries(0):
+            token.check_blacklist()
+
+    def test_token_blacklisted_by_other_process_is_loaded_on_refresh(self):
+        token = get_token_for_user(UserFactory())
+        token.check_blacklist()
+
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        token_blacklist_filter.invalidate()
+
+        response = self.client.post(self.token_refresh_url, {'refresh': str(token)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_blacklisted_by_other_process_is_loaded_on_version_change(self):
+        token = get_token_for_user(UserFactory())
+        token.check_blacklist()
+
+        # other process blacklists the token and bumps the version in the shared cache
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        bump_versions([TOKEN_BLACKLIST_VERSION_CACHE_KEY])
+
+        response = self.client.post(self.token_refresh_url, {'refresh': str(token)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purge_expired_tokens(self):
+        user = UserFactory()
+        expired_token, blacklisted_expired_token, valid_token = [get_token_for_user(user) for _ in range(3)]
+        blacklisted_expired_token.blacklist()
+        OutstandingToken.objects.filter(
+            jti__in=[expired_token['jti'], blacklisted_expired_token['jti']]
+        ).update(expires_at=timezone.now() - timedelta(days=1))
+
+        call_command('purge_expired_tokens', chunk_size=1, stdout=StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [valid_token['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,19 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from accounts.blacklist import token_blacklist_filter
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token, which queries the blacklist only if its `jti` is (possibly) in the blacklist filter.
+    """
+
+    def check_blacklist(self) -> None:
+        if token_blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        token_blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,6 +1,5 @@
-from rest_framework_simplejwt.tokens import RefreshToken
-
 from accounts.models import User
+from accounts.tokens import RefreshToken
 
 
 def get_tokens_for_user(user: User) -> tuple[str, str]:
@@ -0,0 +1,237 @@
+import contextlib
+import importlib.util
+import json
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, CommandParser, call_command
+
+from accounts.utils import get_tokens_for_user
+from core.management.commands.fabricate_db import fabricate_test_user
+from core.shared.benchmark import (
+    Endpoint,
+    HTTPClient,
+    InProcessClient,
+    compare_with_baseline,
+    get_endpoints,
+    run_endpoint,
+    run_gunicorn,
+)
+from core.shared.factories import DEFAULT_USER_FACTORY_PASSWORD
+from posts.models import Post
+from profiles.models import Profile
+
+MODES = ('in-process', 'http')
+QUERY_STATS_MIDDLEWARE = 'core.shared.middleware.QueryStatsMiddleware'
+DEFAULT_REQUESTS = 50
+DEFAULT_TOLERANCE = 0.2
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures latency percentiles, throughput and SQL queries of the key API endpoints, '
+        'in-process and over a local gunicorn server, optionally comparing them with a baseline.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--mode',
+            choices=MODES,
+            nargs='+',
+            default=['in-process'],
+            help='Run endpoints through Django test client in this process and/or over HTTP to gunicorn',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help='Number of measured requests per endpoint',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Number of concurrent clients in http mode',
+        )
+        parser.add_argument(
+            '--gunicorn-workers',
+            type=int,
+            default=2,
+            help='Number of gunicorn worker processes in http mode',
+        )
+        parser.add_argument(
+            '--endpoints',
+            nargs='+',
+            help='Names of endpoints to run (all by default)',
+        )
+
+        seed_group = parser.add_argument_group('dataset')
+        seed_group.add_argument(
+            '--fabricate',
+            action='store_true',
+            help='Clear fabricated data and fabricate a new dataset (with `fabricate_db --bulk`) before running',
+        )
+        seed_group.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not prompt for confirmation before clearing fabricated data',
+        )
+        seed_group.add_argument(
+            '--profiles',
+            type=int,
+            default=1000,
+            help='Number of fabricated profiles',
+        )
+        seed_group.add_argument(
+            '--posts',
+            type=int,
+            default=5000,
+            help='Number of fabricated posts',
+        )
+        seed_group.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of fabricated data',
+        )
+
+        baseline_group = parser.add_argument_group('baseline')
+        baseline_group.add_argument(
+            '--output',
+            type=Path,
+            help='Write results to that JSON file',
+        )
+        baseline_group.add_argument(
+            '--baseline',
+            type=Path,
+            help='Compare results with that JSON file (written with `--output`), failing on regressions',
+        )
+        baseline_group.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help='Allowed relative increase of p95 latency and decrease of throughput, e.g. 0.2 for 20%%',
+        )
+
+    def handle(self, *args, **options):
+        if 'http' in options['mode'] and importlib.util.find_spec('gunicorn') is None:
+            raise CommandError('gunicorn is required by http mode.')
+
+        if 'http' in options['mode'] and QUERY_STATS_MIDDLEWARE not in settings.MIDDLEWARE:
+            self.stdout.write(self.style.WARNING(
+                'SQL queries are not reported in http mode, settings do not install `QueryStatsMiddleware` '
+                '(e.g. run with `core.settings.dev`).\n'
+            ))
+
+        if options['fabricate'] and options['interactive'] and not self.confirm_fabricate():
+            raise CommandError('Benchmark cancelled.')
+
+        baseline = json.loads(options['baseline'].read_text()) if options['baseline'] else None
+        start_time = time.perf_counter()
+
+        if options['fabricate']:
+            call_command('clear_fabricated_db', fast=True, stdout=self.stdout._out)
+            call_command(
+                'fabricate_db',
+                bulk=True,
+                profiles=options['profiles'],
+                posts=options['posts'],
+                seed=options['seed'],
+                stdout=self.stdout._out,
+            )
+
+        endpoints = self.get_endpoints(options['endpoints'])
+        results = {}
+
+        for mode in options['mode']:
+            self.stdout.write(f'Running endpoints ({mode})...')
+
+            with self.get_clients(mode, options) as get_client:
+                for endpoint in endpoints:
+                    result = run_endpoint(
+                        get_client,
+                        endpoint,
+                        requests=options['requests'],
+                        concurrency=options['concurrency'] if mode == 'http' else 1,
+                    )
+                    results[f'{mode}:{endpoint.name}'] = result
+                    self.stdout.write(format_result(f'{mode}:{endpoint.name}', result))
+
+            self.stdout.write('')
+
+        if options['output']:
+            options['output'].write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}.\n"))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
+
+        if baseline is not None:
+            if regressions := compare_with_baseline(results, baseline, tolerance=options['tolerance']):
+                raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def confirm_fabricate(self) -> bool:
+        confirm = input(
+            'You have requested to clear fabricated data of the database and fabricate a new dataset.\n'
+            'All tags, comments, posts, profiles and users except superusers will be deleted.\n'
+            "Are you sure you want to do this?\n\nType 'yes' to continue, or 'no' to cancel: "
+        )
+        return confirm == 'yes'
+
+    def get_endpoints(self, names: list[str] | None) -> list[Endpoint]:
+        user, profile = fabricate_test_user()
+        self.access_token, refresh_token = get_tokens_for_user(user)
+
+        # the most favourited post and the most followed profile are the hotspots of the dataset
+        post = Post.objects.order_by('-favourites_count', 'pk').first()
+        celebrity = Profile.objects.select_related('user').order_by('-followers_count', 'pk').first()
+
+        if post is None:
+            raise CommandError('There are no posts, fabricate them with `--fabricate` or `fabricate_db`.')
+
+        endpoints = get_endpoints(
+            post_slug=post.slug,
+            username=celebrity.user.username,
+            search_term=post.title.split()[0].strip('.').lower(),
+            email=user.email,
+            password=DEFAULT_USER_FACTORY_PASSWORD,
+            refresh_token=refresh_token,
+        )
+
+        if names is not None:
+            if unknown_names := set(names) - {endpoint.name for endpoint in endpoints}:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown_names))}.")
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in names]
+
+        return endpoints
+
+    def get_clients(self, mode: str, options: dict[str, Any]) -> contextlib.AbstractContextManager:
+        """
+        Returns context manager of a factory of clients of the mode, which runs the server if needed.
+        """
+        if mode == 'in-process':
+            return contextlib.nullcontext(lambda: InProcessClient(self.access_token))
+
+        return http_clients(workers=options['gunicorn_workers'], access_token=self.access_token)
+
+
+@contextlib.contextmanager
+def http_clients(*, workers: int, access_token: str) -> Iterator[Callable[[], HTTPClient]]:
+    with run_gunicorn(workers=workers) as base_url:
+        yield lambda: HTTPClient(base_url, access_token)
+
+
+def format_result(name: str, result: dict[str, Any]) -> str:
+    queries = '-' if result['queries'] is None else f"{result['queries']} queries ({result['query_ms']} ms)"
+    return (
+        f"  {name:<30} p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+        f"{result['throughput_rps']:>8} rps  {queries}  {result['errors']} errors"
+    )
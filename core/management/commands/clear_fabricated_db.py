@@ -1,17 +1,45 @@
 import time
+from collections import Counter
 
-from django.core.management import BaseCommand
-from django.db import transaction
+from django.core.management import BaseCommand, CommandParser
+from django.db import connections, transaction
+from django.db.models import Max, Min, QuerySet
 
+from accounts.authentication import invalidate_auth_users
 from accounts.models import User
+from core.management.commands.recount_stats import recount_in_chunks
+from core.shared.deletion import fast_delete, is_truncate_safe, truncate
+from core.shared.views import bump_viewer_versions
 from posts.models import Post, Comment, Tag
 from profiles.models import Profile
 
+DEFAULT_CHUNK_SIZE = 10_000
+
 
 class Command(BaseCommand):
 
-    @transaction.atomic
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='Delete rows with raw bulk deletes (or TRUNCATE on PostgreSQL), '
+                 'without loading them or sending signals',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of rows (by primary key range) deleted in a single transaction in fast mode',
+        )
+
     def handle(self, *args, **options):
+        if options['fast']:
+            return self.handle_fast(chunk_size=options['chunk_size'])
+
+        self.handle_collected()
+
+    @transaction.atomic
+    def handle_collected(self) -> None:
         start_time = time.perf_counter()
 
         self.stdout.write('Clearing tags...')
@@ -38,3 +66,82 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
         )
+
+    def handle_fast(self, *, chunk_size: int) -> None:
+        """
+        Deletes models in order of their dependencies, rows referencing deleted ones (e.g. through tables
+        of many-to-many relations) first. Tables are truncated on PostgreSQL when all of their rows go
+        and truncation cascades exactly like deletion would, otherwise rows are deleted in chunks.
+        Signals are not sent, so caches and counters of remaining (superusers') profiles are refreshed at the end.
+        """
+        start_time = time.perf_counter()
+        # unfiltered querysets can be truncated
+        keeps_superusers = User.objects.filter(is_superuser=True).exists()
+        profiles = Profile.objects.filter(user__is_superuser=False) if keeps_superusers else Profile.objects.all()
+        users = User.objects.filter(is_superuser=False) if keeps_superusers else User.objects.all()
+        querysets = [
+            ('tags', Tag.objects.all()),
+            ('comments', Comment.objects.all()),
+            ('posts', Post.objects.all()),
+            ('profiles', profiles),
+            ('users', users),
+        ]
+
+        for name, queryset in querysets:
+            self.stdout.write(f'Clearing {name}...')
+            step_start_time = time.perf_counter()
+
+            if name == 'users':
+                invalidate_auth_users(queryset.values_list('pk', flat=True).iterator(chunk_size=chunk_size))
+
+            if can_truncate(queryset):
+                count = queryset.count()
+                with transaction.atomic():
+                    truncate(queryset.model, using=queryset.db)
+                deleted = Counter({queryset.model._meta.label: count})
+            else:
+                deleted = self.delete_in_chunks(queryset, chunk_size=chunk_size)
+
+            duration = time.perf_counter() - step_start_time
+            count = deleted[queryset.model._meta.label]
+            self.stdout.write(self.style.SUCCESS(
+                f'Cleared {count} {name} ({sum(deleted.values())} rows in total, '
+                f'{sum(deleted.values()) / max(duration, 1e-6):.0f} rows/s).\n'
+            ))
+
+        self.stdout.write('Refreshing remaining profiles...')
+        remaining_profile_ids = list(Profile.objects.values_list('pk', flat=True))
+        recount_in_chunks(Profile.objects.all(), chunk_size=chunk_size)
+        bump_viewer_versions(remaining_profile_ids)
+        invalidate_auth_users(User.objects.values_list('pk', flat=True))
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {len(remaining_profile_ids)} profiles.\n'))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
+
+    def delete_in_chunks(self, queryset: QuerySet, *, chunk_size: int) -> Counter[str]:
+        deleted = Counter()
+        bounds = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+
+        if bounds['min_pk'] is None:
+            return deleted
+
+        for lower_pk in range(bounds['min_pk'], bounds['max_pk'] + 1, chunk_size):
+            with transaction.atomic():
+                deleted.update(fast_delete(queryset.filter(pk__gte=lower_pk, pk__lt=lower_pk + chunk_size)))
+
+            self.stdout.write(
+                f'  {deleted[queryset.model._meta.label]} rows deleted, up to primary key {lower_pk + chunk_size - 1}'
+            )
+
+        return deleted
+
+
+def can_truncate(queryset: QuerySet) -> bool:
+    return (
+        connections[queryset.db].vendor == 'postgresql'
+        and not queryset.query.where
+        and is_truncate_safe(queryset.model)
+    )
@@ -1,14 +1,24 @@
+import random
 import time
+from typing import Any
 
-from django.core.management import BaseCommand, CommandParser
+from django.core.management import BaseCommand, CommandError, CommandParser, call_command
 from django.db import transaction
 
 from accounts.models import User
+from core.shared import fabrication, social_graph
 from core.shared.factories import UserFactory, PostFactory
 from posts.models import Post
 from profiles.models import Profile
 
 DEFAULT_POSTS_COUNT = 10
+DEFAULT_PROFILES_COUNT = 100
+DEFAULT_TAGS_COUNT = 50
+DEFAULT_COMMENTS_PER_POST = 2
+DEFAULT_FOLLOWS_PER_PROFILE = 10
+DEFAULT_FAVOURITES_PER_PROFILE = 5
+DEFAULT_THUMBNAILS_COUNT = 5
+GRAPH_DISTRIBUTIONS = ('power-law', 'uniform')
 
 
 class Command(BaseCommand):
@@ -20,8 +30,84 @@ class Command(BaseCommand):
             default=DEFAULT_POSTS_COUNT,
             help='Number of posts to fabricate',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Fabricate profiles, posts, tags, comments, follows and favourites with bulk inserts',
+        )
+
+        bulk_group = parser.add_argument_group('bulk mode')
+        bulk_group.add_argument(
+            '--profiles',
+            type=int,
+            default=DEFAULT_PROFILES_COUNT,
+            help='Number of users with profiles to fabricate',
+        )
+        bulk_group.add_argument(
+            '--tags',
+            type=int,
+            default=DEFAULT_TAGS_COUNT,
+            help='Number of tags to fabricate',
+        )
+        bulk_group.add_argument(
+            '--comments-per-post',
+            type=int,
+            default=DEFAULT_COMMENTS_PER_POST,
+            help='Average number of comments of a post',
+        )
+        bulk_group.add_argument(
+            '--follows-per-profile',
+            type=int,
+            default=DEFAULT_FOLLOWS_PER_PROFILE,
+            help='Average number of profiles followed by a profile',
+        )
+        bulk_group.add_argument(
+            '--graph-distribution',
+            choices=GRAPH_DISTRIBUTIONS,
+            default='power-law',
+            help='Distribution of follows and favourites, `power-law` makes celebrity authors and heavy followers',
+        )
+        bulk_group.add_argument(
+            '--graph-exponent',
+            type=float,
+            default=social_graph.DEFAULT_EXPONENT,
+            help='Exponent of power-law degree distributions, lower exponents make bigger hotspots',
+        )
+        bulk_group.add_argument(
+            '--favourites-per-profile',
+            type=int,
+            default=DEFAULT_FAVOURITES_PER_PROFILE,
+            help='Average number of posts in favourites of a profile',
+        )
+        bulk_group.add_argument(
+            '--thumbnails',
+            type=int,
+            default=DEFAULT_THUMBNAILS_COUNT,
+            help='Number of images in the pool of thumbnails shared by posts',
+        )
+        bulk_group.add_argument(
+            '--chunk-size',
+            type=int,
+            default=fabrication.DEFAULT_CHUNK_SIZE,
+            help='Number of rows inserted in a single transaction',
+        )
+        bulk_group.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Number of processes generating text, 0 generates it in the current process',
+        )
+        bulk_group.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of random data',
+        )
 
     def handle(self, *args, **options):
+        if options['bulk']:
+            return self.handle_bulk(**options)
+
         posts_count = options['posts']
 
         start_time = time.perf_counter()
@@ -40,6 +126,101 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR('\nERROR: Rolling back...'))
             raise e
 
+    def handle_bulk(self, **options: Any) -> None:
+        """
+        Inserts rows in chunks, one transaction per chunk, so that memory usage does not grow with the counts.
+        Denormalized counters, search vectors and feeds are rebuilt once all rows are inserted.
+        """
+        if options['graph_exponent'] <= 1:
+            raise CommandError('Graph exponent has to be greater than 1.')
+
+        start_time = time.perf_counter()
+        rng = random.Random(options['seed'])
+        chunk_kwargs = {'chunk_size': options['chunk_size'], 'workers': options['workers']}
+
+        self.stdout.write('Fabricating profiles...')
+        user, profile = fabricate_test_user()
+        profile_ids = [
+            profile.pk, *fabrication.fabricate_profiles(options['profiles'], seed=options['seed'], **chunk_kwargs)
+        ]
+        self.stdout.write(self.style.SUCCESS(f'Fabricated {len(profile_ids) - 1} profiles.\n'))
+
+        self.stdout.write('Fabricating tags and thumbnails...')
+        tag_ids = fabrication.fabricate_tags(options['tags'], rng=rng)
+        thumbnail_names = fabrication.fabricate_thumbnails(options['thumbnails'], rng=rng)
+        self.stdout.write(self.style.SUCCESS(
+            f'Fabricated {len(tag_ids)} tags and {len(thumbnail_names)} thumbnails.\n'
+        ))
+
+        self.stdout.write('Fabricating posts...')
+        posts = fabrication.fabricate_posts(
+            options['posts'],
+            author_ids=profile_ids,
+            tag_ids=tag_ids,
+            thumbnail_names=thumbnail_names,
+            rng=rng,
+            seed=options['seed'],
+            **chunk_kwargs,
+        )
+        post_ids = [post_id for post_id, author_id in posts]
+        self.stdout.write(self.style.SUCCESS(f'Fabricated {len(post_ids)} posts.\n'))
+
+        self.stdout.write('Fabricating comments...')
+        comments_count = fabrication.fabricate_comments(
+            options['comments_per_post'],
+            post_ids=post_ids,
+            author_ids=profile_ids,
+            rng=rng,
+            seed=options['seed'],
+            **chunk_kwargs,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Fabricated {comments_count} comments.\n'))
+
+        self.stdout.write('Fabricating follows and favourites...')
+        if options['graph_distribution'] == 'power-law':
+            follows_count, favourites_count = social_graph.fabricate_social_graph(
+                profile_ids,
+                posts,
+                follows_per_profile=options['follows_per_profile'],
+                favourites_per_profile=options['favourites_per_profile'],
+                exponent=options['graph_exponent'],
+                seed=options['seed'],
+                chunk_size=options['chunk_size'],
+            )
+        else:
+            follows_count = fabrication.fabricate_follows(
+                options['follows_per_profile'],
+                profile_ids=profile_ids,
+                rng=rng,
+                chunk_size=options['chunk_size'],
+            )
+            favourites_count = fabrication.fabricate_favourites(
+                options['favourites_per_profile'],
+                profile_ids=profile_ids,
+                post_ids=post_ids,
+                rng=rng,
+                chunk_size=options['chunk_size'],
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Fabricated {follows_count} follows and {favourites_count} favourites.\n'
+        ))
+
+        self.stdout.write('Processing thumbnails...')
+        fabrication.process_fabricated_thumbnails(thumbnail_names)
+        self.stdout.write(self.style.SUCCESS(f'Processed {len(thumbnail_names)} thumbnails.\n'))
+
+        self.stdout.write('Updating search vectors...')
+        fabrication.update_search_vectors_in_chunks(Post.objects.all(), chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS('Updated search vectors.\n'))
+
+        # signals, which maintain counters and feeds, are not sent by bulk inserts
+        call_command('recount_stats', stdout=self.stdout._out, chunk_size=options['chunk_size'])
+        call_command('rebuild_feeds', stdout=self.stdout._out)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {time.perf_counter() - start_time:.2f} seconds.')
+        )
+
 
 def fabricate_test_user(email: str = "test@example.com", username: str = "test") -> tuple[User, Profile]:
     user = User.objects.filter(email=email).first()
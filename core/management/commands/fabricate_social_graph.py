@@ -0,0 +1,76 @@
+import time
+
+from django.core.management import BaseCommand, CommandError, CommandParser, call_command
+
+from core.shared.fabrication import DEFAULT_CHUNK_SIZE
+from core.shared.social_graph import DEFAULT_EXPONENT, fabricate_social_graph
+from posts.models import Post
+from profiles.models import Profile
+
+DEFAULT_FOLLOWS_PER_PROFILE = 10
+DEFAULT_FAVOURITES_PER_PROFILE = 5
+
+
+class Command(BaseCommand):
+    help = 'Fabricates power-law follow graph and favourites of existing profiles and posts.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--follows-per-profile',
+            type=float,
+            default=DEFAULT_FOLLOWS_PER_PROFILE,
+            help='Average number of profiles followed by a profile',
+        )
+        parser.add_argument(
+            '--favourites-per-profile',
+            type=float,
+            default=DEFAULT_FAVOURITES_PER_PROFILE,
+            help='Average number of posts in favourites of a profile',
+        )
+        parser.add_argument(
+            '--exponent',
+            type=float,
+            default=DEFAULT_EXPONENT,
+            help='Exponent of power-law degree distributions, lower exponents make bigger hotspots',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the graph, the same seed gives the same graph of the same profiles and posts',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of rows inserted in a single transaction',
+        )
+
+    def handle(self, *args, **options):
+        if options['exponent'] <= 1:
+            raise CommandError('Exponent has to be greater than 1.')
+
+        start_time = time.perf_counter()
+
+        self.stdout.write('Fabricating follows and favourites...')
+        follows_count, favourites_count = fabricate_social_graph(
+            list(Profile.objects.order_by('pk').values_list('pk', flat=True)),
+            list(Post.objects.order_by('pk').values_list('pk', 'author_id')),
+            follows_per_profile=options['follows_per_profile'],
+            favourites_per_profile=options['favourites_per_profile'],
+            exponent=options['exponent'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Fabricated {follows_count} follows and {favourites_count} favourites.\n'
+        ))
+
+        # signals, which maintain counters and feeds, are not sent by bulk inserts
+        call_command('recount_stats', stdout=self.stdout._out, chunk_size=options['chunk_size'])
+        call_command('rebuild_feeds', stdout=self.stdout._out)
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from posts.models import Post
+from posts.thumbnails import generate_thumbnail_variants
+
+
+class Command(BaseCommand):
+    help = 'Generates missing or outdated resized variants of posts thumbnails.'
+
+    def handle(self, *args, **options):
+        start_time = time.perf_counter()
+
+        self.stdout.write('Processing thumbnails...')
+        post_ids = Post.objects.exclude(
+            Q(thumbnail='') | Q(thumbnail=None)
+        ).order_by('pk').values_list('pk', flat=True)
+
+        processed_count = 0
+        for post_id in post_ids.iterator():
+            generate_thumbnail_variants(post_id)
+            processed_count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed thumbnails of {processed_count} posts.\n'))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
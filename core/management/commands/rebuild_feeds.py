@@ -0,0 +1,39 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from profiles.models import FeedEntry, Profile
+from profiles.models.feed import get_fan_out_limit
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds materialized home feeds of all profiles from follows.'
+
+    def handle(self, *args, **options):
+        start_time = time.perf_counter()
+        Follows = Profile.followed.through
+
+        self.stdout.write('Deleting feed entries...')
+        deleted, _ = FeedEntry.objects.all().delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} feed entries.\n'))
+
+        self.stdout.write('Fanning out posts...')
+        author_pks = Profile.objects.filter(
+            followers_count__gt=0,
+            followers_count__lt=get_fan_out_limit(),
+        ).values_list('pk', flat=True)
+
+        for author_pk in author_pks.iterator():
+            with transaction.atomic():
+                FeedEntry.objects.backfill(
+                    Follows.objects.filter(to_profile_id=author_pk).values_list('from_profile_id', flat=True),
+                    [author_pk],
+                )
+
+        self.stdout.write(self.style.SUCCESS(f'Created {FeedEntry.objects.count()} feed entries.\n'))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
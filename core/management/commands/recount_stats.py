@@ -0,0 +1,61 @@
+import time
+
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Max, Min
+
+from posts.models import Post
+from profiles.models import Profile
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds denormalized counters of profiles and posts, repairing any drift.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of rows recounted in a single UPDATE',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        start_time = time.perf_counter()
+
+        self.stdout.write('Recounting profiles stats...')
+        profiles_count = recount_in_chunks(Profile.objects.all(), chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(f'Recounted stats of {profiles_count} profiles.\n'))
+
+        self.stdout.write('Recounting posts stats...')
+        posts_count = recount_in_chunks(Post.objects.all(), chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(f'Recounted stats of {posts_count} posts.\n'))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
+
+
+def recount_in_chunks(queryset, *counters: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Calls `recount_stats` on consecutive primary key ranges of the queryset,
+    so that each UPDATE locks a bounded number of rows.
+    """
+    bounds = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+
+    if bounds['min_pk'] is None:
+        return 0
+
+    updated = 0
+
+    for lower_pk in range(bounds['min_pk'], bounds['max_pk'] + 1, chunk_size):
+        with transaction.atomic():
+            updated += queryset.filter(
+                pk__gte=lower_pk, pk__lt=lower_pk + chunk_size
+            ).recount_stats(*counters)
+
+    return updated
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+
+from posts.markdown import BODY_HTML_VERSION, render_body_html
+from posts.models import Post
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Renders HTML of posts bodies rendered by an outdated renderer (or of all posts).'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Render bodies of all posts, not only of outdated ones',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of posts rendered and updated in a single transaction',
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.perf_counter()
+
+        queryset = Post.objects.all()
+        if not options['all']:
+            queryset = queryset.exclude(body_html_version=BODY_HTML_VERSION)
+
+        self.stdout.write('Rendering posts bodies...')
+        rendered_count = render_bodies_in_chunks(queryset, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rendered bodies of {rendered_count} posts.\n'))
+
+        end_time = time.perf_counter()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done in {end_time - start_time:.2f} seconds.')
+        )
+
+
+def render_bodies_in_chunks(queryset, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Renders bodies of posts from the queryset, one chunk of primary keys per transaction.
+    Only bodies are loaded and only rendered HTML is updated, so `updated_at` of posts does not change.
+    """
+    queryset = queryset.only('pk', 'body').order_by('pk')
+    rendered_count = 0
+    last_pk = 0
+
+    while chunk := list(queryset.filter(pk__gt=last_pk)[:chunk_size]):
+        for post in chunk:
+            post.body_html = render_body_html(post.body)
+            post.body_html_version = BODY_HTML_VERSION
+
+        with transaction.atomic():
+            Post.objects.bulk_update(chunk, ['body_html', 'body_html_version'])
+
+        rendered_count += len(chunk)
+        last_pk = chunk[-1].pk
+
+    return rendered_count
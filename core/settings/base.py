@@ -133,6 +133,10 @@ AUTH_USER_MODEL = 'accounts.User'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# posts of authors with at least that many followers are pulled into home feeds on read,
+# instead of being copied into the feed of every follower
+FEED_FAN_OUT_MAX_FOLLOWERS = 10_000
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         ('rest_framework.permissions.IsAuthenticated',)
@@ -146,6 +150,22 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
 
+    # orjson renderer is selected with `Accept: application/json; encoder=orjson`,
+    # so it has to come before the default JSON renderer, which accepts any parameters
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.shared.renderers.ORJSONRenderer',
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+
+    # orjson parser comes first to handle `application/json`, DRF's parser stays registered next to it
+    'DEFAULT_PARSER_CLASSES': (
+        'core.shared.parsers.ORJSONParser',
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
@@ -161,6 +181,36 @@ SPECTACULAR_SETTINGS = {
     # OTHER SETTINGS
 }
 
+# widths of resized post thumbnails (see `posts.thumbnails`), generated by that many worker threads,
+# 0 generates them synchronously after the transaction commits
+THUMBNAIL_VARIANT_WIDTHS = (320, 640, 1280)
+THUMBNAIL_WORKERS = 2
+# limits of thumbnails uploaded to `POST /api/posts/<slug>/thumbnail/`
+THUMBNAIL_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+THUMBNAIL_MAX_DIMENSIONS = (4096, 4096)
+
+# fields of authenticated users are cached for that many seconds (see `accounts.authentication`),
+# invalidations reach only the current process unless a cache shared between processes is configured,
+# so the timeout bounds how long other processes may accept deactivated users
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# rendered post and profile responses are cached by their ETags for that many seconds (see `core.shared.views`),
+# deployments with multiple processes need a cache shared between them, so that invalidations reach every process
+RENDERED_RESPONSE_CACHE_TIMEOUT = 60 * 5
+# viewer independent documents of posts and comments are cached for that many seconds (see `core.shared.serializers`)
+SERIALIZED_DOCUMENT_CACHE_TIMEOUT = 60 * 60
+# list pages of viewsets registering values serializers are serialized straight from values() rows
+# instead of model instances (see `core.shared.values`), turning it off serializes every page with model serializers
+VALUES_SERIALIZERS_ENABLED = True
+
+# blacklisted refresh tokens are looked up in an in-process bloom filter (see `accounts.blacklist`),
+# tokens blacklisted by other processes are picked up once they bump the blacklist version in a shared cache,
+# or after at most that many seconds without one
+TOKEN_BLACKLIST_REFRESH_INTERVAL = 30
+TOKEN_BLACKLIST_REBUILD_INTERVAL = 60 * 60
+TOKEN_BLACKLIST_FILTER_CAPACITY = 100_000
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = 0.01
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
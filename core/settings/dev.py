@@ -17,6 +17,12 @@ DATABASES = {
     }
 }
 
+# number and duration of SQL queries of requests are reported in response headers (see `core.shared.middleware`),
+# enabled by `benchmark_api` command for its gunicorn server
+MIDDLEWARE = ['core.shared.middleware.QueryStatsMiddleware', *MIDDLEWARE]
+
+QUERY_STATS_HEADERS = bool(os.environ.get('QUERY_STATS_HEADERS'))
+
 DEBUG_AUTHENTICATION_CLASSES = (
     'rest_framework.authentication.SessionAuthentication',
     'rest_framework.authentication.BasicAuthentication',
@@ -0,0 +1,263 @@
+import contextlib
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.test import Client
+
+from core.shared.middleware import QUERY_COUNT_HEADER, QUERY_DURATION_HEADER
+from core.shared.query_stats import QueryStats
+
+PERCENTILES = (50, 95, 99)
+GUNICORN_STARTUP_TIMEOUT = 30
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    path: str
+    data: dict[str, Any] | None = None
+    authenticated: bool = False
+
+
+class Measurement(NamedTuple):
+    status: int
+    duration: float
+    query_count: int | None
+    query_duration: float | None
+
+
+def get_endpoints(
+        *,
+        post_slug: str,
+        username: str,
+        search_term: str,
+        email: str,
+        password: str,
+        refresh_token: str,
+) -> list[Endpoint]:
+    return [
+        Endpoint('posts-list', 'GET', '/api/posts/'),
+        Endpoint('posts-feed', 'GET', '/api/posts/feed/', authenticated=True),
+        Endpoint('posts-favourites', 'GET', '/api/posts/favourites/', authenticated=True),
+        Endpoint('posts-search', 'GET', f'/api/posts/?search={search_term}'),
+        Endpoint('post-detail', 'GET', f'/api/posts/{post_slug}/', authenticated=True),
+        Endpoint('post-comments', 'GET', f'/api/posts/{post_slug}/comments/'),
+        Endpoint('profile-detail', 'GET', f'/api/profiles/{username}/', authenticated=True),
+        Endpoint('profile-followers', 'GET', f'/api/profiles/{username}/followers/', authenticated=True),
+        Endpoint('token-obtain', 'POST', '/api/auth/token/', {'email': email, 'password': password}),
+        Endpoint('token-refresh', 'POST', '/api/auth/token/refresh/', {'refresh': refresh_token}),
+    ]
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Returns percentile of sorted values, linearly interpolated between the closest ranks.
+    """
+    if not sorted_values:
+        return math.nan
+
+    rank = (len(sorted_values) - 1) * percent / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize(measurements: Sequence[Measurement], elapsed: float) -> dict[str, Any]:
+    durations = sorted(measurement.duration for measurement in measurements)
+    query_counts = [m.query_count for m in measurements if m.query_count is not None]
+    query_durations = [m.query_duration for m in measurements if m.query_duration is not None]
+
+    return {
+        'requests': len(measurements),
+        'errors': sum(measurement.status >= 400 for measurement in measurements),
+        **{f'p{percent}_ms': round(percentile(durations, percent) * 1000, 3) for percent in PERCENTILES},
+        'throughput_rps': round(len(measurements) / elapsed, 2) if elapsed else None,
+        'queries': round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+        'query_ms': round(sum(query_durations) / len(query_durations) * 1000, 3) if query_durations else None,
+    }
+
+
+def get_allowed_host() -> str:
+    # `localhost` is allowed if `ALLOWED_HOSTS` is empty and `DEBUG` is on
+    host = next((host for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+    return host.lstrip('.')
+
+
+class InProcessClient:
+    """
+    Sends requests through Django's test client in the current process, counting their SQL queries.
+    """
+
+    def __init__(self, access_token: str):
+        self.client = Client(HTTP_HOST=get_allowed_host())
+        self.access_token = access_token
+
+    def request(self, endpoint: Endpoint) -> Measurement:
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.access_token}'} if endpoint.authenticated else {}
+        data = json.dumps(endpoint.data) if endpoint.data is not None else ''
+
+        with QueryStats() as stats:
+            start_time = time.perf_counter()
+            response = self.client.generic(
+                endpoint.method, endpoint.path, data, content_type='application/json', **headers
+            )
+            duration = time.perf_counter() - start_time
+
+        return Measurement(response.status_code, duration, stats.count, stats.duration)
+
+
+class HTTPClient:
+    """
+    Sends requests to a running server, which reports SQL queries in headers (see `QueryStatsMiddleware`).
+    """
+
+    def __init__(self, base_url: str, access_token: str):
+        self.base_url = base_url.rstrip('/')
+        self.access_token = access_token
+
+    def request(self, endpoint: Endpoint) -> Measurement:
+        headers = {'Content-Type': 'application/json'}
+        if endpoint.authenticated:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+
+        request = urllib.request.Request(
+            f'{self.base_url}{endpoint.path}',
+            data=json.dumps(endpoint.data).encode() if endpoint.data is not None else None,
+            headers=headers,
+            method=endpoint.method,
+        )
+        start_time = time.perf_counter()
+
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            status, response_headers = error.code, error.headers
+
+        duration = time.perf_counter() - start_time
+        query_count = response_headers.get(QUERY_COUNT_HEADER)
+        query_duration = response_headers.get(QUERY_DURATION_HEADER)
+
+        return Measurement(
+            status,
+            duration,
+            int(query_count) if query_count is not None else None,
+            float(query_duration) / 1000 if query_duration is not None else None,
+        )
+
+
+def run_endpoint(
+        get_client: Callable[[], InProcessClient | HTTPClient],
+        endpoint: Endpoint, *,
+        requests: int,
+        concurrency: int = 1,
+        warmup: int = 1,
+) -> dict[str, Any]:
+    """
+    Sends `warmup` requests which are not measured (e.g. to fill caches), then `requests` requests
+    from `concurrency` threads, each with its own client. Returns summary of measured requests.
+    """
+    local = threading.local()
+
+    def send(_: int) -> Measurement:
+        if not hasattr(local, 'client'):
+            local.client = get_client()
+        return local.client.request(endpoint)
+
+    for index in range(warmup):
+        send(index)
+
+    start_time = time.perf_counter()
+
+    if concurrency <= 1:
+        measurements = [send(index) for index in range(requests)]
+    else:
+        with ThreadPoolExecutor(concurrency) as executor:
+            measurements = list(executor.map(send, range(requests)))
+
+    return summarize(measurements, time.perf_counter() - start_time)
+
+
+def compare_with_baseline(
+        results: dict[str, dict[str, Any]],
+        baseline: dict[str, dict[str, Any]], *,
+        tolerance: float,
+) -> list[str]:
+    """
+    Returns descriptions of regressions against the baseline: p95 latency higher or throughput lower
+    by more than `tolerance` (a fraction), or any increase of the number of queries or errors.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+
+        if base.get('p95_ms') and result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 latency {result['p95_ms']} ms (baseline {base['p95_ms']} ms)")
+
+        if base.get('throughput_rps') and result['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput_rps']} rps (baseline {base['throughput_rps']} rps)"
+            )
+
+        if base.get('queries') is not None and result['queries'] is not None and result['queries'] > base['queries']:
+            regressions.append(f"{name}: {result['queries']} queries (baseline {base['queries']})")
+
+        if result['errors'] > base.get('errors', 0):
+            regressions.append(f"{name}: {result['errors']} errors (baseline {base.get('errors', 0)})")
+
+    return regressions
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def run_gunicorn(*, workers: int, port: int = None) -> Iterator[str]:
+    """
+    Runs gunicorn server of the project and yields its base url.
+    `QueryStatsMiddleware` is enabled, if it is installed by the settings (e.g. `core.settings.dev`).
+    """
+    port = port or get_free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'core.wsgi', '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        env={**os.environ, 'QUERY_STATS_HEADERS': '1'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        deadline = time.monotonic() + GUNICORN_STARTUP_TIMEOUT
+
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with code {process.returncode}.')
+
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError('gunicorn did not start in time.')
+                time.sleep(0.2)
+
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,79 @@
+from collections import Counter
+
+from django.db import connections, models
+from django.db.models import QuerySet
+
+
+class UnsupportedDeletionError(Exception):
+    pass
+
+
+def get_reverse_relations(model: type[models.Model]) -> list[models.ForeignObjectRel]:
+    """
+    Returns foreign keys (including ones of many-to-many through tables) referencing the model.
+    """
+    return [
+        relation for relation in model._meta.get_fields(include_hidden=True)
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+    ]
+
+
+def fast_delete(queryset: QuerySet, *, path: tuple[type[models.Model], ...] = ()) -> Counter[str]:
+    """
+    Deletes rows of the queryset with raw DELETE statements, without loading them or sending signals.
+
+    Rows referencing them are handled first, according to `on_delete` of their foreign keys: cascaded rows
+    are deleted (recursively), SET_NULL ones are detached, other behaviours raise `UnsupportedDeletionError`.
+    Returns numbers of deleted rows per model label, like `QuerySet.delete()`.
+    """
+    model = queryset.model
+
+    if model in path:
+        raise UnsupportedDeletionError(f'Cyclic relations of `{model._meta.label}` are not supported.')
+
+    deleted = Counter()
+
+    for relation in get_reverse_relations(model):
+        field = relation.field
+        referencing = relation.related_model._base_manager.filter(**{
+            f'{field.name}__in': queryset.values(field.target_field.attname)
+        })
+
+        if relation.on_delete is models.CASCADE:
+            deleted.update(fast_delete(referencing, path=(*path, model)))
+        elif relation.on_delete is models.SET_NULL:
+            referencing.update(**{field.name: None})
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise UnsupportedDeletionError(
+                f'`{relation.related_model._meta.label}.{field.name}` ({relation.on_delete.__name__}) '
+                f'is not supported.'
+            )
+
+    deleted[model._meta.label] += queryset._raw_delete(queryset.db)
+    return deleted
+
+
+def is_truncate_safe(model: type[models.Model]) -> bool:
+    """
+    Whether `TRUNCATE ... CASCADE` of the model's table deletes exactly the rows, which deleting all
+    of its rows would delete: every table referencing it (recursively) has to cascade deletes.
+    """
+    return all(
+        relation.on_delete is models.CASCADE and (
+            relation.related_model is model or is_truncate_safe(relation.related_model)
+        )
+        for relation in get_reverse_relations(model)
+    )
+
+
+def truncate(model: type[models.Model], *, using: str = 'default') -> None:
+    """
+    Empties the model's table and all tables referencing it with `TRUNCATE ... CASCADE` (PostgreSQL only).
+    """
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        # pending checks of deferred foreign keys (of rows written in the same transaction) block truncation
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f'TRUNCATE TABLE {connection.ops.quote_name(model._meta.db_table)} CASCADE')
+        cursor.execute('SET CONSTRAINTS ALL DEFERRED')
@@ -0,0 +1,15 @@
+from django.db.models import IntegerField, QuerySet, Subquery
+
+
+class SubqueryCount(Subquery):
+    """
+    Counts rows of a (usually correlated with `OuterRef`) queryset in a subquery.
+
+    Unlike `Count` over a joined relation, it does not multiply rows of the outer
+    query, so many counters can be annotated on the same queryset.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+    def __init__(self, queryset: QuerySet, **kwargs):
+        super().__init__(queryset.order_by().values('pk'), **kwargs)
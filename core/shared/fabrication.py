@@ -0,0 +1,370 @@
+import multiprocessing
+import random
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import Max, Min, Model
+from faker import Faker
+from mdgen import generator as mdgen_generator
+from mdgen import MarkdownPostProvider
+from PIL import Image
+
+from accounts.models import User
+from core.shared.factories import DEFAULT_USER_FACTORY_PASSWORD
+from posts.markdown import BODY_HTML_VERSION, render_body_html
+from posts.models import Comment, Post, Tag
+from posts.thumbnails import generate_thumbnail_variants
+from profiles.models import Profile
+
+DEFAULT_CHUNK_SIZE = 5000
+FABRICATED_THUMBNAILS_DIRECTORY = 'uploads/thumbnails/fabricated'
+
+NON_WORD_PATTERN = re.compile(r'\W')
+
+
+def get_faker(seed: int) -> Faker:
+    faker = Faker()
+    faker.add_provider(MarkdownPostProvider)
+    faker.seed_instance(seed)
+    return faker
+
+
+@contextmanager
+def seeded_markdown_generator(faker: Faker, rng: random.Random) -> Iterator[None]:
+    """
+    Makes the markdown provider draw from `faker` and `rng` instead of its module-level generators,
+    so that generated posts are repeatable without reseeding the process-global `random` and `Faker`.
+    """
+
+    previous_random, previous_faker = mdgen_generator.random, mdgen_generator._fake
+    mdgen_generator.random, mdgen_generator._fake = rng, faker
+    try:
+        yield
+    finally:
+        mdgen_generator.random, mdgen_generator._fake = previous_random, previous_faker
+
+
+def generate_users_data(seed: int, count: int) -> list[dict[str, str]]:
+    faker = get_faker(seed)
+    return [
+        {
+            'first_name': faker.first_name(),
+            'last_name': faker.last_name(),
+            'bio': faker.text(max_nb_chars=200),
+        }
+        for _ in range(count)
+    ]
+
+
+def generate_posts_data(seed: int, count: int) -> list[dict[str, str]]:
+    faker = get_faker(seed)
+    posts_data = []
+
+    with seeded_markdown_generator(faker, random.Random(seed)):
+        for _ in range(count):
+            body = faker.post(size=faker.random_element(['small', 'medium']))
+            posts_data.append({
+                'title': faker.sentence(nb_words=4),
+                'description': faker.text(max_nb_chars=200),
+                'body': body,
+                # rendered by workers, so that `bulk_create` does not render bodies in the main process
+                'body_html': render_body_html(body),
+                'body_html_version': BODY_HTML_VERSION,
+            })
+
+    return posts_data
+
+
+def generate_comments_data(seed: int, count: int) -> list[dict[str, str]]:
+    faker = get_faker(seed)
+    return [{'body': faker.text(max_nb_chars=100)} for _ in range(count)]
+
+
+def map_in_chunks(
+        function: Callable[[int, int], list],
+        count: int, *,
+        seed: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0,
+) -> Iterator[list]:
+    """
+    Yields results of `function(seed, size)` for consecutive chunks of `count` items, in order.
+
+    Every chunk has its own seed derived from `seed`, so results do not depend on the number of workers.
+    Chunks are generated in a pool of `workers` processes (or in the current process if it is 0),
+    at most two chunks per worker ahead of the consumer, so that memory usage is bounded.
+    """
+    tasks = (
+        (seed * 1_000_003 + index, min(chunk_size, count - start))
+        for index, start in enumerate(range(0, count, chunk_size))
+    )
+
+    if not workers:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    # forked workers must not share connections of the parent process
+    connections.close_all()
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as executor:
+        pending = deque()
+
+        for task in tasks:
+            pending.append(executor.submit(function, *task))
+
+            if len(pending) > workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def bulk_create_in_chunks(
+        model: type[Model],
+        objs: Iterable[Model], *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        ignore_conflicts: bool = False,
+) -> int:
+    """
+    Inserts lazily generated objects, one chunk per transaction. Returns the number of generated objects.
+    """
+    objs = iter(objs)
+    created_count = 0
+
+    while chunk := list(islice(objs, chunk_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, ignore_conflicts=ignore_conflicts)
+        created_count += len(chunk)
+
+    return created_count
+
+
+def to_username(*names: str) -> str:
+    return '_'.join(NON_WORD_PATTERN.sub('', name.lower()) for name in names)
+
+
+def fabricate_profiles(
+        count: int, *,
+        seed: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0,
+) -> list[int]:
+    """
+    Creates users with profiles and returns primary keys of the profiles.
+    All users share the password hash of the factories' password, which is computed once.
+    """
+    password = make_password(DEFAULT_USER_FACTORY_PASSWORD)
+    # suffixes keep usernames and emails unique across runs
+    offset = (User.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+    profile_ids = []
+
+    for users_data in map_in_chunks(generate_users_data, count, seed=seed, chunk_size=chunk_size, workers=workers):
+        users = []
+        bios = []
+
+        for index, user_data in enumerate(users_data, start=offset):
+            username = f"{to_username(user_data['first_name'], user_data['last_name'])}_{index}"
+            users.append(User(
+                username=username,
+                email=f'{username}@example.com',
+                first_name=user_data['first_name'],
+                last_name=user_data['last_name'],
+                password=password,
+            ))
+            bios.append(user_data['bio'])
+
+        offset += len(users)
+
+        with transaction.atomic():
+            # `post_save` signal, which creates profiles, is not sent by `bulk_create`
+            users = User.objects.bulk_create(users)
+            profiles = Profile.objects.bulk_create(
+                Profile(user_id=user.pk, bio=bio) for user, bio in zip(users, bios)
+            )
+
+        profile_ids.extend(profile.pk for profile in profiles)
+
+    return profile_ids
+
+
+def fabricate_tags(count: int, *, rng: random.Random) -> list[int]:
+    faker = get_faker(rng.getrandbits(32))
+    offset = (Tag.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+    tags = []
+
+    for index in range(offset, offset + count):
+        word = faker.word()
+        tags.append(Tag(tag=word, slug=f'{to_username(word)}-{index}', color=faker.hex_color()))
+
+    return [tag.pk for tag in Tag.objects.bulk_create(tags)]
+
+
+def fabricate_thumbnails(count: int, *, rng: random.Random) -> list[str]:
+    """
+    Stores a pool of images, which are shared by fabricated posts.
+    """
+    names = []
+
+    for _ in range(count):
+        content = BytesIO()
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new('RGB', (400, 300), color=color).save(content, format='png')
+        names.append(default_storage.save(f'{FABRICATED_THUMBNAILS_DIRECTORY}/thumbnail.png', ContentFile(
+            content.getvalue()
+        )))
+
+    return names
+
+
+def fabricate_posts(
+        count: int, *,
+        author_ids: Sequence[int],
+        tag_ids: Sequence[int],
+        thumbnail_names: Sequence[str],
+        rng: random.Random,
+        seed: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0,
+) -> list[tuple[int, int]]:
+    """
+    Creates posts of random authors, with 1-3 random tags and a random thumbnail from the pool.
+    Returns `(post, author)` primary keys of the posts.
+    """
+    Tags = Post.tags.through
+    created_posts = []
+
+    for posts_data in map_in_chunks(generate_posts_data, count, seed=seed, chunk_size=chunk_size, workers=workers):
+        posts = [
+            Post(
+                author_id=rng.choice(author_ids),
+                thumbnail=rng.choice(thumbnail_names) if thumbnail_names else None,
+                **post_data,
+            )
+            for post_data in posts_data
+        ]
+
+        with transaction.atomic():
+            posts = Post.objects.bulk_create(posts)
+
+            if tag_ids:
+                Tags.objects.bulk_create(
+                    Tags(post_id=post.pk, tag_id=tag_id)
+                    for post in posts
+                    for tag_id in rng.sample(tag_ids, min(len(tag_ids), rng.randint(1, 3)))
+                )
+
+        created_posts.extend((post.pk, post.author_id) for post in posts)
+
+    return created_posts
+
+
+def fabricate_comments(
+        per_post: int, *,
+        post_ids: Sequence[int],
+        author_ids: Sequence[int],
+        rng: random.Random,
+        seed: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0,
+) -> int:
+    """
+    Creates 0 to `2 * per_post` comments (`per_post` on average) of random authors under every post.
+    """
+    comments_post_ids = [
+        post_id
+        for post_id in post_ids
+        for _ in range(rng.randint(0, 2 * per_post))
+    ]
+    comments_data = (
+        comment_data
+        for chunk in map_in_chunks(
+            generate_comments_data, len(comments_post_ids), seed=seed, chunk_size=chunk_size, workers=workers
+        )
+        for comment_data in chunk
+    )
+    return bulk_create_in_chunks(Comment, (
+        Comment(post_id=post_id, author_id=rng.choice(author_ids), **comment_data)
+        for post_id, comment_data in zip(comments_post_ids, comments_data)
+    ), chunk_size=chunk_size)
+
+
+def sample_uniform(population: Sequence[int], k: int, *, rng: random.Random) -> list[int]:
+    return rng.sample(population, min(k, len(population)))
+
+
+def fabricate_follows(
+        per_profile: int, *,
+        profile_ids: Sequence[int],
+        rng: random.Random,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Makes every profile follow 0 to `2 * per_profile` random other profiles
+    (see `core.shared.social_graph` for power-law follow graphs). Returns the number of created follows.
+    """
+    Follows = Profile.followed.through
+    follows = (
+        Follows(from_profile_id=profile_id, to_profile_id=followed_id)
+        for profile_id in profile_ids
+        for followed_id in sample_uniform(profile_ids, rng.randint(0, 2 * per_profile), rng=rng)
+        if followed_id != profile_id
+    )
+    return bulk_create_in_chunks(Follows, follows, chunk_size=chunk_size)
+
+
+def fabricate_favourites(
+        per_profile: int, *,
+        profile_ids: Sequence[int],
+        post_ids: Sequence[int],
+        rng: random.Random,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Adds 0 to `2 * per_profile` random posts to favourites of every profile.
+    Returns the number of created favourites.
+    """
+    Favourites = Profile.favourites.through
+    favourites = (
+        Favourites(profile_id=profile_id, post_id=post_id)
+        for profile_id in profile_ids
+        for post_id in sample_uniform(post_ids, rng.randint(0, 2 * per_profile), rng=rng)
+    )
+    return bulk_create_in_chunks(Favourites, favourites, chunk_size=chunk_size)
+
+
+def process_fabricated_thumbnails(thumbnail_names: Iterable[str]) -> None:
+    """
+    Generates variants of every pooled thumbnail once and copies them to all posts sharing the thumbnail,
+    shared variants are deleted only once no post references them (see `posts.thumbnails`).
+    """
+    for name in thumbnail_names:
+        post_id = Post.objects.filter(thumbnail=name).values_list('pk', flat=True).first()
+
+        if post_id is None:
+            continue
+
+        generate_thumbnail_variants(post_id)
+        variants = Post.objects.values_list('thumbnail_variants', flat=True).get(pk=post_id)
+        Post.objects.filter(thumbnail=name).update(thumbnail_variants=variants)
+
+
+def update_search_vectors_in_chunks(queryset, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    bounds = queryset.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+
+    if bounds['min_pk'] is None:
+        return
+
+    for lower_pk in range(bounds['min_pk'], bounds['max_pk'] + 1, chunk_size):
+        with transaction.atomic():
+            queryset.filter(pk__gte=lower_pk, pk__lt=lower_pk + chunk_size).update_search_vector()
+
@@ -0,0 +1,122 @@
+import base64
+import binascii
+import uuid
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from drf_extra_fields.fields import Base64ImageField
+from PIL import Image
+from rest_framework import serializers
+
+BASE64_CHUNK_SIZE = 64 * 1024
+
+
+def decode_base64_to_file(data: str, file, chunk_size: int = BASE64_CHUNK_SIZE) -> None:
+    """
+    Decodes base64 string into the file chunk by chunk, so that the decoded content is never held in memory.
+    Whitespace is skipped, any other character outside of the base64 alphabet raises `binascii.Error`.
+    """
+    remainder = ''
+
+    for start in range(0, len(data), chunk_size):
+        chunk = remainder + ''.join(data[start:start + chunk_size].split())
+        usable_length = len(chunk) - len(chunk) % 4
+        file.write(base64.b64decode(chunk[:usable_length], validate=True))
+        remainder = chunk[usable_length:]
+
+    if remainder:
+        raise binascii.Error('Incorrect padding')
+
+
+class DimensionsLimitMixin:
+    """
+    Rejects images larger than `max_width` x `max_height`,
+    checking dimensions in the image header before the image gets loaded.
+    """
+    default_error_messages = {
+        'max_dimensions': 'Image is too large, maximum dimensions are {max_width}x{max_height}.',
+    }
+
+    def __init__(self, *args, max_width: int, max_height: int, **kwargs):
+        self.max_width = max_width
+        self.max_height = max_height
+        super().__init__(*args, **kwargs)
+
+    def validate_dimensions(self, file) -> None:
+        try:
+            with Image.open(file) as image:
+                width, height = image.size
+        except (OSError, Image.DecompressionBombError):
+            self.fail('invalid_image')
+        finally:
+            file.seek(0)
+
+        if width > self.max_width or height > self.max_height:
+            self.fail('max_dimensions', max_width=self.max_width, max_height=self.max_height)
+
+
+class StreamedBase64ImageField(DimensionsLimitMixin, Base64ImageField):
+    """
+    `Base64ImageField` which decodes the image into a temporary file on disk, instead of into memory.
+    """
+
+    def to_internal_value(self, base64_data):
+        if base64_data in self.EMPTY_VALUES:
+            return None
+
+        if not isinstance(base64_data, str):
+            raise serializers.ValidationError(f'Invalid type. This is not an base64 string: {type(base64_data)}')
+
+        content_type = None
+
+        if ';base64,' in base64_data:
+            header, base64_data = base64_data.split(';base64,', 1)
+            if self.trust_provided_content_type:
+                content_type = header.replace('data:', '')
+
+        file = TemporaryUploadedFile(str(uuid.uuid4()), content_type, 0, None)
+
+        try:
+            try:
+                decode_base64_to_file(base64_data, file)
+            except (TypeError, binascii.Error, ValueError):
+                raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+
+            file.size = file.tell()
+            file.name = f'{file.name}.{self.get_streamed_file_extension(file)}'
+            self.validate_dimensions(file)
+        except serializers.ValidationError:
+            file.close()
+            raise
+
+        # skips base64 decoding of `Base64FieldMixin`
+        return serializers.ImageField.to_internal_value(self, file)
+
+    def get_streamed_file_extension(self, file) -> str:
+        file.seek(0)
+
+        try:
+            # reads only the header, not the whole image
+            with Image.open(file) as image:
+                extension = image.format.lower()
+        except (OSError, Image.DecompressionBombError):
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+
+        extension = 'jpg' if extension == 'jpeg' else extension
+
+        if extension not in self.ALLOWED_TYPES:
+            raise serializers.ValidationError(self.INVALID_TYPE_MESSAGE)
+
+        file.seek(0)
+        return extension
+
+
+class DimensionsLimitedImageField(DimensionsLimitMixin, serializers.ImageField):
+    """
+    `ImageField` which rejects images larger than `max_width` x `max_height`.
+    """
+
+    def to_internal_value(self, data):
+        if hasattr(data, 'seek'):
+            self.validate_dimensions(data)
+
+        return super().to_internal_value(data)
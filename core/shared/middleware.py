@@ -0,0 +1,31 @@
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from core.shared.query_stats import QueryStats
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+QUERY_DURATION_HEADER = 'X-Query-Duration'
+
+
+class QueryStatsMiddleware:
+    """
+    Reports number and total duration (in milliseconds) of SQL queries of every request in response headers,
+    so that benchmarks over HTTP can measure them. Enabled by `QUERY_STATS_HEADERS` setting.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        if not settings.QUERY_STATS_HEADERS:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with QueryStats() as stats:
+            response = self.get_response(request)
+
+        response[QUERY_COUNT_HEADER] = str(stats.count)
+        response[QUERY_DURATION_HEADER] = f'{stats.duration * 1000:.3f}'
+        return response
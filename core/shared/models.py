@@ -1,4 +1,8 @@
+from collections.abc import Iterable
+
 from django.db import models
+from django.db.models.base import ModelState
+from django.db.models.options import Options
 
 
 class TimestampedModel(models.Model):
@@ -8,3 +12,73 @@ class TimestampedModel(models.Model):
     class Meta:
         abstract = True
         ordering = ('-created_at', '-updated_at')
+
+
+class DenormalizedCountersMixin:
+    """
+    Mixin for models with counter columns maintained by `UPDATE` queries (e.g. in signals).
+
+    Saving an already existing instance skips `counter_fields` and other `maintained_fields` (e.g. search vectors),
+    so that outdated in-memory counters never overwrite the ones in the database.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+    maintained_fields: tuple[str, ...] = ()
+
+    _meta: Options
+    _state: ModelState
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in (*self.counter_fields, *self.maintained_fields)
+            ]
+
+        super().save(*args, **kwargs)
+
+
+class TrackedFieldsMixin:
+    """
+    Mixin for models, which remembers values of `tracked_fields` loaded from (or saved to) the database,
+    so that saves (and their signals) can tell which of these fields have changed since.
+    """
+
+    tracked_fields: tuple[str, ...] = ()
+
+    _meta: Options
+    _state: ModelState
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_values()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        # deferred fields are refreshed on access
+        self._remember_tracked_values()
+
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        self._remember_tracked_values(kwargs.get('update_fields'))
+
+    def _remember_tracked_values(self, field_names: Iterable[str] | None = None) -> None:
+        names = set(self.tracked_fields if field_names is None else field_names) - self.get_deferred_fields()
+        self._tracked_values = {
+            **getattr(self, '_tracked_values', {}),
+            **{name: getattr(self, name) for name in self.tracked_fields if name in names},
+        }
+
+    def get_changed_fields(self) -> set[str]:
+        """
+        Returns tracked fields, whose values differ from the ones in the database, all of them for new instances.
+        """
+        tracked_values = getattr(self, '_tracked_values', {})
+        deferred_fields = self.get_deferred_fields()
+        return {
+            name for name in self.tracked_fields
+            if name not in deferred_fields
+            and (name not in tracked_values or tracked_values[name] != getattr(self, name))
+        }
@@ -1,17 +1,207 @@
-from typing import Type
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from typing import Any, Type
 
+from django.db.models import Model, Q, QuerySet
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPaginationMixin:
+    """
+    Adds keyset (cursor) pagination mode to `PageNumberPagination`.
+
+    Clients select it per request with `?pagination=cursor` (or by following a `?cursor=` link).
+    Instead of `COUNT(*)` and `OFFSET`, every page is fetched with a `WHERE (ordering) < (last seen row)`
+    condition on `cursor_ordering` fields, so that page N costs the same as page 1,
+    as long as an index matches the ordering. Last field of the ordering has to be unique (e.g. `id`).
+
+    In cursor mode `?ordering=` is ignored and the response has no `count`, only `next` and `previous` links.
+    """
+
+    cursor_ordering: tuple[str, ...] = ()
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'The pagination cursor value.'
+    pagination_mode_query_param = 'pagination'
+    pagination_mode_query_description = 'Pagination mode, `cursor` selects keyset pagination.'
+    invalid_cursor_message = 'Invalid cursor'
+
+    page_query_param: str
+    request: Request
+
+    def is_cursor_requested(self, request: Request) -> bool:
+        return bool(self.cursor_ordering) and (
+            request.query_params.get(self.pagination_mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list | None:
+        self.is_cursor_mode = self.is_cursor_requested(request)
+
+        if not self.is_cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.get_cursor_ordering(reverse)
+        results = self.get_keyset_page(queryset, ordering, position, page_size + 1)
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if reverse:
+            results.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self.get_position(results[-1]) if has_next and results else None
+        self.previous_position = self.get_position(results[0]) if has_previous and results else None
+        return results
+
+    def get_paginated_response(self, data: list) -> Response:
+        if not self.is_cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ('next', self.get_cursor_link(self.next_position, reverse=False)),
+            ('previous', self.get_cursor_link(self.previous_position, reverse=True)),
+            ('results', data),
+        ]))
+
+    def get_keyset_page(self, queryset: QuerySet, ordering: list[str], position: list[Any] | None, limit: int) -> list:
+        """
+        Returns up to `limit` rows of the queryset, which come after the position in the ordering.
+        """
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_cursor_filter(ordering, position))
+
+        return list(queryset[:limit])
+
+    def get_cursor_ordering(self, reverse: bool) -> list[str]:
+        if not reverse:
+            return list(self.cursor_ordering)
+
+        return [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.cursor_ordering
+        ]
+
+    @staticmethod
+    def get_cursor_filter(ordering: list[str], position: list[Any]) -> Q:
+        """
+        Builds lexicographic "comes after position" condition, e.g. for `('-created_at', '-id')`:
+        `created_at < x OR (created_at = x AND id < y)`.
+        """
+        conditions = []
+
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal_prefix = {
+                previous_field.lstrip('-'): value
+                for previous_field, value in zip(ordering[:index], position)
+            }
+            conditions.append(Q(**equal_prefix, **{f'{name}__{lookup}': position[index]}))
+
+        return reduce(or_, conditions)
+
+    def get_position(self, instance: Model | dict) -> list[str]:
+        if isinstance(instance, dict):
+            # rows of `.values()` querysets
+            instance = self.model(**{field.lstrip('-'): instance[field.lstrip('-')] for field in self.cursor_ordering})
+
+        return [
+            self.model._meta.get_field(field.lstrip('-')).value_to_string(instance)
+            for field in self.cursor_ordering
+        ]
+
+    def decode_cursor(self, request: Request) -> tuple[list[Any] | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor['r'])
+
+            if len(position) != len(self.cursor_ordering):
+                raise ValueError
+
+            position = [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.cursor_ordering, position)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position: list[str], reverse: bool) -> str:
+        cursor = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+
+    def get_cursor_link(self, position: list[str] | None, reverse: bool) -> str | None:
+        if position is None:
+            return None
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+        parameters = super().get_schema_operation_parameters(view)
+
+        if not self.cursor_ordering:
+            return parameters
+
+        return [
+            *parameters,
+            {
+                'name': self.pagination_mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': force_str(self.pagination_mode_query_description),
+                'schema': {
+                    'type': 'string',
+                    'enum': ['page', 'cursor'],
+                },
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': force_str(self.cursor_query_description),
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
 
 
 def page_number_pagination_factory(
         page_size: int = None,
         max_page_size: int = None,
         page_size_query_param: str = "page_size",
+        cursor_ordering: tuple[str, ...] = (),
 ) -> Type[PageNumberPagination]:
-    class PaginationClass(PageNumberPagination):
+    class PaginationClass(KeysetPaginationMixin, PageNumberPagination):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.page_size = page_size
             self.max_page_size = max_page_size
             self.page_size_query_param = page_size_query_param
+            self.cursor_ordering = cursor_ordering
     return PaginationClass
@@ -0,0 +1,38 @@
+import time
+from typing import Any
+
+from django.db import connections
+
+
+class QueryStats:
+    """
+    Counts SQL queries executed on a connection (in the current thread) and their total duration,
+    without requiring `DEBUG`:
+
+        with QueryStats() as stats:
+            ...
+        stats.count, stats.duration
+    """
+
+    def __init__(self, using: str = 'default'):
+        self.using = using
+        self.count = 0
+        self.duration = 0.0
+        self._wrapper = None
+
+    def __call__(self, execute, sql: str, params: Any, many: bool, context: dict) -> Any:
+        start_time = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start_time
+
+    def __enter__(self) -> 'QueryStats':
+        self._wrapper = connections[self.using].execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._wrapper.__exit__(*exc_info)
@@ -1,17 +1,72 @@
-from collections import OrderedDict
+import copy
+import hashlib
+from operator import attrgetter
 
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
-from rest_framework.fields import SkipField
+from django.core.cache import cache
+from django.db.models import Manager, Model
+from rest_framework.fields import Field, SkipField
 from rest_framework.relations import PKOnlyObject
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import ListSerializer, Serializer
 
 from accounts.models import User
 
 
+INCLUDE_FIELDS_CONTEXT_KEY = 'include_fields'
+
+
 class UserAttributeRequiredError(AttributeError):
     pass
 
 
+def get_serializer_user(serializer: Serializer) -> User | AnonymousUser | None:
+    """
+    Returns serializer's `user` attribute or falls back to `context['request'].user`.
+    """
+    user = getattr(serializer, 'user', None)
+
+    if user is not None:
+        return user
+
+    request = serializer.context.get('request')
+    return getattr(request, 'user', None)
+
+
+class PrefetchListSerializer(ListSerializer):
+    """
+    List serializer, which lets its child prefetch data required by all serialized instances at once,
+    e.g. viewer dependent flags of a whole page in one query, instead of one query per instance.
+
+    Child serializer has to implement `prefetch(instances)` method.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        instances = list(iterable)
+        self.child.prefetch(instances)
+        return super().to_representation(instances)
+
+
+class OptionalFieldsMixin:
+    """
+    Leaves out fields listed in `Meta.optional_fields` (e.g. expensive or large ones),
+    unless they are listed in `context['include_fields']`.
+    """
+
+    context: dict
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        included_fields = self.context.get(INCLUDE_FIELDS_CONTEXT_KEY, ())
+
+        for field_name in getattr(self.Meta, 'optional_fields', ()):
+            if field_name not in included_fields:
+                fields.pop(field_name, None)
+
+        return fields
+
+
 class ToRepresentationRequiresUserMixin:
     """
     Mixin required for serializers whose some fields are of Serializer type,
@@ -55,21 +110,86 @@ class ToRepresentationRequiresUserMixin:
 
     _readable_fields: list
     context: dict
+    fields: dict
 
     def __init__(self, *args, user: User | AnonymousUser = None, **kwargs):
         super().__init__(*args, **kwargs)
         self.user = user
 
+    def _get_user_required_error(self, field: Serializer) -> UserAttributeRequiredError:
+        return UserAttributeRequiredError(
+            f"{self.__class__.__name__} must either: \n"
+            f"1. Include a `user` attribute, \n"
+            f"2. Include a `context['request']` attribute, \n"
+            f"To serialize '{field.field_name}' field with `{field.__class__.__name__}`."
+        )
+
+    def _get_model_field_names(self) -> set[str]:
+        meta = getattr(self, 'Meta', None)
+        model = getattr(meta, 'model', None)
+
+        if model is None:
+            return set()
+
+        return {field.attname for field in model._meta.concrete_fields if not field.is_relation}
+
+    def _compile_fields(self) -> list[tuple]:
+        """
+        Precomputes (field name, `get_attribute`, model attribute getter, `to_representation`, missing user error)
+        of readable fields.
+
+        User (or request) is passed to nested serializers here, once per serializer instead of once per field
+        of every serialized instance. Plain model fields are read with `attrgetter`, skipping `get_attribute`
+        of DRF fields, which only handles missing attributes and callables.
+        """
+        user = getattr(self, 'user', None)
+        request = self.context.get('request')
+        model_field_names = self._get_model_field_names()
+        compiled = []
+
+        for field in self._readable_fields:
+            error = None
+
+            # We need to pass the user to the related serializer
+            # so that its to_representation does not throw an error
+            if isinstance(field, Serializer):
+                if user is not None:
+                    field.user = user
+                elif request is not None:
+                    field.context['request'] = request
+                else:
+                    error = self._get_user_required_error(field)
+
+            model_getter = None
+            if (
+                    len(field.source_attrs) == 1 and field.source_attrs[0] in model_field_names
+                    and type(field).get_attribute is Field.get_attribute
+            ):
+                model_getter = attrgetter(field.source_attrs[0])
+
+            compiled.append((field.field_name, field.get_attribute, model_getter, field.to_representation, error))
+
+        return compiled
+
     def to_representation(self, instance):
         """
         Object instance -> Dict of primitive datatypes.
         """
-        ret = OrderedDict()
-        fields = self._readable_fields
+        compiled_fields = getattr(self, '_compiled_fields', None)
 
-        for field in fields:
+        if compiled_fields is None:
+            compiled_fields = self._compiled_fields = self._compile_fields()
+
+        # plain model field getters are only valid for model instances (e.g. not for dicts)
+        is_model_instance = isinstance(instance, Model)
+        ret = {}
+
+        for field_name, get_attribute, model_getter, to_representation, error in compiled_fields:
             try:
-                attribute = field.get_attribute(instance)
+                if model_getter is not None and is_model_instance:
+                    attribute = model_getter(instance)
+                else:
+                    attribute = get_attribute(instance)
             except SkipField:
                 continue
 
@@ -80,32 +200,96 @@ class ToRepresentationRequiresUserMixin:
             # resolve the pk value.
             check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
             if check_for_none is None:
-                ret[field.field_name] = None
+                ret[field_name] = None
             else:
-                # ---CUSTOM PART---
-                # We need to pass the user to the related serializer
-                # so that its to_representation does not throw an error
-                if isinstance(field, Serializer):
-                    error_message = (
-                        f"{self.__class__.__name__} must either: \n"
-                        f"1. Include a `user` attribute, \n"
-                        f"2. Include a `context['request']` attribute, \n"
-                        f"To serialize '{field.field_name}' field with `{field.__class__.__name__}`."
-                    )
+                if error is not None:
+                    raise error
+
+                ret[field_name] = to_representation(attribute)
+
+        return ret
+
+
+class CachedDocumentMixin:
+    """
+    Splits representation of an instance into a viewer independent document, which is cached and shared
+    by all viewers, and a viewer dependent overlay (e.g. `is_favourited`), which is merged into it per request.
 
-                    if not getattr(self, 'user', None) and not self.context.get('request'):
-                        raise UserAttributeRequiredError(error_message)
+    `viewer_fields` are dotted paths of viewer dependent fields, e.g. `author.is_followed_by_you`.
+    Documents are keyed by `get_document_version(instance)`, which has to change with every
+    viewer independent field, by default instance's `updated_at`. Serializers of `PrefetchListSerializer` should call `prefetch_documents`
+    in their `prefetch`, so that documents of a whole page are loaded at once.
+    """
+
+    viewer_fields: tuple[str, ...] = ()
 
-                    elif getattr(self, 'user', None) is not None:
-                        field.user = self.user
+    context: dict
 
-                    elif self.context.get('request') is not None:
-                        field.context['request'] = self.context['request']
+    def get_document_version(self, instance: Model) -> tuple:
+        return (instance.updated_at,)
 
-                    else:
-                        raise UserAttributeRequiredError(error_message)
-                # ---CUSTOM PART ENDS HERE---
+    def get_document_cache_key(self, instance: Model) -> str:
+        request = self.context.get('request')
+        # urls of files are absolute if there is a request
+        base_url = request.build_absolute_uri('/') if request is not None else None
+        # sparse fieldsets (see `core.shared.views.SparseFieldsMixin`) have their own documents
+        version = repr((base_url, tuple(self.fields), self.get_document_version(instance)))
+        digest = hashlib.blake2b(version.encode(), digest_size=16).hexdigest()
+        return f'serializers:document:{self.__class__.__name__}:{instance.pk}:{digest}'
 
-                ret[field.field_name] = field.to_representation(attribute)
+    def prefetch_documents(self, instances: list[Model]) -> None:
+        keys = [self.get_document_cache_key(instance) for instance in instances]
+        self._documents = cache.get_many(keys)
+        self._missing_documents = set(keys) - self._documents.keys()
 
-        return ret
+    def _iter_viewer_fields(self, instance: Model, representation: dict):
+        """
+        Yields (field, attribute, representation, field name) of each viewer dependent field
+        present in the representation.
+        """
+        for path in self.viewer_fields:
+            serializer, attribute, target = self, instance, representation
+            *parent_names, name = path.split('.')
+
+            if path.split('.', 1)[0] not in self.fields:
+                continue
+
+            for parent_name in parent_names:
+                field = serializer.fields[parent_name]
+                attribute = field.get_attribute(attribute)
+                target = target.get(parent_name)
+
+                if attribute is None or target is None:
+                    break
+
+                if getattr(serializer, 'user', None) is not None:
+                    field.user = serializer.user
+
+                serializer = field
+            else:
+                field = serializer.fields[name]
+                yield field, field.get_attribute(attribute), target, name
+
+    def to_representation(self, instance: Model) -> dict:
+        key = self.get_document_cache_key(instance)
+        documents = getattr(self, '_documents', {})
+        document = documents.pop(key, None)
+
+        if document is None and key not in getattr(self, '_missing_documents', ()):
+            document = cache.get(key)
+
+        if document is None:
+            representation = super().to_representation(instance)
+            document = copy.deepcopy(representation)
+
+            for _, _, target, name in self._iter_viewer_fields(instance, document):
+                target[name] = None
+
+            cache.set(key, document, timeout=settings.SERIALIZED_DOCUMENT_CACHE_TIMEOUT)
+            return representation
+
+        # placeholders of viewer dependent fields keep their order in the document
+        for field, attribute, target, name in self._iter_viewer_fields(instance, document):
+            target[name] = field.to_representation(attribute)
+
+        return document
@@ -0,0 +1,157 @@
+import math
+import random
+from collections.abc import Iterator, Sequence
+from itertools import accumulate
+
+from core.shared.fabrication import DEFAULT_CHUNK_SIZE, bulk_create_in_chunks
+from profiles.models import Profile
+
+# exponent of degree distributions observed in social networks, `P(degree = k) ~ k ** -exponent`
+DEFAULT_EXPONENT = 2.1
+
+
+def sample_power_law_degrees(
+        count: int, *,
+        mean: float,
+        exponent: float = DEFAULT_EXPONENT,
+        max_degree: int,
+        rng: random.Random,
+) -> list[int]:
+    """
+    Samples `count` degrees from the discrete Pareto distribution with given exponent,
+    scaled to the given mean and capped at `max_degree`: most nodes get a few edges, a few nodes get a lot.
+    """
+    if not count or mean <= 0 or max_degree <= 0:
+        return [0] * count
+
+    # inverse transform sampling of Pareto distribution with minimum 1
+    raw_degrees = [(1 - rng.random()) ** (-1 / (exponent - 1)) for _ in range(count)]
+    scale = mean * count / sum(raw_degrees)
+    return [min(max_degree, math.floor(degree * scale + rng.random())) for degree in raw_degrees]
+
+
+def get_popularity_weights(count: int, *, exponent: float = DEFAULT_EXPONENT) -> list[float]:
+    """
+    Returns Zipf weights of `count` ranks, `weight(rank) = rank ** -(1 / (exponent - 1))`,
+    so that numbers of draws of ranked items follow power-law with given exponent.
+    """
+    return [rank ** (-1 / (exponent - 1)) for rank in range(1, count + 1)]
+
+
+def sample_popular(
+        population: Sequence[int],
+        k: int, *,
+        cum_weights: Sequence[float],
+        rng: random.Random,
+        exclude: int = None,
+) -> set[int]:
+    """
+    Samples `k` distinct items (or all of them, if there are not enough) of the population,
+    weighted by popularity. Popular items get drawn repeatedly, so the rest is topped up uniformly.
+    """
+    k = min(k, len(population) - (exclude is not None))
+
+    if k <= 0:
+        return set()
+
+    if 2 * k > len(population):
+        # popularity hardly matters when most of the population is drawn
+        return set([item for item in rng.sample(population, min(len(population), k + 1)) if item != exclude][:k])
+
+    sample = set(rng.choices(population, cum_weights=cum_weights, k=k)) - {exclude}
+
+    while len(sample) < k:
+        if (item := rng.choice(population)) != exclude:
+            sample.add(item)
+
+    return sample
+
+
+def generate_follows(
+        profile_ids: Sequence[int], *,
+        mean: float,
+        exponent: float = DEFAULT_EXPONENT,
+        rng: random.Random,
+) -> tuple[list[int], Iterator[tuple[int, int]]]:
+    """
+    Generates `(follower, followed)` pairs of a directed graph with power-law out-degrees (heavy followers)
+    and in-degrees (celebrities). Returns profiles ordered from the most popular one and the pairs.
+    """
+    ranking = list(profile_ids)
+    rng.shuffle(ranking)
+    cum_weights = list(accumulate(get_popularity_weights(len(ranking), exponent=exponent)))
+    degrees = sample_power_law_degrees(
+        len(ranking), mean=mean, exponent=exponent, max_degree=len(ranking) - 1, rng=rng
+    )
+
+    follows = (
+        (profile_id, followed_id)
+        for profile_id, degree in zip(profile_ids, degrees)
+        for followed_id in sample_popular(ranking, degree, cum_weights=cum_weights, rng=rng, exclude=profile_id)
+    )
+    return ranking, follows
+
+
+def generate_favourites(
+        profile_ids: Sequence[int],
+        posts: Sequence[tuple[int, int]], *,
+        authors_ranking: Sequence[int],
+        mean: float,
+        exponent: float = DEFAULT_EXPONENT,
+        rng: random.Random,
+) -> Iterator[tuple[int, int]]:
+    """
+    Generates `(profile, post)` pairs with power-law numbers of favourites per profile,
+    where posts (`(post, author)` pairs) are favourited as often as their authors are followed.
+    """
+    author_weights = dict(zip(authors_ranking, get_popularity_weights(len(authors_ranking), exponent=exponent)))
+    # authors outside of the ranking are as popular as the least popular ranked one
+    default_weight = min(author_weights.values(), default=1)
+    post_ids = [post_id for post_id, author_id in posts]
+    cum_weights = list(accumulate(author_weights.get(author_id, default_weight) for post_id, author_id in posts))
+    degrees = sample_power_law_degrees(
+        len(profile_ids), mean=mean, exponent=exponent, max_degree=len(post_ids), rng=rng
+    )
+
+    return (
+        (profile_id, post_id)
+        for profile_id, degree in zip(profile_ids, degrees)
+        for post_id in sample_popular(post_ids, degree, cum_weights=cum_weights, rng=rng)
+    )
+
+
+def fabricate_social_graph(
+        profile_ids: Sequence[int],
+        posts: Sequence[tuple[int, int]], *,
+        follows_per_profile: float,
+        favourites_per_profile: float,
+        exponent: float = DEFAULT_EXPONENT,
+        seed: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[int, int]:
+    """
+    Inserts power-law follow graph of the profiles and favourites of the posts (`(post, author)` pairs)
+    into through tables, skipping existing rows. The same seed and input always give the same graph.
+    Returns numbers of inserted follows and favourites.
+    """
+    rng = random.Random(seed)
+    Follows = Profile.followed.through
+    Favourites = Profile.favourites.through
+    # skipped conflicts are not reported by bulk inserts, so inserted rows are counted in through tables
+    follows_count, favourites_count = Follows.objects.count(), Favourites.objects.count()
+
+    ranking, follows = generate_follows(profile_ids, mean=follows_per_profile, exponent=exponent, rng=rng)
+    bulk_create_in_chunks(Follows, (
+        Follows(from_profile_id=profile_id, to_profile_id=followed_id)
+        for profile_id, followed_id in follows
+    ), chunk_size=chunk_size, ignore_conflicts=True)
+
+    favourites = generate_favourites(
+        profile_ids, posts, authors_ranking=ranking, mean=favourites_per_profile, exponent=exponent, rng=rng
+    )
+    bulk_create_in_chunks(Favourites, (
+        Favourites(profile_id=profile_id, post_id=post_id)
+        for profile_id, post_id in favourites
+    ), chunk_size=chunk_size, ignore_conflicts=True)
+
+    return Follows.objects.count() - follows_count, Favourites.objects.count() - favourites_count
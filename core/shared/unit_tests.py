@@ -1,7 +1,13 @@
 import shutil
+from collections.abc import Callable
+from typing import Any
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from accounts.models import User
@@ -9,16 +15,80 @@ from accounts.utils import get_tokens_for_user
 
 TEST_DIR = settings.BASE_DIR / 'test_files'
 
+# page sizes requested by query budget assertions, larger ones are capped by `max_page_size` of paginations
+QUERY_BUDGET_PAGE_SIZES = (1, 25, 1000)
+
 
 class APITestCase(TestCase):
 
     def setUp(self):
+        # cached users could outlive rows rolled back by previous tests
+        cache.clear()
         self.client = APIClient()
 
     def _require_jwt(self, user: User):
         access, _ = get_tokens_for_user(user)
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
 
+    def _request_counting_queries(self, method: str, url: str, data: Any = None) -> tuple[HttpResponse, list[str]]:
+        # caches are cleared, so that every request runs all of its queries (e.g. authentication)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data)
+
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def assertQueryBudget(self, budget: int, method: str, url: str, data: Any = None) -> HttpResponse:
+        """
+        Sends a request with cold caches and asserts that it runs at most `budget` queries.
+        """
+        response, queries = self._request_counting_queries(method, url, data)
+        self.assertLess(response.status_code, 400, response.content)
+        self.assertLessEqual(len(queries), budget, self._format_queries(queries))
+        return response
+
+    def assertPageQueryBudget(
+            self,
+            budget: int,
+            url: str,
+            create_rows: Callable[[int], Any],
+            data: dict[str, Any] = None,
+            page_sizes: tuple[int, ...] = QUERY_BUDGET_PAGE_SIZES,
+    ) -> None:
+        """
+        Requests pages of every size, after creating rows with `create_rows(count)`, so that there are
+        at least as many of them as the page holds. Asserts that every page runs at most `budget` queries
+        and that the number of queries does not grow with the number of rows (e.g. N+1 queries).
+        """
+        created_count = 0
+        page_queries = {}
+
+        for page_size in sorted(page_sizes):
+            if page_size > created_count:
+                create_rows(page_size - created_count)
+                created_count = page_size
+
+            response, queries = self._request_counting_queries('get', url, {**(data or {}), 'page_size': page_size})
+            self.assertEqual(response.status_code, 200, response.content)
+            page_queries[page_size] = queries
+
+        query_counts = {page_size: len(queries) for page_size, queries in page_queries.items()}
+        self.assertEqual(
+            len(set(query_counts.values())), 1, f'Number of queries grows with page size: {query_counts}'
+        )
+
+        for page_size, queries in page_queries.items():
+            self.assertLessEqual(
+                len(queries), budget, f'Page of size {page_size}: {self._format_queries(queries)}'
+            )
+
+    @staticmethod
+    def _format_queries(queries: list[str]) -> str:
+        return f'{len(queries)} queries:\n' + '\n'.join(
+            f'{index}. {query}' for index, query in enumerate(queries, start=1)
+        )
+
 
 @override_settings(MEDIA_ROOT=TEST_DIR)
 class TearDownFilesMixin(TestCase):
@@ -0,0 +1,60 @@
+import mimetypes
+from typing import Any
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import DataAndFiles, FileUploadParser
+
+
+class FileTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Uploaded file is too large.'
+    default_code = 'file_too_large'
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploaded files to temporary files on disk (never into memory),
+    aborting the upload as soon as it exceeds `max_size` bytes.
+    """
+
+    def __init__(self, request: HttpRequest = None, *, max_size: int):
+        super().__init__(request)
+        self.max_size = max_size
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None) -> None:
+        # rejects requests with declared length over the limit before reading any data
+        if content_length is not None and content_length > self.max_size:
+            raise FileTooLarge(f'Uploaded file is too large, maximum size is {self.max_size} bytes.')
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        # declared length does not have to be true (or present at all)
+        if start + len(raw_data) > self.max_size:
+            self.file.close()
+            raise FileTooLarge(f'Uploaded file is too large, maximum size is {self.max_size} bytes.')
+
+        return super().receive_data_chunk(raw_data, start)
+
+
+class RawImageUploadParser(FileUploadParser):
+    """
+    Parses request body as a single image (`Content-Type: image/...`) into `file_field` file,
+    with file name from `Content-Disposition` header or derived from the content type.
+    """
+    media_type = 'image/*'
+    file_field = 'file'
+
+    def parse(self, stream, media_type: str = None, parser_context: dict[str, Any] = None) -> DataAndFiles:
+        result = super().parse(stream, media_type, parser_context)
+        return DataAndFiles({}, {self.file_field: result.files['file']})
+
+    def get_filename(self, stream, media_type: str, parser_context: dict[str, Any]) -> str:
+        filename = super().get_filename(stream, media_type, parser_context)
+
+        if filename:
+            return filename
+
+        extension = mimetypes.guess_extension(media_type.split(';')[0].strip()) or ''
+        return f'upload{extension}'
@@ -0,0 +1,125 @@
+from collections.abc import Callable, Collection, Iterable
+from typing import Any
+
+from django.db.models import FileField, Model, QuerySet
+from django.db.models.query import ModelIterable
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer of list endpoints, which reads rows with `.values()` (joining related tables
+    explicitly) instead of hydrating model instances and walking DRF fields of every instance.
+
+    Output is identical to `serializer_class`, whose readable fields it reproduces in the same order:
+    - `fields` maps field names to `.values()` lookups, their values are converted with `to_representation`
+      of `serializer_class` fields (file fields get their model's `FieldFile`),
+    - `nested` maps field names to (values serializer, relation lookup), e.g. post's author,
+    - any other field is represented by `get_<field name>(row)` method,
+      data of whole pages (e.g. tags, viewer dependent flags) is loaded at once in `prefetch(rows)`.
+
+    Additional lookups required by `get_<field name>` methods are listed in `extra_lookups`,
+    primary key is always read. `field_names` limits output (and read columns) to a subset of fields.
+    """
+
+    serializer_class: type[serializers.Serializer]
+    fields: dict[str, str] = {}
+    nested: dict[str, tuple[type['ValuesSerializer'], str]] = {}
+    extra_lookups: tuple[str, ...] = ()
+
+    def __init__(
+            self,
+            instance: QuerySet | Iterable[dict] = None,
+            *,
+            context: dict = None,
+            prefix: str = '',
+            field_names: Collection[str] = None,
+    ):
+        self.instance = instance
+        self.context = context if context is not None else {}
+        self.prefix = prefix
+        self.field_names = set(field_names) if field_names is not None else None
+        self.nested_serializers = {
+            name: serializer_class(context=self.context, prefix=f'{prefix}{lookup}__')
+            for name, (serializer_class, lookup) in self.nested.items()
+            if self.is_selected(name)
+        }
+        self._representation = self._compile()
+
+    def is_selected(self, field_name: str) -> bool:
+        return self.field_names is None or field_name in self.field_names
+
+    def _get_converter(self, field: serializers.Field, lookup: str) -> Callable[[Any], Any]:
+        if not isinstance(field, serializers.FileField):
+            return field.to_representation
+
+        model_field = self.serializer_class.Meta.model._meta.get_field(lookup)
+        if not isinstance(model_field, FileField):
+            return field.to_representation
+
+        return lambda name: field.to_representation(model_field.attr_class(None, model_field, name))
+
+    def _compile(self) -> list[tuple[str, Callable[[dict], Any]]]:
+        schema = self.serializer_class(context=self.context)
+        representation = []
+
+        for field in schema._readable_fields:
+            name = field.field_name
+
+            if not self.is_selected(name):
+                continue
+
+            if name in self.fields:
+                key = f'{self.prefix}{self.fields[name]}'
+                if isinstance(field, RelatedField):
+                    raise TypeError(f'Related field `{name}` has to be represented by `get_{name}()`.')
+                converter = self._get_converter(field, self.fields[name])
+                # `None` values are not converted, same as in `Serializer.to_representation`
+                representation.append((
+                    name,
+                    lambda row, key=key, converter=converter: (
+                        None if (value := row[key]) is None else converter(value)
+                    )
+                ))
+            elif name in self.nested_serializers:
+                representation.append((name, self.nested_serializers[name].to_representation))
+            else:
+                representation.append((name, getattr(self, f'get_{name}')))
+
+        return representation
+
+    def get_lookups(self) -> list[str]:
+        # fields left out by `serializer_class` (e.g. optional ones) are not read either
+        represented_names = {name for name, represent in self._representation}
+        lookups = [
+            f'{self.prefix}{self.serializer_class.Meta.model._meta.pk.name}',
+            *(f'{self.prefix}{lookup}' for name, lookup in self.fields.items() if name in represented_names),
+            *(f'{self.prefix}{lookup}' for lookup in self.extra_lookups),
+        ]
+
+        for serializer in self.nested_serializers.values():
+            lookups.extend(serializer.get_lookups())
+
+        return list(dict.fromkeys(lookups))
+
+    def get_values_queryset(self, queryset: QuerySet[Model]) -> QuerySet[dict]:
+        return queryset.prefetch_related(None).values(*self.get_lookups())
+
+    def prefetch(self, rows: list[dict]) -> None:
+        for serializer in self.nested_serializers.values():
+            serializer.prefetch(rows)
+
+    def to_representation(self, row: dict) -> dict:
+        return {name: represent(row) for name, represent in self._representation}
+
+    @property
+    def data(self) -> list[dict]:
+        rows = self.instance
+
+        if isinstance(rows, QuerySet) and issubclass(rows._iterable_class, ModelIterable):
+            rows = self.get_values_queryset(rows)
+
+        rows = list(rows)
+        self.prefetch(rows)
+        return serializers.ReturnList([self.to_representation(row) for row in rows], serializer=self)
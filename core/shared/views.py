@@ -0,0 +1,275 @@
+import hashlib
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.shared.serializers import INCLUDE_FIELDS_CONTEXT_KEY
+from core.shared.values import ValuesSerializer
+
+VIEWER_VERSION_CACHE_KEY = 'views:viewer_version:{profile_id}'
+RENDERED_CACHE_KEY = 'views:rendered:{etag}'
+
+
+def get_version(key: str) -> str:
+    return cache.get_or_set(key, lambda: uuid.uuid4().hex, timeout=None)
+
+
+def bump_versions(keys: Iterable[str]) -> None:
+    # bumped again on commit, so that responses rendered from not yet committed data by concurrent requests
+    # are not kept under the new version
+    keys = list(keys)
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+    transaction.on_commit(lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None))
+
+
+def get_viewer_version(profile_id: int) -> str:
+    """
+    Version of viewer dependent state of the profile (e.g. followed profiles, favourite posts).
+    """
+    return get_version(VIEWER_VERSION_CACHE_KEY.format(profile_id=profile_id))
+
+
+def bump_viewer_versions(profile_ids: Iterable[int]) -> None:
+    bump_versions(VIEWER_VERSION_CACHE_KEY.format(profile_id=profile_id) for profile_id in profile_ids)
+
+
+class RenderedResponse(Response):
+    """
+    Response with already rendered content, which skips serialization and rendering.
+    """
+
+    def __init__(self, content: bytes, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.prerendered_content = content
+
+    @property
+    def rendered_content(self) -> bytes:
+        self['Content-Type'] = self.accepted_renderer.media_type
+        return self.prerendered_content
+
+
+class SparseFieldsMixin:
+    """
+    Lets clients select top-level fields of GET responses with `?fields=id,title` or leave some out
+    with `?omit=body`. Unselected `deferrable_fields` (e.g. large text columns) are not read from the database.
+    Optional fields of serializers (see `OptionalFieldsMixin`) are selected only if listed in `?fields=`.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    deferrable_fields: tuple[str, ...] = ()
+
+    request: Request
+
+    def _get_query_param_names(self, param: str) -> set[str]:
+        return {name.strip() for name in self.request.query_params.get(param, '').split(',') if name.strip()}
+
+    def _is_read_request(self) -> bool:
+        return getattr(self, 'request', None) is not None and self.request.method == 'GET'
+
+    def is_field_selected(self, field_name: str) -> bool:
+        fields = self._get_query_param_names(self.fields_query_param) if self._is_read_request() else set()
+        optional_fields = getattr(getattr(self.get_serializer_class(), 'Meta', None), 'optional_fields', ())
+
+        if field_name in optional_fields:
+            return field_name in fields
+
+        if not self._is_read_request():
+            return True
+
+        return (not fields or field_name in fields) and field_name not in self._get_query_param_names(
+            self.omit_query_param
+        )
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        context = super().get_serializer_context()
+
+        if self._is_read_request():
+            context[INCLUDE_FIELDS_CONTEXT_KEY] = self._get_query_param_names(self.fields_query_param)
+
+        return context
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields if not field.is_relation}
+        deferred_fields = [
+            name for name in self.deferrable_fields
+            if name in model_fields and not self.is_field_selected(name)
+        ]
+        return queryset.defer(*deferred_fields) if deferred_fields else queryset
+
+    def get_serializer(self, *args: Any, **kwargs: Any):
+        serializer = super().get_serializer(*args, **kwargs)
+        target = serializer.child if kwargs.get('many') else serializer
+
+        for field_name in [name for name in target.fields if not self.is_field_selected(name)]:
+            target.fields.pop(field_name)
+
+        return serializer
+
+
+class ValuesListMixin:
+    """
+    Serializes pages of list actions with values serializers (see `core.shared.values`),
+    which viewsets register per action in `values_serializer_classes`. Pages of other actions,
+    or of every action if `VALUES_SERIALIZERS_ENABLED` is turned off, are serialized with model serializers
+    (and their cached documents).
+
+    Comes before `ConditionalResponseMixin` and `SparseFieldsMixin` in bases of a viewset, if they are used too.
+    """
+
+    values_serializer_classes: dict[str, type[ValuesSerializer]] = {}
+
+    action: str
+
+    def get_values_serializer_class(self) -> type[ValuesSerializer] | None:
+        if not settings.VALUES_SERIALIZERS_ENABLED:
+            return None
+
+        return self.values_serializer_classes.get(self.action)
+
+    def get_values_serializer(self, *args: Any) -> ValuesSerializer:
+        values_serializer_class = self.get_values_serializer_class()
+        # sparse fieldsets, if the viewset supports them (see `SparseFieldsMixin`)
+        is_field_selected = getattr(self, 'is_field_selected', None)
+        field_names = [
+            field_name for field_name in values_serializer_class.serializer_class.Meta.fields
+            if is_field_selected is None or is_field_selected(field_name)
+        ]
+        return values_serializer_class(*args, context=self.get_serializer_context(), field_names=field_names)
+
+    def get_page_etag_parts(self, page: list) -> list:
+        if self.get_values_serializer_class() is None:
+            return super().get_page_etag_parts(page)
+
+        # values serializers are cheap enough to serialize the page before checking the ETag
+        self._page_data = self.get_serializer(page, many=True).data
+        return self._page_data
+
+    def get_page_data(self, page: list) -> list:
+        if self.get_values_serializer_class() is None:
+            return super().get_page_data(page)
+
+        return self._page_data
+
+    def paginate_queryset(self, queryset: QuerySet) -> list | None:
+        if self.get_values_serializer_class() is not None:
+            queryset = self.get_values_serializer().get_values_queryset(queryset)
+
+        return super().paginate_queryset(queryset)
+
+    def get_serializer(self, *args: Any, **kwargs: Any):
+        if self.get_values_serializer_class() is not None and kwargs.get('many'):
+            return self.get_values_serializer(*args)
+
+        return super().get_serializer(*args, **kwargs)
+
+
+class ConditionalResponseMixin:
+    """
+    Adds conditional GET to `list` and `retrieve` actions of a viewset.
+
+    ETag of a response is a hash of everything its content depends on: versions of serialized objects
+    (`etag_parts_getter`, e.g. primary keys, `updated_at` and counters), request path with query params
+    and the viewer with version of their follows and favourites. Requests with matching `If-None-Match`
+    get `304 Not Modified` without serialization, other requests get rendered JSON cached by ETag.
+    Viewer versions are bumped by signals (see `profiles.signals`), everything else is a part of the ETag.
+    """
+
+    conditional_actions: tuple[str, ...] = ('list', 'retrieve')
+    # called with a serialized instance, either a function (wrapped in `staticmethod`) or a method of the viewset
+    etag_parts_getter: Callable[[Any], tuple] | None = None
+
+    action: str
+    request: Request
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+
+        if not callable(cls.etag_parts_getter):
+            raise ImproperlyConfigured(f'{cls.__name__} must define `etag_parts_getter`.')
+
+    def get_viewer_etag_parts(self) -> tuple:
+        user = self.request.user
+
+        if not user.is_authenticated:
+            return ('anonymous',)
+
+        return user.pk, get_viewer_version(user.profile.pk)
+
+    def compute_etag(self, *parts: Any) -> str:
+        key = repr((
+            self.request.accepted_media_type,
+            # absolute urls of responses (e.g. of thumbnails and pagination links) depend on scheme and host
+            self.request.build_absolute_uri('/'),
+            self.request.get_full_path(),
+            self.get_viewer_etag_parts(),
+            parts,
+        ))
+        return f'W/"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
+    def get_conditional_response(self, etag: str, get_data: Callable[[], Any]) -> Response:
+        request = self.request
+
+        if get_conditional_response(request, etag=etag) is not None:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif request.accepted_renderer.format != 'json':
+            response = Response(get_data())
+        else:
+            key = RENDERED_CACHE_KEY.format(etag=etag)
+            content = cache.get(key)
+
+            if content is None:
+                content = request.accepted_renderer.render(
+                    get_data(), request.accepted_media_type, self.get_renderer_context()
+                )
+                cache.set(key, content, timeout=settings.RENDERED_RESPONSE_CACHE_TIMEOUT)
+
+            response = RenderedResponse(content)
+
+        response['ETag'] = etag
+        # responses depend on the viewer, they must not be stored by shared caches
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if self.action not in self.conditional_actions:
+            return super().retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+        etag = self.compute_etag(self.etag_parts_getter(instance))
+        return self.get_conditional_response(etag, lambda: self.get_serializer(instance).data)
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if self.action not in self.conditional_actions:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+
+        if page is None:
+            # lists of all objects are never cached
+            return super().list(request, *args, **kwargs)
+
+        # pagination envelope (count, links) without results
+        envelope = self.get_paginated_response([]).data
+        envelope_parts = [(key, value) for key, value in envelope.items() if key != 'results']
+
+        etag = self.compute_etag(envelope_parts, self.get_page_etag_parts(page))
+        return self.get_conditional_response(etag, lambda: self.get_paginated_response(self.get_page_data(page)).data)
+
+    def get_page_etag_parts(self, page: list) -> list:
+        return [self.etag_parts_getter(instance) for instance in page]
+
+    def get_page_data(self, page: list) -> list:
+        return self.get_serializer(page, many=True).data
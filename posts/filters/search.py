@@ -0,0 +1,32 @@
+from typing import Any
+
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, QuerySet
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+
+from posts.search import get_search_query, is_full_text_search_supported
+
+
+class PostsSearchFilter(SearchFilter):
+    """
+    On PostgreSQL searches posts by their GIN-indexed `search_vector` (prefix matching all terms)
+    and orders results by rank, unless `?ordering=` is given.
+
+    On other databases falls back to `SearchFilter`'s `icontains` lookups over view's `search_fields`.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        if not is_full_text_search_supported(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        search_query = get_search_query(self.get_search_terms(request))
+
+        if search_query is None:
+            return queryset
+
+        return queryset.filter(
+            search_vector=search_query
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-search_rank', '-created_at', '-id')
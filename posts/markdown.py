@@ -0,0 +1,20 @@
+from collections.abc import Iterable
+
+from martor.utils import markdownify
+
+# has to be bumped whenever rendering changes (e.g. markdown extensions or allowed tags),
+# so that `render_post_bodies` command renders bodies of existing posts again
+BODY_HTML_VERSION = 1
+
+
+def render_body_html(body: str) -> str:
+    """
+    Renders markdown body of a post to HTML, sanitized by martor (allowed tags, attributes and url schemes).
+    """
+    return markdownify(body or '')
+
+
+def assign_body_html(posts: Iterable['Post']) -> None:
+    for post in posts:
+        post.body_html = render_body_html(post.body)
+        post.body_html_version = BODY_HTML_VERSION
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_alter_tag_color'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='favourites_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
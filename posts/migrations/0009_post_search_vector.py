@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 15:14
+
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+import posts.search
+
+
+def update_search_vectors(apps, schema_editor):
+    # frozen copy of `posts.search.get_search_vector` at the time of this migration,
+    # so that later changes of the search vector do not change what this migration does
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Post = apps.get_model('posts', 'Post')
+    Profile = apps.get_model('profiles', 'Profile')
+    tags = Post.tags.through.objects.filter(
+        post_id=OuterRef('pk')
+    ).values('post_id').annotate(
+        tags=StringAgg('tag__tag', delimiter=' ')
+    ).values('tags')
+    username = Profile.objects.filter(pk=OuterRef('author_id')).values('user__username')
+
+    Post.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english') +
+        SearchVector(Subquery(tags), weight='B', config='english') +
+        SearchVector('description', weight='C', config='english') +
+        SearchVector(Subquery(username), weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_keyset_pagination_indexes'),
+        ('profiles', '0004_keyset_pagination_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=posts.search.SearchVectorIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ),
+        migrations.RunPython(update_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 15:38
+
+from django.db import migrations, models
+
+
+def create_post_slug_sequence(apps, schema_editor):
+    SlugSequence = apps.get_model('posts', 'SlugSequence')
+    SlugSequence.objects.get_or_create(name='posts.post')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.PositiveBigIntegerField(default=1)),
+            ],
+        ),
+        migrations.RunPython(create_post_slug_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-18 16:27
+
+from django.db import migrations, models
+from martor.utils import markdownify
+
+# frozen copy of `posts.markdown.BODY_HTML_VERSION` at the time of this migration, bodies rendered by later
+# renderers get rendered again by `render_post_bodies` command instead of this migration
+BODY_HTML_VERSION = 1
+
+
+def render_body_html(body: str) -> str:
+    # frozen copy of `posts.markdown.render_body_html` at the time of this migration
+    return markdownify(body or '')
+
+
+def render_bodies(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.only('pk', 'body').order_by('pk')
+    batch = []
+
+    for post in posts.iterator(chunk_size=1000):
+        post.body_html = render_body_html(post.body)
+        post.body_html_version = BODY_HTML_VERSION
+        batch.append(post)
+
+        if len(batch) == 1000:
+            Post.objects.bulk_update(batch, ['body_html', 'body_html_version'])
+            batch = []
+
+    Post.objects.bulk_update(batch, ['body_html', 'body_html_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_thumbnail_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='body_html_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_bodies, migrations.RunPython.noop),
+    ]
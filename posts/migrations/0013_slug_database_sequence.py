@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-18 19:20
+
+from django.db import migrations
+
+SEQUENCE_NAME = 'slug_sequence_posts_post'
+
+
+def create_database_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    SlugSequence = apps.get_model('posts', 'SlugSequence')
+    sequence, _ = SlugSequence.objects.get_or_create(name='posts.post')
+    schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE_NAME} START WITH {int(sequence.value)}')
+
+
+def drop_database_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    SlugSequence = apps.get_model('posts', 'SlugSequence')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT nextval(%s)', [SEQUENCE_NAME])
+        value, = cursor.fetchone()
+
+    SlugSequence.objects.update_or_create(name='posts.post', defaults={'value': value})
+    schema_editor.execute(f'DROP SEQUENCE {SEQUENCE_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_body_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_database_sequence, drop_database_sequence),
+    ]
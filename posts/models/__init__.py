@@ -1,3 +1,4 @@
 from .post import Post
 from .comment import Comment
 from .tag import Tag
+from .slug_sequence import SlugSequence
@@ -15,3 +15,9 @@ class Comment(TimestampedModel):
         related_name='comments',
         on_delete=models.CASCADE
     )
+
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # backs keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='comment_created_at_id_idx'),
+        ]
@@ -1,15 +1,61 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import OuterRef
 
-from core.shared.models import TimestampedModel
+from core.shared.expressions import SubqueryCount
+from core.shared.models import DenormalizedCountersMixin, TimestampedModel, TrackedFieldsMixin
+from posts.markdown import BODY_HTML_VERSION, assign_body_html
+from posts.search import SearchVectorIndex, get_search_vector, is_full_text_search_supported
+from posts.slugs import assign_slugs
+from .comment import Comment
 
+POST_COUNTERS = ('favourites_count', 'comments_count')
 
-class Post(TimestampedModel):
+
+class PostQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs) -> list['Post']:
+        # `pre_save` signal, which assigns slugs, is not sent and `save()`, which renders bodies, is not called
+        objs = list(objs)
+        assign_slugs(objs)
+        assign_body_html([obj for obj in objs if obj.body_html_version != BODY_HTML_VERSION])
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def recount_stats(self, *counters: str) -> int:
+        """
+        Recalculates given (by default all) denormalized counters of posts in a single UPDATE.
+        """
+        subqueries = {
+            'favourites_count': lambda: self.model.favourited_by.through.objects.filter(post_id=OuterRef('pk')),
+            'comments_count': lambda: Comment.objects.filter(post_id=OuterRef('pk')),
+        }
+        return self.update(**{
+            counter: SubqueryCount(subqueries[counter]())
+            for counter in counters or POST_COUNTERS
+        })
+
+    def update_search_vector(self) -> int:
+        """
+        Rebuilds search vectors of posts in a single UPDATE. Does nothing on databases other than PostgreSQL.
+        """
+        if not is_full_text_search_supported(self):
+            return 0
+
+        return self.update(search_vector=get_search_vector(self.model))
+
+
+class Post(TrackedFieldsMixin, DenormalizedCountersMixin, TimestampedModel):
     slug = models.SlugField(db_index=True, max_length=255, unique=True)
     title = models.CharField(db_index=True, max_length=255)
     description = models.TextField()
     body = models.TextField()
+    # sanitized HTML rendered from markdown `body` on save (see `posts.markdown`)
+    body_html = models.TextField(blank=True, default='', editable=False)
+    body_html_version = models.PositiveSmallIntegerField(default=0, editable=False)
     is_published = models.BooleanField(db_index=True, default=True)
     thumbnail = models.ImageField(upload_to='uploads/thumbnails', null=True, blank=True)
+    # resized thumbnails, generated in the background (see `posts.thumbnails`)
+    thumbnail_variants = models.JSONField(default=dict, blank=True, editable=False)
     author = models.ForeignKey(
         'profiles.Profile',
         on_delete=models.CASCADE,
@@ -19,14 +65,47 @@ class Post(TimestampedModel):
         'posts.Tag',
         related_name='posts'
     )
+    # denormalized counters, maintained by signals
+    favourites_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # full-text search document, maintained by signals (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    def __str__(self) -> str:
-        return self.slug
+    counter_fields = POST_COUNTERS
+    maintained_fields = ('search_vector',)
+    # rendered body and fields of the search vector
+    tracked_fields = ('body', 'title', 'description')
 
-    @property
-    def favourites_count(self) -> int:
-        return self.favourited_by.count()
+    objects = PostQuerySet.as_manager()
 
-    @property
-    def comments_count(self) -> int:
-        return self.comments.count()
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # backs keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+            SearchVectorIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ]
+
+    def save(self, *args, **kwargs) -> None:
+        # rendered when saved body changes (or has been rendered by an older renderer), so that reads never render
+        update_fields = kwargs.get('update_fields')
+        deferred_fields = self.get_deferred_fields()
+
+        renders_body = (
+            'body' not in deferred_fields
+            and (update_fields is None or 'body' in update_fields)
+            and (
+                'body' in self.get_changed_fields()
+                or ('body_html_version' not in deferred_fields and self.body_html_version < BODY_HTML_VERSION)
+            )
+        )
+
+        if renders_body:
+            assign_body_html([self])
+
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'body_html', 'body_html_version'}
+
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return self.slug
@@ -0,0 +1,45 @@
+from django.db import connections, models, router, transaction
+from django.db.models import F
+
+
+def get_database_sequence_name(name: str) -> str:
+    return f'slug_sequence_{name.replace(".", "_")}'
+
+
+class SlugSequenceQuerySet(models.QuerySet):
+
+    def reserve(self, name: str, size: int = 1) -> list[int]:
+        """
+        Reserves `size` values of the sequence, which no other caller will get.
+
+        On PostgreSQL values come from a database sequence, which never waits for other transactions
+        (values of rolled back transactions are skipped). Other databases lock the counter row
+        until the current transaction ends, which SQLite does for every write anyway.
+        """
+        connection = connections[router.db_for_write(self.model)]
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT nextval(%s) FROM generate_series(1, %s)', [get_database_sequence_name(name), size]
+                )
+                return sorted(value for value, in cursor.fetchall())
+
+        with transaction.atomic():
+            sequence, _ = self.select_for_update().get_or_create(name=name)
+            self.filter(pk=sequence.pk).update(value=F('value') + size)
+
+        return list(range(sequence.value, sequence.value + size))
+
+
+class SlugSequence(models.Model):
+    """
+    Counter which slug suffixes are allocated from, backed by a database sequence on PostgreSQL.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=1)
+
+    objects = SlugSequenceQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.value}'
@@ -1,18 +1,54 @@
 import secrets
+from collections.abc import Iterable
+
 from colorfield.fields import ColorField
 from django.db import models
 
 from core.shared.models import TimestampedModel
 
 
+def get_random_color() -> str:
+    return f'#{secrets.token_hex(3)}'
+
+
+class TagQuerySet(models.QuerySet):
+
+    def resolve(self, names: Iterable[str]) -> list['Tag']:
+        """
+        Returns tags matching given (case-insensitive) names by tag or slug, in the same order,
+        creating missing ones. Costs constant number of queries and is safe to run concurrently:
+        tags created by another transaction in the meantime are skipped on insert and read back.
+        """
+        names = [name.lower() for name in names]
+        unique_names = set(names)
+        tags_by_name = {}
+
+        for tag in self.filter(models.Q(slug__in=unique_names) | models.Q(tag__in=unique_names)):
+            # slug is unique, so it takes precedence over tag's name
+            if tag.slug in unique_names:
+                tags_by_name[tag.slug] = tag
+            tags_by_name.setdefault(tag.tag, tag)
+
+        if missing_names := unique_names - tags_by_name.keys():
+            self.bulk_create(
+                [self.model(tag=name, slug=name, color=get_random_color()) for name in missing_names],
+                ignore_conflicts=True,
+            )
+            tags_by_name.update((tag.slug, tag) for tag in self.filter(slug__in=missing_names))
+
+        return [tags_by_name[name] for name in names]
+
+
 class Tag(TimestampedModel):
     tag = models.CharField(max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
     color = ColorField(default='#000000', blank=True, null=True)
 
+    objects = TagQuerySet.as_manager()
+
     def save(self, *args, **kwargs) -> None:
         if not self.color:
-            self.color = f'#{secrets.token_hex(3)}'
+            self.color = get_random_color()
 
         super().save(*args, **kwargs)
 
@@ -7,7 +7,8 @@ from posts.models import Post
 
 
 class IsPostAuthorPermission(permissions.BasePermission):
-    protected_methods = ('PATCH', 'DELETE')
+    # POST is sent to object-level actions only, e.g. thumbnail upload
+    protected_methods = ('POST', 'PATCH', 'DELETE')
 
     def has_object_permission(self, request: Request, view: Any, obj: Post) -> bool:
         if request.method in self.protected_methods:
@@ -0,0 +1,69 @@
+import re
+from collections.abc import Iterable
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+from django.db.models import Index, Model, OuterRef, QuerySet, Subquery
+
+SEARCH_CONFIG = 'english'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class SearchVectorIndex(GinIndex):
+    """
+    GIN index on PostgreSQL and a plain index on other databases,
+    so that the same migrations can be applied to SQLite, which has no full-text search.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Index.create_sql(self, model, schema_editor, **kwargs)
+
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+def is_full_text_search_supported(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def get_search_vector(post_model: type[Model]) -> SearchVector:
+    """
+    Builds weighted search vector of posts: title (A), tags (B), description (C) and author's username (D).
+
+    Model is passed explicitly, so that the expression can be used with historical models in migrations.
+    """
+    tags = post_model.tags.through.objects.filter(
+        post_id=OuterRef('pk')
+    ).values('post_id').annotate(
+        tags=StringAgg('tag__tag', delimiter=' ')
+    ).values('tags')
+    username = post_model._meta.get_field('author').related_model.objects.filter(
+        pk=OuterRef('author_id')
+    ).values('user__username')
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector(Subquery(tags), weight='B', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='C', config=SEARCH_CONFIG) +
+        SearchVector(Subquery(username), weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def get_search_query(search_terms: Iterable[str]) -> SearchQuery | None:
+    """
+    Builds prefix matching query requiring all terms, e.g. `['djan', 'rest']` -> `djan:* & rest:*`.
+    Returns None if there are no words in the terms.
+    """
+    words = [word for term in search_terms for word in WORD_PATTERN.findall(term)]
+
+    if not words:
+        return None
+
+    return SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
@@ -1,8 +1,13 @@
 from rest_framework import serializers
 
-from core.shared.serializers import ToRepresentationRequiresUserMixin
+from core.shared.serializers import (
+    CachedDocumentMixin,
+    PrefetchListSerializer,
+    ToRepresentationRequiresUserMixin,
+)
 from posts.models import Comment, Post
-from profiles.serializers.profile import EmbeddedProfileSerializer
+from profiles.serializers.profile import EmbeddedProfileSerializer, get_profile_etag_parts
+from profiles.serializers.resolvers import get_follow_graph_resolver
 
 
 class CommentSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSerializer):
@@ -19,6 +24,10 @@ class CommentSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSeri
             'created_at',
             'updated_at',
         )
+        list_serializer_class = PrefetchListSerializer
+
+    def prefetch(self, instances: list[Comment]) -> None:
+        get_follow_graph_resolver(self).prefetch(comment.author_id for comment in instances)
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -38,7 +47,7 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('author', 'created_at', 'updated_at')
 
 
-class EmbeddedCommentSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSerializer):
+class EmbeddedCommentSerializer(CachedDocumentMixin, ToRepresentationRequiresUserMixin, serializers.ModelSerializer):
     author = EmbeddedProfileSerializer(read_only=True)
 
     class Meta:
@@ -50,3 +59,13 @@ class EmbeddedCommentSerializer(ToRepresentationRequiresUserMixin, serializers.M
             'created_at',
             'updated_at',
         )
+        list_serializer_class = PrefetchListSerializer
+
+    viewer_fields = ('author.is_followed_by_you',)
+
+    def get_document_version(self, instance: Comment) -> tuple:
+        return instance.pk, instance.updated_at, get_profile_etag_parts(instance.author)
+
+    def prefetch(self, instances: list[Comment]) -> None:
+        self.prefetch_documents(instances)
+        get_follow_graph_resolver(self).prefetch(comment.author_id for comment in instances)
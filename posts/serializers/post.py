@@ -1,46 +1,150 @@
-from django.contrib.auth.models import AnonymousUser
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db import transaction
-from django.db.models import QuerySet, Q
-from drf_extra_fields.fields import Base64ImageField
+from django.db.models import QuerySet
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
 
-from accounts.models import User
-from core.shared.serializers import ToRepresentationRequiresUserMixin
+from core.shared.fields import DimensionsLimitedImageField, StreamedBase64ImageField
+from core.shared.serializers import (
+    CachedDocumentMixin,
+    OptionalFieldsMixin,
+    PrefetchListSerializer,
+    ToRepresentationRequiresUserMixin,
+)
 from posts.models import Tag, Post
+from posts.models.post import POST_COUNTERS
+from posts.serializers.resolvers import get_favourites_resolver
 from posts.serializers.tag import TagSerializer
 from profiles.models import Profile
-from profiles.serializers.profile import EmbeddedProfileSerializer
+from profiles.serializers.profile import EmbeddedProfileSerializer, get_profile_etag_parts
+from profiles.serializers.resolvers import get_follow_graph_resolver
+
+
+class ManyTagRelatedField(ManyRelatedField):
+    """
+    Resolves the whole list of tags at once, instead of one tag at a time.
+    """
+
+    def to_internal_value(self, data: list[str]) -> list[Tag]:
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        return self.child_relation.resolve_tags(data)
 
 
 class TagRelatedField(serializers.RelatedField):
+    default_error_messages = {
+        'incorrect_type': 'Incorrect type. Expected tag name, received {data_type}.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs) -> ManyTagRelatedField:
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyTagRelatedField(**list_kwargs)
+
     def get_queryset(self) -> QuerySet[Tag]:
         return Tag.objects.all()
 
-    def to_internal_value(self, data: str) -> Tag:
-        lowercase_tag = data.lower()
-        tags = Tag.objects.filter(Q(tag=lowercase_tag) | Q(slug=lowercase_tag))
-        tag: Tag | None = tags.first()
+    def resolve_tags(self, data: list[str]) -> list[Tag]:
+        for value in data:
+            if not isinstance(value, str):
+                self.fail('incorrect_type', data_type=type(value).__name__)
 
-        if not tag:
-            return Tag.objects.create(tag=lowercase_tag, slug=lowercase_tag)
+        return self.get_queryset().resolve(data)
 
-        return tag
+    def to_internal_value(self, data: str) -> Tag:
+        return self.resolve_tags([data])[0]
 
     def to_representation(self, value: Tag):
         return value.tag
 
 
-class PostSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSerializer):
+class ThumbnailSrcsetField(serializers.Field):
+    """
+    Represents generated thumbnail variants as `srcset` attribute values, one for each image format, e.g.
+    `{"webp": "http://.../a-320w.webp 320w, http://.../a-640w.webp 640w", "jpeg": "..."}`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'thumbnail_variants')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value: dict) -> dict[str, str]:
+        request = self.context.get('request', None)
+        srcset = {}
+
+        for image_format, variants in value.get('formats', {}).items():
+            urls = (default_storage.url(variant['name']) for variant in variants)
+            srcset[image_format] = ', '.join(
+                f'{request.build_absolute_uri(url) if request is not None else url} {variant["width"]}w'
+                for url, variant in zip(urls, variants)
+            )
+
+        return srcset
+
+
+def get_post_etag_parts(post: Post, *, with_tags: bool = True) -> tuple:
+    """
+    Versions of serialized fields of the post, its author and tags, other than the viewer dependent ones.
+    Tags are expected to be prefetched, unless they are left out of the representation.
+    """
+    return (
+        post.pk, post.updated_at, post.body_html_version, post.thumbnail_variants,
+        *(getattr(post, counter) for counter in POST_COUNTERS),
+        get_profile_etag_parts(post.author),
+        tuple((tag.pk, tag.tag, tag.slug, tag.color) for tag in post.tags.all()) if with_tags else None,
+    )
+
+
+class BasePostSerializer(
+        CachedDocumentMixin,
+        OptionalFieldsMixin,
+        ToRepresentationRequiresUserMixin,
+        serializers.ModelSerializer
+):
+    """
+    Fields, documents and viewer dependent fields shared by serializers of posts, which list their own `Meta.fields`.
+    """
     author = EmbeddedProfileSerializer(read_only=True)
     is_favourited = serializers.SerializerMethodField()
     tags = TagSerializer(many=True, read_only=True)
-
-    def __init__(self, *args, user: User | AnonymousUser = None, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.user = user
+    thumbnail_srcset = ThumbnailSrcsetField()
 
     class Meta:
         model = Post
+        # requested with `?fields=...,body_html`
+        optional_fields = ('body_html',)
+        list_serializer_class = PrefetchListSerializer
+
+    viewer_fields = ('is_favourited', 'author.is_followed_by_you')
+
+    def get_document_version(self, instance: Post) -> tuple:
+        return get_post_etag_parts(instance, with_tags='tags' in self.fields)
+
+    def prefetch(self, instances: list[Post]) -> None:
+        self.prefetch_documents(instances)
+
+        # viewer dependent fields may be left out of sparse fieldsets
+        if 'is_favourited' in self.fields:
+            get_favourites_resolver(self).prefetch(post.pk for post in instances)
+
+        if 'author' in self.fields:
+            get_follow_graph_resolver(self).prefetch(post.author_id for post in instances)
+
+    def get_is_favourited(self, instance: Post) -> bool:
+        return get_favourites_resolver(self).is_favourited(instance.pk)
+
+
+class PostSerializer(BasePostSerializer):
+
+    class Meta(BasePostSerializer.Meta):
         fields = (
             'id',
             'author',
@@ -48,7 +152,9 @@ class PostSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSeriali
             'title',
             'description',
             'body',
+            'body_html',
             'thumbnail',
+            'thumbnail_srcset',
             'tags',
             'is_favourited',
             'is_published',
@@ -57,21 +163,10 @@ class PostSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSeriali
             'updated_at',
         )
 
-    def get_is_favourited(self, instance: Post) -> bool:
-        user = self.user or self.context['request'].user
-
-        if user is None or not user.is_authenticated:
-            return False
-
-        return user.profile.added_to_favourites(instance)
 
+class PostListSerializer(BasePostSerializer):
 
-class PostListSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSerializer):
-    author = EmbeddedProfileSerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
-
-    class Meta:
-        model = Post
+    class Meta(BasePostSerializer.Meta):
         fields = (
             'id',
             'slug',
@@ -79,9 +174,12 @@ class PostListSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSer
             'title',
             'description',
             'body',
+            'body_html',
             'is_published',
+            'is_favourited',
             'favourites_count',
             'thumbnail',
+            'thumbnail_srcset',
             'tags',
             'created_at',
             'updated_at',
@@ -90,7 +188,10 @@ class PostListSerializer(ToRepresentationRequiresUserMixin, serializers.ModelSer
 
 class PostCreateSerializer(serializers.ModelSerializer):
     tags = TagRelatedField(many=True, allow_empty=False)
-    thumbnail = Base64ImageField()
+    thumbnail = StreamedBase64ImageField(
+        max_width=settings.THUMBNAIL_MAX_DIMENSIONS[0],
+        max_height=settings.THUMBNAIL_MAX_DIMENSIONS[1],
+    )
 
     class Meta:
         model = Post
@@ -116,7 +217,14 @@ class PostCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data: dict) -> Post:
         author = self.author or self.context.get('author', None)
         tags = validated_data.pop('tags', [])
-        post = Post.objects.create(author=author, **validated_data)
+
+        try:
+            post = Post.objects.create(author=author, **validated_data)
+        finally:
+            # storage moves streamed thumbnail out of its temporary file
+            if thumbnail := validated_data.get('thumbnail'):
+                thumbnail.close()
+
         post.tags.add(*tags)
         return post
 
@@ -141,6 +249,17 @@ class PostUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'author', 'slug', 'title', 'created_at', 'updated_at')
 
 
+class PostThumbnailSerializer(serializers.ModelSerializer):
+    thumbnail = DimensionsLimitedImageField(
+        max_width=settings.THUMBNAIL_MAX_DIMENSIONS[0],
+        max_height=settings.THUMBNAIL_MAX_DIMENSIONS[1],
+    )
+
+    class Meta:
+        model = Post
+        fields = ('thumbnail',)
+
+
 class PostFavouriteSerializer(PostSerializer):
     class Meta(PostSerializer.Meta):
         read_only_fields = PostSerializer.Meta.fields
@@ -159,4 +278,5 @@ class PostFavouriteSerializer(PostSerializer):
         else:
             profile.remove_from_favourites(instance)
 
+        instance.refresh_from_db(fields=['favourites_count'])
         return instance
@@ -0,0 +1,75 @@
+from collections.abc import Iterable
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import serializers
+
+from accounts.models import User
+from core.shared.serializers import get_serializer_user
+from profiles.models import Profile
+
+FAVOURITES_RESOLVER_CONTEXT_KEY = 'favourites_resolver'
+
+
+class FavouritesResolver:
+    """
+    Resolves `is_favourited` flags of many posts for a single viewer.
+
+    Favourited post ids are loaded in batches (e.g. one query per page of posts)
+    and memoized, so that serializing a page does not issue one EXISTS query per post.
+    """
+
+    def __init__(self, profile: Profile | None, *, all_favourited: bool = False):
+        self.profile = profile
+        self.all_favourited = all_favourited
+        self._resolved_ids: set[int] = set()
+        self._favourited_ids: set[int] = set()
+
+    @classmethod
+    def for_user(cls, user: User | AnonymousUser | None, **kwargs) -> 'FavouritesResolver':
+        if user is None or not user.is_authenticated:
+            return cls(None, **kwargs)
+
+        return cls(user.profile, **kwargs)
+
+    def prefetch(self, post_ids: Iterable[int]) -> None:
+        missing_ids = set(post_ids) - self._resolved_ids
+
+        if not missing_ids or self.profile is None or self.all_favourited:
+            self._resolved_ids |= missing_ids
+            return
+
+        self._favourited_ids.update(
+            Profile.favourites.through.objects.filter(
+                profile_id=self.profile.pk,
+                post_id__in=missing_ids,
+            ).values_list('post_id', flat=True)
+        )
+        self._resolved_ids |= missing_ids
+
+    def is_favourited(self, post_id: int) -> bool:
+        if self.profile is None:
+            return False
+
+        if self.all_favourited:
+            return True
+
+        if post_id not in self._resolved_ids:
+            self.prefetch([post_id])
+
+        return post_id in self._favourited_ids
+
+
+def get_favourites_resolver(serializer: serializers.BaseSerializer) -> FavouritesResolver:
+    """
+    Returns resolver shared through the root serializer's context,
+    creating it for the serializer's user if it is not there yet.
+    """
+    context = serializer.context
+    resolver = context.get(FAVOURITES_RESOLVER_CONTEXT_KEY)
+
+    if resolver is None:
+        resolver = FavouritesResolver.for_user(get_serializer_user(serializer))
+        context[FAVOURITES_RESOLVER_CONTEXT_KEY] = resolver
+
+    return resolver
+
@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from core.shared.values import ValuesSerializer
+from posts.models import Post
+from posts.serializers.comment import CommentSerializer, EmbeddedCommentSerializer
+from posts.serializers.post import PostListSerializer
+from posts.serializers.resolvers import get_favourites_resolver
+from posts.serializers.tag import TagSerializer
+from profiles.serializers.values import EmbeddedProfileValuesSerializer
+
+
+class TagValuesSerializer(ValuesSerializer):
+    serializer_class = TagSerializer
+    fields = {
+        'id': 'id',
+        'tag': 'tag',
+        'slug': 'slug',
+        'color': 'color',
+    }
+
+
+class PostListValuesSerializer(ValuesSerializer):
+    serializer_class = PostListSerializer
+    fields = {
+        'id': 'id',
+        'slug': 'slug',
+        'title': 'title',
+        'description': 'description',
+        'body': 'body',
+        'body_html': 'body_html',
+        'is_published': 'is_published',
+        'favourites_count': 'favourites_count',
+        'thumbnail': 'thumbnail',
+        'thumbnail_srcset': 'thumbnail_variants',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    nested = {
+        'author': (EmbeddedProfileValuesSerializer, 'author'),
+    }
+    # cursor pagination reads positions from rows
+    extra_lookups = ('created_at',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tags_serializer = TagValuesSerializer(context=self.context, prefix='tag__')
+        self._tags: dict[int, list[dict]] = {}
+
+    def prefetch(self, rows: list[dict]) -> None:
+        super().prefetch(rows)
+        post_ids = [row[f'{self.prefix}id'] for row in rows]
+
+        if self.is_selected('is_favourited'):
+            get_favourites_resolver(self).prefetch(post_ids)
+
+        if not self.is_selected('tags'):
+            return
+
+        # same order as `Post.tags` (`Tag.Meta.ordering`)
+        tag_rows = Post.tags.through.objects.filter(
+            post_id__in=post_ids
+        ).order_by(
+            '-tag__created_at', '-tag__updated_at'
+        ).values('post_id', *self.tags_serializer.get_lookups())
+
+        self._tags = defaultdict(list)
+        for tag_row in tag_rows:
+            self._tags[tag_row['post_id']].append(self.tags_serializer.to_representation(tag_row))
+
+    def get_is_favourited(self, row: dict) -> bool:
+        return get_favourites_resolver(self).is_favourited(row[f'{self.prefix}id'])
+
+    def get_tags(self, row: dict) -> list[dict]:
+        return self._tags.get(row[f'{self.prefix}id'], [])
+
+
+class EmbeddedCommentValuesSerializer(ValuesSerializer):
+    serializer_class = EmbeddedCommentSerializer
+    fields = {
+        'id': 'id',
+        'body': 'body',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    nested = {
+        'author': (EmbeddedProfileValuesSerializer, 'author'),
+    }
+    # cursor pagination reads positions from rows
+    extra_lookups = ('created_at',)
+
+
+class CommentValuesSerializer(EmbeddedCommentValuesSerializer):
+    serializer_class = CommentSerializer
+    extra_lookups = (*EmbeddedCommentValuesSerializer.extra_lookups, 'post__slug')
+
+    def get_post(self, row: dict) -> str:
+        return row[f'{self.prefix}post__slug']
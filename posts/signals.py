@@ -1,34 +1,76 @@
-import string
+from typing import Any
 
-from django.db.models.signals import pre_save
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.utils.crypto import get_random_string
-from django.utils.text import slugify
 
-from .models import Post
-
-MAXIMUM_SLUG_LENGTH = 255
-DEFAULT_CHAR_STRING = string.ascii_lowercase + string.digits
+from accounts.models import User
+from .models import Comment, Post, Tag
+from .slugs import assign_slugs
+from .thumbnails import enqueue_thumbnail_variants
 
 
 @receiver(pre_save, sender=Post)
 def add_slug_to_post_if_not_exists(sender, instance: Post, *args, **kwargs):
     if instance and not instance.slug:
-        slug = slugify(instance.title)
-        unique = get_random_string(length=6, allowed_chars=DEFAULT_CHAR_STRING)
+        assign_slugs([instance])
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender: type, instance: Comment, created: bool, **kwargs: Any) -> None:
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comments_count=F('comments_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender: type, instance: Comment, **kwargs: Any) -> None:
+    Post.objects.filter(pk=instance.post_id).update(
+        # rows created in bulk (without signals) may already have a zero counter
+        comments_count=Greatest(F('comments_count') - 1, 0)
+    )
+
+
+@receiver(post_save, sender=Post)
+def process_post_thumbnail(sender: type, instance: Post, **kwargs: Any) -> None:
+    if (instance.thumbnail.name or None) != instance.thumbnail_variants.get('source'):
+        enqueue_thumbnail_variants(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_vector(sender: type, instance: Post, created: bool, **kwargs: Any) -> None:
+    # tags are added after the post is created, they update the vector on their own
+    if created or {'title', 'description'} & instance.get_changed_fields():
+        Post.objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tagged_posts_search_vectors(
+        sender: type, instance: Post | Tag, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Post.objects.filter(pk=instance.pk).update_search_vector()
+
+    # `clear()` does not pass primary keys of removed posts,
+    # so they are collected before the relation gets cleared
+    elif action == 'pre_clear':
+        instance._cleared_post_pks = list(instance.posts.values_list('pk', flat=True))
+
+    elif action == 'post_clear':
+        Post.objects.filter(pk__in=getattr(instance, '_cleared_post_pks', [])).update_search_vector()
+
+    elif action in ('post_add', 'post_remove'):
+        Post.objects.filter(pk__in=pk_set).update_search_vector()
 
-        if len(slug) > MAXIMUM_SLUG_LENGTH:
-            slug = slug[:MAXIMUM_SLUG_LENGTH]
 
-        while len(slug + '-' + unique) > MAXIMUM_SLUG_LENGTH:
-            parts = slug.split('-')
+@receiver(post_save, sender=Tag)
+def update_tag_posts_search_vectors(sender: type, instance: Tag, created: bool, **kwargs: Any) -> None:
+    if not created:
+        Post.objects.filter(tags=instance).update_search_vector()
 
-            if len(parts) == 1:
-                # The slug has no hypens. To append the unique string we must
-                # arbitrarly remove `len(unique)` characters from the end of
-                # `slug`. Subtract one to account for extra hyphen.
-                slug = slug[:MAXIMUM_SLUG_LENGTH - len(unique) - 1]
-            else:
-                slug = '-'.join(parts[:-1])
 
-        instance.slug = slug + '-' + unique
+@receiver(post_save, sender=User)
+def update_author_posts_search_vectors(sender: type, instance: User, created: bool, **kwargs: Any) -> None:
+    if not created and 'username' in instance.get_changed_fields():
+        Post.objects.filter(author__user=instance).update_search_vector()
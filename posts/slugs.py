@@ -0,0 +1,52 @@
+import string
+from collections.abc import Sequence
+
+from django.utils.text import slugify
+
+from posts.models.slug_sequence import SlugSequence
+
+MAXIMUM_SLUG_LENGTH = 255
+POST_SLUG_SEQUENCE = 'posts.post'
+BASE36_ALPHABET = string.digits + string.ascii_lowercase
+
+
+def to_base36(value: int) -> str:
+    digits = []
+
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(BASE36_ALPHABET[remainder])
+
+        if not value:
+            return ''.join(reversed(digits))
+
+
+def build_slug(title: str, suffix: str) -> str:
+    """
+    Appends suffix to the slugified title, trimming the title to the last whole word that fits.
+    """
+    max_length = MAXIMUM_SLUG_LENGTH - len(suffix) - 1
+    slug = slugify(title)
+
+    if len(slug) > max_length:
+        slug = slug[:max_length + 1]
+        # cut off the partial word (or the hyphen) at the end, unless the slug is a single word
+        slug = slug.rsplit('-', 1)[0] if '-' in slug else slug[:max_length]
+
+    return f'{slug}-{suffix}' if slug else suffix
+
+
+def assign_slugs(posts: Sequence) -> None:
+    """
+    Sets slugs of given posts which do not have one, allocating all suffixes with a single reservation.
+
+    Suffixes are unique values of a sequence in base36, so slugs never collide with each other,
+    and (while shorter than 6 characters) with legacy slugs, which ended with 6 random characters.
+    """
+    posts = [post for post in posts if not post.slug]
+
+    if not posts:
+        return
+
+    for post, value in zip(posts, SlugSequence.objects.reserve(POST_SLUG_SEQUENCE, size=len(posts))):
+        post.slug = build_slug(post.title, to_base36(value))
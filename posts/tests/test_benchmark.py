@@ -0,0 +1,116 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse_lazy
+
+from core.shared.benchmark import Measurement, compare_with_baseline, percentile, summarize
+from core.shared.factories import PostFactory, ProfileFactory
+from core.shared.middleware import QUERY_COUNT_HEADER, QUERY_DURATION_HEADER
+from core.shared.unit_tests import TearDownFilesMixin
+from posts.models import Post
+
+
+class BenchmarkTests(TestCase):
+
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 95), 4.8)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_summarize(self):
+        result = summarize([
+            Measurement(200, 0.01, 3, 0.002),
+            Measurement(200, 0.03, 5, 0.004),
+            Measurement(500, 0.02, 4, 0.003),
+        ], elapsed=0.5)
+
+        self.assertEqual(result['requests'], 3)
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(result['p50_ms'], 20)
+        self.assertEqual(result['throughput_rps'], 6)
+        self.assertEqual(result['queries'], 4)
+        self.assertEqual(result['query_ms'], 3)
+
+    def test_compare_with_baseline(self):
+        baseline = {'posts-list': {'p95_ms': 10, 'throughput_rps': 100, 'queries': 3, 'errors': 0}}
+
+        self.assertEqual(compare_with_baseline({
+            'posts-list': {'p95_ms': 11, 'throughput_rps': 90, 'queries': 3, 'errors': 0},
+            'posts-feed': {'p95_ms': 100, 'throughput_rps': 1, 'queries': 30, 'errors': 0},
+        }, baseline, tolerance=0.2), [])
+
+        regressions = compare_with_baseline({
+            'posts-list': {'p95_ms': 13, 'throughput_rps': 70, 'queries': 4, 'errors': 1},
+        }, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 4)
+
+
+@override_settings(THUMBNAIL_WORKERS=0)
+class BenchmarkCommandTests(TearDownFilesMixin, TestCase):
+
+    def setUp(self):
+        PostFactory.create_batch(3, tags=True, comments=True)
+
+    def test_benchmark_api_in_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'results.json'
+            call_command('benchmark_api', requests=2, output=output, stdout=StringIO())
+            results = json.loads(output.read_text())
+
+        self.assertIn('in-process:posts-list', results)
+        self.assertIn('in-process:token-refresh', results)
+        self.assertTrue(all(result['errors'] == 0 for result in results.values()))
+        self.assertTrue(all(result['requests'] == 2 for result in results.values()))
+        self.assertTrue(all(result['queries'] is not None for result in results.values()))
+
+    def test_benchmark_api_baseline_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / 'baseline.json'
+            baseline.write_text(json.dumps({'in-process:posts-list': {'queries': 0}}))
+
+            with self.assertRaisesMessage(CommandError, 'in-process:posts-list'):
+                call_command(
+                    'benchmark_api', requests=1, endpoints=['posts-list'], baseline=baseline, stdout=StringIO()
+                )
+
+    def test_benchmark_api_unknown_endpoint(self):
+        with self.assertRaisesMessage(CommandError, 'Unknown endpoints: unknown.'):
+            call_command('benchmark_api', endpoints=['unknown'], stdout=StringIO())
+
+    @patch('builtins.input', return_value='no')
+    def test_benchmark_api_fabricate_cancelled(self, mock_input):
+        with self.assertRaisesMessage(CommandError, 'Benchmark cancelled.'):
+            call_command('benchmark_api', fabricate=True, stdout=StringIO())
+
+        mock_input.assert_called_once()
+        self.assertEqual(Post.objects.count(), 3)
+
+
+class QueryStatsMiddlewareTests(TestCase):
+
+    @override_settings(
+        MIDDLEWARE=['core.shared.middleware.QueryStatsMiddleware', *settings.MIDDLEWARE],
+        QUERY_STATS_HEADERS=True,
+    )
+    def test_query_stats_headers(self):
+        profile = ProfileFactory()
+
+        response = self.client.get(reverse_lazy('profiles:profiles-detail', args=(profile.user.username,)))
+
+        self.assertGreater(int(response[QUERY_COUNT_HEADER]), 0)
+        self.assertGreaterEqual(float(response[QUERY_DURATION_HEADER]), 0)
+
+    @override_settings(
+        MIDDLEWARE=['core.shared.middleware.QueryStatsMiddleware', *settings.MIDDLEWARE],
+        QUERY_STATS_HEADERS=False,
+    )
+    def test_query_stats_headers_disabled(self):
+        response = self.client.get(reverse_lazy('posts:posts-list'))
+        self.assertNotIn(QUERY_COUNT_HEADER, response)
@@ -2,12 +2,12 @@ from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 
 from core.shared.factories import PostFactory, UserFactory
-from core.shared.unit_tests import APITestCase
+from core.shared.unit_tests import APITestCase, TearDownFilesMixin
 from posts.models import Comment
 from posts.serializers import CommentSerializer
 
 
-class CommentsViewsTests(APITestCase):
+class CommentsViewsTests(TearDownFilesMixin, APITestCase):
     comments_url = reverse_lazy("posts:comments-list")
 
     @classmethod
@@ -0,0 +1,256 @@
+import random
+from io import StringIO
+from itertools import accumulate
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from accounts.models import User
+from core.shared.deletion import fast_delete, is_truncate_safe
+from core.shared.fabrication import generate_posts_data, map_in_chunks
+from core.shared.social_graph import (
+    fabricate_social_graph,
+    get_popularity_weights,
+    sample_popular,
+    sample_power_law_degrees,
+)
+from core.shared.factories import PostFactory
+from core.shared.unit_tests import TearDownFilesMixin
+from posts.markdown import BODY_HTML_VERSION
+from posts.models import Comment, Post, Tag
+from profiles.models import FeedEntry, Profile
+
+
+@override_settings(THUMBNAIL_VARIANT_WIDTHS=(100,), THUMBNAIL_WORKERS=0)
+class BulkFabricationTests(TearDownFilesMixin, TestCase):
+
+    def _fabricate(self, **options) -> str:
+        out = StringIO()
+        call_command(
+            'fabricate_db',
+            bulk=True,
+            profiles=20,
+            posts=30,
+            tags=5,
+            thumbnails=2,
+            chunk_size=7,
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_fabricate_db_bulk(self):
+        self._fabricate()
+
+        self.assertEqual(User.objects.count(), 21)
+        self.assertEqual(Profile.objects.count(), 21)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Tag.objects.count(), 5)
+        self.assertTrue(User.objects.exclude(username='test').first().check_password('test'))
+
+        post = Post.objects.first()
+        self.assertEqual(post.body_html_version, BODY_HTML_VERSION)
+        self.assertTrue(post.body_html)
+        self.assertTrue(1 <= post.tags.count() <= 3)
+        self.assertEqual(post.thumbnail_variants['source'], post.thumbnail.name)
+        self.assertEqual(post.comments_count, post.comments.count())
+        self.assertEqual(len(set(Post.objects.values_list('thumbnail', flat=True))), 2)
+
+        profile = Profile.objects.order_by('-followers_count').first()
+        self.assertEqual(profile.followers_count, profile.followers.count())
+        self.assertTrue(FeedEntry.objects.exists())
+        self.assertFalse(Profile.followed.through.objects.filter(
+            from_profile_id=F('to_profile_id')
+        ).exists())
+
+    def _get_fabricated_data(self) -> tuple[list, list]:
+        return (
+            list(Post.objects.order_by('pk', 'tags__tag').values_list('title', 'body', 'tags__tag')),
+            list(Comment.objects.order_by('pk').values_list('body', flat=True)),
+        )
+
+    def test_fabricate_db_bulk_is_repeatable(self):
+        self._fabricate(seed=1)
+        first_run = self._get_fabricated_data()
+        call_command('clear_fabricated_db', stdout=StringIO())
+
+        self._fabricate(seed=1)
+        self.assertEqual(first_run, self._get_fabricated_data())
+
+    def test_map_in_chunks(self):
+        chunks = list(map_in_chunks(generate_posts_data, 5, seed=1, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks, list(map_in_chunks(generate_posts_data, 5, seed=1, chunk_size=2)))
+
+    def test_generate_posts_data_keeps_global_random_state(self):
+        state = random.getstate()
+        generate_posts_data(seed=1, count=2)
+        self.assertEqual(random.getstate(), state)
+
+    def test_fabricate_db_bulk_uniform_graph(self):
+        self._fabricate(graph_distribution='uniform', follows_per_profile=3)
+
+        profile = Profile.objects.order_by('-followed_count').first()
+        self.assertTrue(0 < profile.followed_count <= 6)
+
+
+class SocialGraphTests(TestCase):
+
+    def _create_profiles(self, count: int) -> list[int]:
+        users = User.objects.bulk_create(
+            User(username=f'user_{index}', email=f'user_{index}@example.com') for index in range(count)
+        )
+        return [profile.pk for profile in Profile.objects.bulk_create(Profile(user=user) for user in users)]
+
+    def test_sample_power_law_degrees(self):
+        degrees = sample_power_law_degrees(10_000, mean=10, max_degree=5000, rng=random.Random(0))
+
+        self.assertAlmostEqual(sum(degrees) / len(degrees), 10, delta=1)
+        self.assertLessEqual(max(degrees), 5000)
+        # heavy tail: a few nodes have far more edges than the median one
+        self.assertGreater(max(degrees), 50 * sorted(degrees)[len(degrees) // 2])
+
+    def test_sample_popular(self):
+        rng = random.Random(0)
+        population = list(range(100))
+        cum_weights = list(accumulate(get_popularity_weights(100)))
+
+        self.assertEqual(len(sample_popular(population, 10, cum_weights=cum_weights, rng=rng, exclude=0)), 10)
+        self.assertNotIn(0, sample_popular(population, 10, cum_weights=cum_weights, rng=rng, exclude=0))
+        self.assertEqual(
+            sample_popular(population, 200, cum_weights=cum_weights, rng=rng, exclude=0), set(range(1, 100))
+        )
+
+    def test_fabricate_social_graph(self):
+        profile_ids = self._create_profiles(200)
+        posts = list(Post.objects.bulk_create(
+            Post(author_id=profile_id, title='Title', description='Description', body='Body')
+            for profile_id in profile_ids[:50]
+        ))
+
+        follows_count, favourites_count = fabricate_social_graph(
+            profile_ids, [(post.pk, post.author_id) for post in posts],
+            follows_per_profile=10, favourites_per_profile=5, seed=1,
+        )
+        Profile.objects.recount_stats()
+
+        self.assertEqual(Profile.followed.through.objects.count(), follows_count)
+        self.assertEqual(Profile.favourites.through.objects.count(), favourites_count)
+        self.assertFalse(Profile.followed.through.objects.filter(from_profile_id=F('to_profile_id')).exists())
+
+        followers_counts = sorted(Profile.objects.values_list('followers_count', flat=True))
+        # celebrities are followed by a large part of all profiles
+        self.assertGreater(followers_counts[-1], 10 * followers_counts[len(followers_counts) // 2])
+
+    def test_fabricate_social_graph_counts_inserted_rows(self):
+        profile_ids = self._create_profiles(50)
+        Follows = Profile.followed.through
+
+        options = {'follows_per_profile': 5, 'favourites_per_profile': 0, 'seed': 1}
+
+        first_count, _ = fabricate_social_graph(profile_ids, [], **options)
+        Follows.objects.filter(pk__in=Follows.objects.values('pk')[:10]).delete()
+
+        second_count, _ = fabricate_social_graph(profile_ids, [], **options)
+        self.assertEqual(Follows.objects.count(), first_count)
+        self.assertEqual(second_count, 10)
+
+    def test_fabricate_social_graph_is_repeatable(self):
+        profile_ids = self._create_profiles(50)
+        Follows = Profile.followed.through
+
+        fabricate_social_graph(profile_ids, [], follows_per_profile=5, favourites_per_profile=0, seed=1)
+        follows = set(Follows.objects.values_list('from_profile_id', 'to_profile_id'))
+        Follows.objects.all().delete()
+
+        fabricate_social_graph(profile_ids, [], follows_per_profile=5, favourites_per_profile=0, seed=1)
+        self.assertEqual(set(Follows.objects.values_list('from_profile_id', 'to_profile_id')), follows)
+
+        fabricate_social_graph(profile_ids, [], follows_per_profile=5, favourites_per_profile=0, seed=2)
+        self.assertGreater(Follows.objects.count(), len(follows))
+
+    def test_fabricate_social_graph_command(self):
+        self._create_profiles(30)
+
+        out = StringIO()
+        call_command('fabricate_social_graph', follows_per_profile=3, stdout=out)
+        self.assertIn('follows', out.getvalue())
+
+        profile = Profile.objects.order_by('-followers_count').first()
+        self.assertEqual(profile.followers_count, profile.followers.count())
+        self.assertGreater(profile.followers_count, 0)
+
+
+class ClearFabricatedDbTests(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.superuser_profile = self.superuser.profile
+        self.posts = PostFactory.create_batch(3, tags=True, comments=True, with_thumbnail=False)
+        self.profile = self.posts[0].author
+        self.superuser_profile.follow(self.profile)
+        self.profile.follow(self.superuser_profile)
+        self.profile.add_to_favourites(self.posts[1])
+        self.token = OutstandingToken.objects.create(
+            user=self.profile.user, jti='jti', token='token', expires_at=timezone.now()
+        )
+
+    def _clear(self, **options) -> str:
+        out = StringIO()
+        call_command('clear_fabricated_db', stdout=out, **options)
+        return out.getvalue()
+
+    def assertCleared(self):
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Tag.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(FeedEntry.objects.exists())
+        self.assertFalse(Profile.favourites.through.objects.exists())
+        self.assertFalse(Profile.followed.through.objects.exists())
+        self.assertEqual(list(User.objects.all()), [self.superuser])
+        self.assertEqual(list(Profile.objects.all()), [self.superuser_profile])
+
+        self.superuser_profile.refresh_from_db()
+        self.assertEqual(self.superuser_profile.followed_count, 0)
+        self.assertEqual(self.superuser_profile.followers_count, 0)
+
+    def test_clear_fabricated_db(self):
+        self._clear()
+        self.assertCleared()
+
+    def test_clear_fabricated_db_fast(self):
+        out = self._clear(fast=True, chunk_size=2)
+        self.assertCleared()
+        self.assertIn('Cleared 3 posts', out)
+
+        self.token.refresh_from_db()
+        self.assertIsNone(self.token.user_id)
+
+    def test_clear_fabricated_db_fast_without_superusers(self):
+        self.superuser.delete()
+
+        self._clear(fast=True)
+
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Profile.objects.exists())
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Profile.followed.through.objects.exists())
+
+    def test_fast_delete(self):
+        comments_count = self.posts[1].comments.count()
+        deleted = fast_delete(Post.objects.filter(pk=self.posts[1].pk))
+
+        self.assertEqual(deleted['posts.Post'], 1)
+        self.assertEqual(deleted['profiles.Profile_favourites'], 1)
+        self.assertEqual(deleted['posts.Comment'], comments_count)
+        self.assertFalse(Profile.favourites.through.objects.exists())
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_is_truncate_safe(self):
+        self.assertTrue(is_truncate_safe(Post))
+        self.assertTrue(is_truncate_safe(Profile))
+        # outstanding tokens are detached from deleted users, not deleted
+        self.assertFalse(is_truncate_safe(User))
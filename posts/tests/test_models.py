@@ -0,0 +1,186 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+
+from core.shared.factories import PostFactory, ProfileFactory, CommentFactory, TagFactory
+from core.shared.unit_tests import TearDownFilesMixin
+from posts.models import Comment, Post, SlugSequence, Tag
+from posts.models.post import PostQuerySet
+from posts.slugs import MAXIMUM_SLUG_LENGTH, POST_SLUG_SEQUENCE, build_slug, to_base36
+
+
+class PostModelTests(TearDownFilesMixin, TestCase):
+
+    def test_comments_count(self):
+        post = PostFactory(comments=True, comments__size=3)
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 3)
+
+        post.comments.first().delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 2)
+
+    def test_comments_count_does_not_go_below_zero(self):
+        post = PostFactory()
+        # bulk created comments are not counted
+        Comment.objects.bulk_create([Comment(post=post, author=post.author, body='Comment')])
+
+        post.comments.first().delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 0)
+
+    def test_favourites_count(self):
+        post = PostFactory()
+        profiles = ProfileFactory.create_batch(3)
+
+        post.favourited_by.set(profiles)
+        post.refresh_from_db()
+        self.assertEqual(post.favourites_count, 3)
+
+        profiles[0].remove_from_favourites(post)
+        profiles[1].remove_from_favourites(post)
+        profiles[1].remove_from_favourites(post)
+        post.refresh_from_db()
+        self.assertEqual(post.favourites_count, 1)
+
+        post.favourited_by.clear()
+        post.refresh_from_db()
+        self.assertEqual(post.favourites_count, 0)
+
+    def test_recount_stats(self):
+        post = PostFactory()
+        CommentFactory.create_batch(2, post=post)
+        post.favourited_by.set(ProfileFactory.create_batch(2))
+        Post.objects.filter(pk=post.pk).update(favourites_count=10, comments_count=10)
+
+        Post.objects.all().recount_stats()
+
+        post.refresh_from_db()
+        self.assertEqual(post.favourites_count, 2)
+        self.assertEqual(post.comments_count, 2)
+
+
+class PostSearchVectorTests(TearDownFilesMixin, TestCase):
+
+    def setUp(self):
+        patcher = patch.object(PostQuerySet, 'update_search_vector', autospec=True, return_value=0)
+        self.update_search_vector = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_created_post_updates_search_vector(self):
+        PostFactory(with_thumbnail=False)
+        self.assertTrue(self.update_search_vector.called)
+
+    def test_save_without_changes_does_not_update_search_vector(self):
+        post = Post.objects.only('id').get(pk=PostFactory(with_thumbnail=False).pk)
+        # deferred fields are tracked once loaded
+        _ = post.title
+        self.update_search_vector.reset_mock()
+
+        post.save()
+        post.is_published = False
+        post.save()
+
+        self.update_search_vector.assert_not_called()
+
+    def test_changed_title_updates_search_vector(self):
+        post = Post.objects.get(pk=PostFactory(with_thumbnail=False).pk)
+        self.update_search_vector.reset_mock()
+
+        post.title = 'New title'
+        post.save()
+
+        self.update_search_vector.assert_called_once()
+
+    def test_only_renamed_user_updates_search_vectors_of_posts(self):
+        user = PostFactory(with_thumbnail=False).author.user
+        self.update_search_vector.reset_mock()
+
+        user.first_name = 'First'
+        user.save()
+        self.update_search_vector.assert_not_called()
+
+        user.username = 'renamed'
+        user.save()
+        self.update_search_vector.assert_called_once()
+
+
+class TagModelTests(TestCase):
+
+    def test_resolve_existing_tags(self):
+        by_name = TagFactory(tag='python')
+        by_slug = Tag.objects.create(tag='Django', slug='django')
+
+        with self.assertNumQueries(1):
+            tags = Tag.objects.resolve(['Python', 'django', 'python'])
+
+        self.assertEqual(tags, [by_name, by_slug, by_name])
+
+    def test_resolve_creates_missing_tags(self):
+        existing = Tag.objects.create(tag='python', slug='python')
+        names = ['python', *(f'tag{i}' for i in range(10))]
+
+        with self.assertNumQueries(3):
+            tags = Tag.objects.resolve(names)
+
+        self.assertEqual(tags[0], existing)
+        self.assertEqual([tag.slug for tag in tags], names)
+        self.assertTrue(all(tag.pk and tag.color for tag in tags))
+        self.assertEqual(Tag.objects.count(), 11)
+
+
+class PostSlugTests(TestCase):
+
+    def test_to_base36(self):
+        self.assertEqual(to_base36(0), '0')
+        self.assertEqual(to_base36(35), 'z')
+        self.assertEqual(to_base36(36), '10')
+        self.assertEqual(to_base36(36 ** 3 + 1), '1001')
+
+    def test_build_slug_trims_to_whole_words(self):
+        title = ' '.join(['word'] * 100)
+        slug = build_slug(title, 'abc')
+
+        self.assertLessEqual(len(slug), MAXIMUM_SLUG_LENGTH)
+        self.assertTrue(slug.endswith('word-abc'))
+
+    def test_build_slug_single_long_word(self):
+        slug = build_slug('a' * 300, 'abc')
+        self.assertEqual(slug, 'a' * (MAXIMUM_SLUG_LENGTH - 4) + '-abc')
+
+    def test_build_slug_empty_title(self):
+        self.assertEqual(build_slug('???', 'abc'), 'abc')
+
+    def test_posts_with_same_title_get_unique_slugs(self):
+        author = ProfileFactory()
+        posts = [
+            Post.objects.create(author=author, title='Same title', description='-', body='-')
+            for _ in range(3)
+        ]
+
+        slugs = {post.slug for post in posts}
+        self.assertEqual(len(slugs), 3)
+        self.assertTrue(all(slug.startswith('same-title-') for slug in slugs))
+
+    def test_bulk_create_assigns_slugs(self):
+        author = ProfileFactory()
+
+        # nextval() on PostgreSQL, otherwise locking and bumping the counter row (in a savepoint), and a single INSERT
+        with self.assertNumQueries(2 if connection.vendor == 'postgresql' else 5):
+            posts = Post.objects.bulk_create([
+                Post(author=author, title='Bulk post', description='-', body='-')
+                for _ in range(10)
+            ])
+
+        self.assertEqual(len({post.slug for post in posts}), 10)
+        self.assertEqual(Post.objects.filter(slug__startswith='bulk-post-').count(), 10)
+
+    def test_slug_sequence_reserves_unique_values(self):
+        first = SlugSequence.objects.reserve(POST_SLUG_SEQUENCE, size=3)
+        second = SlugSequence.objects.reserve(POST_SLUG_SEQUENCE)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(len({*first, *second}), 4)
+        self.assertLess(max(first), min(second))
@@ -1,9 +1,31 @@
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
 from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.reverse import reverse_lazy
+from rest_framework.settings import api_settings
+from rest_framework.viewsets import GenericViewSet
 
 from core.shared.factories import ProfileFactory, TagFactory, PostFactory, CommentFactory, UserFactory
+from core.shared.parsers import ORJSONParser
+from core.shared.renderers import ORJSONRenderer
+from core.shared.serializers import UserAttributeRequiredError
 from core.shared.unit_tests import APITestCase, TearDownFilesMixin
+from core.shared.views import ConditionalResponseMixin
+from posts.markdown import BODY_HTML_VERSION
 from posts.models import Post
 from posts.serializers import PostSerializer
 from posts.serializers.comment import EmbeddedCommentSerializer
@@ -46,6 +68,65 @@ class PostsViewsTests(TearDownFilesMixin, APITestCase):
             context={'request': response.wsgi_request}
         ).data)
 
+    def test_list_posts_number_of_queries_does_not_depend_on_page_size(self):
+        profile = ProfileFactory()
+        posts = PostFactory.create_batch(5, tags=True)
+        profile.favourites.add(posts[0])
+        profile.follow(posts[1].author)
+        self._require_jwt(profile.user)
+        # authenticated user is cached by the first request
+        self.client.get(self.posts_url)
+
+        with CaptureQueriesContext(connection) as queries_for_one_post:
+            self.client.get(self.posts_url, {'page_size': 1})
+
+        with CaptureQueriesContext(connection) as queries_for_all_posts:
+            self.client.get(self.posts_url, {'page_size': 5})
+
+        self.assertEqual(len(queries_for_all_posts), len(queries_for_one_post))
+
+    def test_list_posts_cursor_pagination(self):
+        PostFactory.create_batch(5, with_thumbnail=False)
+        expected_ids = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        response = self.client.get(self.posts_url, {'pagination': 'cursor', 'page_size': 2})
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response_json)
+        self.assertIsNone(response_json['previous'])
+
+        pages = [[post['id'] for post in response_json['results']]]
+        while response_json['next']:
+            response_json = self.client.get(response_json['next']).json()
+            pages.append([post['id'] for post in response_json['results']])
+
+        self.assertEqual(pages, [expected_ids[0:2], expected_ids[2:4], expected_ids[4:5]])
+
+        response_json = self.client.get(response_json['previous']).json()
+        self.assertEqual([post['id'] for post in response_json['results']], expected_ids[2:4])
+
+    def test_list_posts_invalid_cursor(self):
+        response = self.client.get(self.posts_url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_posts_search(self):
+        django_post = PostFactory(title='Django xylophones', with_thumbnail=False)
+        tagged_post = PostFactory(title='Web applications', with_thumbnail=False)
+        tagged_post.tags.add(TagFactory(tag='django'))
+        PostFactory(title='Flask', with_thumbnail=False)
+
+        response = self.client.get(self.posts_url, {'search': 'djang'})
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {post['id'] for post in response_json['results']},
+            {django_post.id, tagged_post.id}
+        )
+
+        response = self.client.get(self.posts_url, {'search': 'django xylophone'})
+        response_json = response.json()
+        self.assertEqual([post['id'] for post in response_json['results']], [django_post.id])
+
     # todo: filtering, ordering, searching, etc.
 
     def test_list_feed_posts(self):
@@ -67,6 +148,47 @@ class PostsViewsTests(TearDownFilesMixin, APITestCase):
             context={'request': response.wsgi_request}
         ).data)
 
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=2)
+    def test_list_feed_posts_cursor_pagination(self):
+        profile = ProfileFactory()
+        author, celebrity = ProfileFactory.create_batch(2)
+        profile.followed.set([author, celebrity])
+        # fanned out while the celebrity had fewer followers than the limit, then pulled on read as well
+        PostFactory(author=celebrity, with_thumbnail=False)
+        ProfileFactory().follow(celebrity)
+
+        for index in range(3):
+            PostFactory(author=author, title='Skipped' if index == 2 else 'Post', with_thumbnail=False)
+            PostFactory(author=celebrity, title='Post', with_thumbnail=False)
+        PostFactory(with_thumbnail=False)
+
+        expected_ids = list(Post.objects.filter(
+            author__in=[author, celebrity]
+        ).order_by('-created_at', '-id').values_list('id', flat=True))
+        self._require_jwt(profile.user)
+
+        response = self.client.get(reverse_lazy('posts:posts-feed'), {'pagination': 'cursor', 'page_size': 2})
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        pages = [[post['id'] for post in response_json['results']]]
+        while response_json['next']:
+            response_json = self.client.get(response_json['next']).json()
+            pages.append([post['id'] for post in response_json['results']])
+
+        self.assertEqual(pages, [expected_ids[0:2], expected_ids[2:4], expected_ids[4:6], expected_ids[6:7]])
+
+        response_json = self.client.get(response_json['previous']).json()
+        self.assertEqual([post['id'] for post in response_json['results']], expected_ids[4:6])
+
+        response_json = self.client.get(
+            reverse_lazy('posts:posts-feed'), {'pagination': 'cursor', 'page_size': 2, 'title__icontains': 'post'}
+        ).json()
+        expected_ids = [
+            post_id for post_id in expected_ids if Post.objects.get(pk=post_id).title != 'Skipped'
+        ]
+        self.assertEqual([post['id'] for post in response_json['results']], expected_ids[0:2])
+
     def test_list_feed_posts_unauthorized(self):
         response = self.client.get(reverse_lazy('posts:posts-feed'))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -88,6 +210,28 @@ class PostsViewsTests(TearDownFilesMixin, APITestCase):
             context={'request': response.wsgi_request}
         ).data)
 
+    def test_list_posts_is_favourited(self):
+        profile = ProfileFactory()
+        favourited, not_favourited = PostFactory.create_batch(2)
+        profile.favourites.add(favourited)
+
+        self._require_jwt(profile.user)
+        response = self.client.get(self.posts_url)
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        is_favourited = {post['id']: post['is_favourited'] for post in response_json['results']}
+        self.assertEqual(is_favourited, {favourited.id: True, not_favourited.id: False})
+
+    def test_list_favourites_posts_are_favourited(self):
+        profile = ProfileFactory()
+        profile.favourites.set(PostFactory.create_batch(3))
+
+        self._require_jwt(profile.user)
+        response = self.client.get(reverse_lazy('posts:posts-favourites'))
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(post['is_favourited'] for post in response_json['results']))
+
     def test_list_favourites_posts_unauthorized(self):
         response = self.client.get(reverse_lazy('posts:posts-favourites'))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -146,6 +290,37 @@ class PostsViewsTests(TearDownFilesMixin, APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(post.tags.count(), 1)
 
+    def test_create_post_resolves_tags_in_bulk(self):
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+        tag = TagFactory()
+
+        response = self.client.post(self.posts_url, {
+            'title': 'Test title',
+            'description': 'Test description',
+            'body': 'Test body',
+            'tags': [tag.tag.upper(), *(f'new-tag-{i}' for i in range(10))],
+            'thumbnail': BASE_64_IMAGE
+        })
+        post = profile.posts.first()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(post.tags.count(), 11)
+        self.assertIn(tag, post.tags.all())
+
+    def test_create_post_invalid_tag_type(self):
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+
+        response = self.client.post(self.posts_url, {
+            'title': 'Test title',
+            'description': 'Test description',
+            'body': 'Test body',
+            'tags': [{'tag': 'python'}],
+            'thumbnail': BASE_64_IMAGE
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tags', response.json())
+
     def test_retrieve_post(self):
         post = PostFactory(tags=True, comments=True)
         profile = post.author
@@ -311,3 +486,377 @@ class PostsViewsTests(TearDownFilesMixin, APITestCase):
             'description': 'test',
         })
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PostsConditionalResponseTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def _get_post_url(self, post: Post) -> str:
+        return reverse_lazy('posts:posts-detail', args=(post.slug,))
+
+    def test_retrieve_post_not_modified(self):
+        post = PostFactory()
+        response = self.client.get(self._get_post_url(post))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('private', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        # post with author, tags
+        self.assertEqual(len(queries), 2)
+
+    def test_viewset_without_etag_parts_getter_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            type('ViewSet', (ConditionalResponseMixin, GenericViewSet), {})
+
+    def test_list_posts_not_modified(self):
+        PostFactory.create_batch(3)
+        response = self.client.get(self.posts_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.posts_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.posts_url, {'page_size': 2}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 2)
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'example.com'])
+    def test_retrieve_post_etag_changes_with_host(self):
+        post = PostFactory()
+        response = self.client.get(self._get_post_url(post))
+
+        for extra, base_url in (({'HTTP_HOST': 'example.com'}, 'http://example.com/'), ({'secure': True}, 'https://')):
+            etag_response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=response['ETag'], **extra)
+            self.assertEqual(etag_response.status_code, status.HTTP_200_OK)
+            self.assertTrue(etag_response.json()['thumbnail'].startswith(base_url))
+
+    def test_list_posts_etag_changes_with_posts(self):
+        PostFactory.create_batch(2)
+        etag = self.client.get(self.posts_url)['ETag']
+
+        post = PostFactory()
+        response = self.client.get(self.posts_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 3)
+
+        etag = response['ETag']
+        post.delete()
+        response = self.client.get(self.posts_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_retrieve_post_etag_changes_with_update(self):
+        post = PostFactory()
+        self._require_jwt(post.author.user)
+        etag = self.client.get(self._get_post_url(post))['ETag']
+
+        self.client.patch(self._get_post_url(post), {'description': 'Updated description'})
+        response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['description'], 'Updated description')
+
+    def test_retrieve_post_etag_changes_with_favourite(self):
+        post = PostFactory()
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+        etag = self.client.get(self._get_post_url(post))['ETag']
+
+        profile.favourites.add(post)
+        response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['is_favourited'])
+        self.assertEqual(response.json()['favourites_count'], 1)
+
+    def test_retrieve_post_etag_changes_with_follow(self):
+        post = PostFactory()
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+        etag = self.client.get(self._get_post_url(post))['ETag']
+
+        profile.follow(post.author)
+        response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['author']['is_followed_by_you'])
+
+    def test_retrieve_post_etag_changes_with_tag(self):
+        tag = TagFactory()
+        post = PostFactory(tags=[tag])
+        etag = self.client.get(self._get_post_url(post))['ETag']
+
+        tag.tag = 'renamed'
+        tag.save()
+        response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['tags'][0]['tag'], 'renamed')
+
+    def test_etag_depends_on_viewer(self):
+        post = PostFactory()
+        etag = self.client.get(self._get_post_url(post))['ETag']
+
+        self._require_jwt(ProfileFactory().user)
+        response = self.client.get(self._get_post_url(post), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_rendered_response_is_cached(self):
+        post = PostFactory()
+        first_response = self.client.get(self._get_post_url(post))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self._get_post_url(post))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, first_response.content)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        # post with author, tags, but not favourites of the viewer
+        self.assertEqual(len(queries), 2)
+
+
+class PostDocumentCacheTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def test_documents_are_shared_by_viewers(self):
+        posts = PostFactory.create_batch(3)
+        first_viewer, second_viewer = ProfileFactory.create_batch(2)
+        first_viewer.favourites.add(posts[0])
+        first_viewer.follow(posts[1].author)
+        second_viewer.favourites.add(posts[2])
+
+        self._require_jwt(first_viewer.user)
+        self.client.get(self.posts_url)
+
+        self._require_jwt(second_viewer.user)
+        response = self.client.get(self.posts_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()['results'],
+            PostListSerializer(Post.objects.all(), many=True, context={'request': response.wsgi_request}).data
+        )
+
+        results = {post['id']: post for post in response.json()['results']}
+        self.assertEqual(
+            [results[post.pk]['is_favourited'] for post in posts],
+            [False, False, True]
+        )
+        self.assertFalse(any(result['author']['is_followed_by_you'] for result in results.values()))
+
+    def test_document_keeps_order_of_fields(self):
+        post = PostFactory()
+        url = reverse_lazy('posts:posts-detail', args=(post.slug,))
+        first_response = self.client.get(url)
+
+        self._require_jwt(ProfileFactory().user)
+        response = self.client.get(url)
+        self.assertEqual(list(response.json()), list(first_response.json()))
+
+    def test_document_changes_with_author(self):
+        post = PostFactory()
+        url = reverse_lazy('posts:posts-detail', args=(post.slug,))
+        self.client.get(url)
+
+        post.author.user.username = 'renamed'
+        post.author.user.save()
+        self._require_jwt(ProfileFactory().user)
+        response = self.client.get(url)
+        self.assertEqual(response.json()['author']['username'], 'renamed')
+
+
+class PostSerializerRepresentationTests(TearDownFilesMixin, APITestCase):
+
+    def test_user_is_passed_to_nested_serializers(self):
+        post = PostFactory()
+        profile = ProfileFactory()
+        profile.follow(post.author)
+
+        data = PostListSerializer([post], many=True, user=profile.user).data
+
+        self.assertIs(type(data[0]), dict)
+        self.assertTrue(data[0]['author']['is_followed_by_you'])
+
+    def test_detail_and_list_serializers_keep_their_fields(self):
+        post = PostFactory()
+        profile = ProfileFactory()
+
+        for serializer_class in (PostSerializer, PostListSerializer):
+            fields = [field for field in serializer_class.Meta.fields if field != 'body_html']
+            self.assertEqual(list(serializer_class(post, user=profile.user).data), fields)
+
+    def test_user_is_required_by_nested_serializers(self):
+        post = PostFactory()
+
+        with self.assertRaises(UserAttributeRequiredError):
+            _ = PostListSerializer(post).data
+
+
+class ORJSONRendererTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def test_list_posts_rendered_with_orjson(self):
+        PostFactory.create_batch(3, tags=True)
+        expected = self.client.get(self.posts_url)
+
+        response = self.client.get(self.posts_url, HTTP_ACCEPT='application/json; encoder=orjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json; encoder=orjson')
+        self.assertEqual(json.loads(response.content), expected.json())
+        self.assertNotEqual(response['ETag'], expected['ETag'])
+
+    def test_render_same_as_json_renderer(self):
+        data = {
+            'datetime': datetime(2023, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'date': date(2023, 1, 2),
+            'decimal': Decimal('1.5'),
+            'lazy': gettext_lazy('text'),
+            'separators': 'a b c',
+            'nested': [{1: 'integer key'}],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class ORJSONParserTests(APITestCase):
+
+    def test_parse_same_as_json_parser(self):
+        content = '{"title": "Tytu\u0142", "tags": ["a", "b"], "number": 1.5, "nested": {"null": null}}'.encode()
+
+        self.assertEqual(ORJSONParser().parse(BytesIO(content)), JSONParser().parse(BytesIO(content)))
+
+    def test_parse_invalid_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"title": '))
+
+    def test_json_requests_are_parsed_with_orjson(self):
+        self.assertIs(api_settings.DEFAULT_PARSER_CLASSES[0], ORJSONParser)
+        self.assertIn(JSONParser, api_settings.DEFAULT_PARSER_CLASSES)
+
+
+class PostsSparseFieldsTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def test_list_posts_omit_body(self):
+        PostFactory.create_batch(3, tags=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.posts_url, {'omit': 'body'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all('body' not in post for post in response.json()['results']))
+        self.assertTrue(all('tags' in post for post in response.json()['results']))
+        self.assertFalse(any('"posts_post"."body"' in query['sql'] for query in queries))
+
+    def test_list_posts_select_fields(self):
+        PostFactory.create_batch(3, tags=True)
+        self._require_jwt(ProfileFactory().user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.posts_url, {'fields': 'id,title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()['results'],
+            list(Post.objects.values('id', 'title'))
+        )
+        # neither tags nor favourites are loaded
+        self.assertFalse(any('posts_post_tags' in query['sql'] for query in queries))
+        self.assertFalse(any('profiles_profile_favourites' in query['sql'] for query in queries))
+
+    def test_retrieve_post_omit_body(self):
+        post = PostFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse_lazy('posts:posts-detail', args=(post.slug,)), {'omit': 'body,description'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('body', response.json())
+        self.assertNotIn('description', response.json())
+        self.assertEqual(response.json()['title'], post.title)
+        self.assertFalse(any('"posts_post"."body"' in query['sql'] for query in queries))
+
+    def test_list_comments_omit_body(self):
+        post = PostFactory(comments=True)
+
+        response = self.client.get(reverse_lazy('posts:posts-comments', args=(post.slug,)), {'omit': 'body'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(set(comment) == {'id', 'author', 'created_at', 'updated_at'}
+                            for comment in response.json()['results']))
+
+    def test_sparse_fields_ignored_on_update(self):
+        post = PostFactory()
+        self._require_jwt(post.author.user)
+
+        response = self.client.patch(
+            f"{reverse_lazy('posts:posts-detail', args=(post.slug,))}?omit=body", {'body': 'Updated body'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['body'], 'Updated body')
+
+
+class PostBodyHtmlTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def test_body_html_rendered_on_save(self):
+        post = PostFactory(body='**Bold** <script>alert(1)</script>')
+        self.assertIn('<strong>Bold</strong>', post.body_html)
+        self.assertNotIn('<script>', post.body_html)
+        self.assertEqual(post.body_html_version, BODY_HTML_VERSION)
+
+        post.body = '# Title'
+        post.save(update_fields=['body'])
+        post.refresh_from_db()
+        self.assertIn('Title</h1>', post.body_html)
+
+    def test_body_html_rendered_only_when_body_changes(self):
+        post = Post.objects.get(pk=PostFactory(body='**Bold**', with_thumbnail=False).pk)
+
+        with patch('posts.models.post.assign_body_html') as assign_body_html:
+            post.title = 'New title'
+            post.save()
+            Post.objects.get(pk=post.pk).save(update_fields=['body'])
+            assign_body_html.assert_not_called()
+
+            post.body = '*Italic*'
+            post.save()
+            assign_body_html.assert_called_once_with([post])
+
+    def test_outdated_body_html_rendered_on_save(self):
+        post = PostFactory(body='**Bold**', with_thumbnail=False)
+        Post.objects.filter(pk=post.pk).update(body_html='', body_html_version=0)
+
+        post = Post.objects.get(pk=post.pk)
+        post.save()
+        post.refresh_from_db()
+        self.assertIn('<strong>Bold</strong>', post.body_html)
+        self.assertEqual(post.body_html_version, BODY_HTML_VERSION)
+
+    def test_body_html_is_optional(self):
+        post = PostFactory(body='**Bold**')
+        post_url = reverse_lazy('posts:posts-detail', args=(post.slug,))
+
+        response = self.client.get(post_url)
+        self.assertNotIn('body_html', response.json())
+
+        response = self.client.get(post_url, {'fields': 'id,body_html'})
+        self.assertEqual(response.json(), {'id': post.id, 'body_html': post.body_html})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.posts_url)
+        self.assertTrue(all('body_html' not in post for post in response.json()['results']))
+        self.assertFalse(any('"posts_post"."body_html"' in query['sql'] for query in queries))
+
+        response = self.client.get(self.posts_url, {'fields': 'id,body_html'})
+        self.assertEqual(response.json()['results'], [{'id': post.id, 'body_html': post.body_html}])
+
+    def test_render_post_bodies_command(self):
+        posts = PostFactory.create_batch(3, body='*Italic*')
+        Post.objects.filter(pk__in=[posts[0].pk, posts[1].pk]).update(body_html='', body_html_version=0)
+        updated_at = Post.objects.get(pk=posts[0].pk).updated_at
+
+        out = StringIO()
+        call_command('render_post_bodies', chunk_size=1, stdout=out)
+        self.assertIn('Rendered bodies of 2 posts.', out.getvalue())
+
+        post = Post.objects.get(pk=posts[0].pk)
+        self.assertEqual(post.body_html, posts[2].body_html)
+        self.assertEqual(post.body_html_version, BODY_HTML_VERSION)
+        self.assertEqual(post.updated_at, updated_at)
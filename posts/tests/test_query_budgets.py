@@ -0,0 +1,222 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.reverse import reverse_lazy
+
+from core.shared.factories import CommentFactory, PostFactory, ProfileFactory, TagFactory
+from core.shared.fabrication import fabricate_profiles
+from core.shared.unit_tests import APITestCase, TearDownFilesMixin
+from posts.models import Comment, Post, Tag
+from posts.tests.test_posts_views import BASE_64_IMAGE
+from posts.tests.test_thumbnails import get_image
+from profiles.models import FeedEntry, Profile
+
+
+def create_posts(count: int, *, viewer: Profile) -> list[Post]:
+    """
+    Creates posts of distinct authors followed by the viewer, with tags and comments,
+    in the viewer's feed and favourites, so that every viewer dependent field has something to resolve.
+    """
+    author_ids = fabricate_profiles(count, seed=Post.objects.count())
+    offset = Post.objects.count()
+    posts = Post.objects.bulk_create(
+        Post(
+            author_id=author_id,
+            title=f'Post {index}',
+            slug=f'post-{index}',
+            description='Description',
+            body=f'Body of **post {index}**',
+        )
+        for index, author_id in enumerate(author_ids, start=offset)
+    )
+    tags = Tag.objects.bulk_create(
+        Tag(tag=f'tag {post.pk}', slug=f'tag-{post.pk}', color='#000000') for post in posts
+    )
+    Post.tags.through.objects.bulk_create(
+        Post.tags.through(post_id=post.pk, tag_id=tag.pk) for post, tag in zip(posts, tags)
+    )
+    Comment.objects.bulk_create(
+        Comment(post_id=post.pk, author_id=viewer.pk, body='Comment') for post in posts
+    )
+    FeedEntry.objects.bulk_create(
+        FeedEntry(owner_id=viewer.pk, post_id=post.pk, author_id=post.author_id, created_at=post.created_at)
+        for post in posts
+    )
+    Profile.followed.through.objects.bulk_create(
+        Profile.followed.through(from_profile_id=viewer.pk, to_profile_id=author_id) for author_id in author_ids
+    )
+    Profile.favourites.through.objects.bulk_create(
+        Profile.favourites.through(profile_id=viewer.pk, post_id=post.pk) for post in posts
+    )
+    return posts
+
+
+# budgets of writes include updates of search vectors, which run on PostgreSQL only
+@override_settings(THUMBNAIL_VARIANT_WIDTHS=(100,), THUMBNAIL_WORKERS=0, VALUES_SERIALIZERS_ENABLED=False)
+class PostsViewSetQueryBudgetTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+    feed_url = reverse_lazy('posts:posts-feed')
+    favourites_url = reverse_lazy('posts:posts-favourites')
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ProfileFactory()
+        self._require_jwt(self.profile.user)
+
+    def test_list(self):
+        self.assertPageQueryBudget(6, self.posts_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_list_unauthorized(self):
+        self.client.credentials()
+        self.assertPageQueryBudget(3, self.posts_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_list_search(self):
+        self.assertPageQueryBudget(
+            6, self.posts_url, lambda count: create_posts(count, viewer=self.profile), {'search': 'post'}
+        )
+
+    def test_list_cursor_pagination(self):
+        self.assertPageQueryBudget(
+            5, self.posts_url, lambda count: create_posts(count, viewer=self.profile), {'pagination': 'cursor'}
+        )
+
+    def test_list_feed(self):
+        self.assertPageQueryBudget(6, self.feed_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_list_feed_cursor_pagination(self):
+        self.assertPageQueryBudget(
+            7, self.feed_url, lambda count: create_posts(count, viewer=self.profile), {'pagination': 'cursor'}
+        )
+
+    def test_list_favourites(self):
+        self.assertPageQueryBudget(5, self.favourites_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_comments(self):
+        post = PostFactory(with_thumbnail=False)
+        url = reverse_lazy('posts:posts-comments', args=(post.slug,))
+
+        self.assertPageQueryBudget(4, url, lambda count: Comment.objects.bulk_create(
+            Comment(post=post, author_id=author_id, body='Comment') for author_id in fabricate_profiles(count, seed=0)
+        ))
+
+    def test_retrieve(self):
+        post = PostFactory(with_thumbnail=False, tags=True)
+        self.profile.favourites.add(post)
+        self.profile.follow(post.author)
+
+        self.assertQueryBudget(5, 'get', reverse_lazy('posts:posts-detail', args=(post.slug,)))
+
+    def test_comments_detail(self):
+        comment = CommentFactory(author=self.profile)
+        url = reverse_lazy('posts:posts-comments-detail', args=(comment.post.slug, comment.pk))
+
+        self.assertQueryBudget(3, 'get', url)
+        self.assertQueryBudget(4, 'delete', url)
+
+    def test_create(self):
+        TagFactory(tag='django')
+
+        self.assertQueryBudget(19, 'post', self.posts_url, {
+            'title': 'Title',
+            'description': 'Description',
+            'body': 'Body',
+            'tags': ['django', 'python'],
+            'thumbnail': BASE_64_IMAGE,
+        })
+
+    def test_partial_update(self):
+        post = PostFactory(author=self.profile, with_thumbnail=False, tags=True)
+
+        self.assertQueryBudget(6, 'patch', reverse_lazy('posts:posts-detail', args=(post.slug,)), {
+            'title': 'New title',
+            'body': 'New body',
+        })
+
+    def test_destroy(self):
+        post = PostFactory(author=self.profile, with_thumbnail=False, tags=True, comments=True)
+        FeedEntry.objects.add_posts([ProfileFactory().pk], Post.objects.filter(pk=post.pk))
+
+        self.assertQueryBudget(15, 'delete', reverse_lazy('posts:posts-detail', args=(post.slug,)))
+
+    def test_favourite(self):
+        url = reverse_lazy('posts:posts-favourite', args=(PostFactory(with_thumbnail=False).slug,))
+
+        self.assertQueryBudget(10, 'post', url)
+        self.assertQueryBudget(10, 'delete', url)
+
+    def test_thumbnail(self):
+        post = PostFactory(author=self.profile, with_thumbnail=False)
+
+        self.assertQueryBudget(7, 'post', reverse_lazy('posts:posts-thumbnail', args=(post.slug,)), {
+            'thumbnail': SimpleUploadedFile('image.png', get_image(200, 100), content_type='image/png'),
+        })
+
+
+@override_settings(VALUES_SERIALIZERS_ENABLED=True)
+class PostsViewSetValuesQueryBudgetTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+    feed_url = reverse_lazy('posts:posts-feed')
+    favourites_url = reverse_lazy('posts:posts-favourites')
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ProfileFactory()
+        self._require_jwt(self.profile.user)
+
+    def test_list(self):
+        self.assertPageQueryBudget(6, self.posts_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_list_cursor_pagination(self):
+        self.assertPageQueryBudget(
+            5, self.posts_url, lambda count: create_posts(count, viewer=self.profile), {'pagination': 'cursor'}
+        )
+
+    def test_list_feed(self):
+        self.assertPageQueryBudget(6, self.feed_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_list_feed_cursor_pagination(self):
+        self.assertPageQueryBudget(
+            7, self.feed_url, lambda count: create_posts(count, viewer=self.profile), {'pagination': 'cursor'}
+        )
+
+    def test_list_favourites(self):
+        self.assertPageQueryBudget(5, self.favourites_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_comments(self):
+        post = PostFactory(with_thumbnail=False)
+        url = reverse_lazy('posts:posts-comments', args=(post.slug,))
+
+        self.assertPageQueryBudget(4, url, lambda count: Comment.objects.bulk_create(
+            Comment(post=post, author_id=author_id, body='Comment') for author_id in fabricate_profiles(count, seed=0)
+        ))
+
+
+@override_settings(VALUES_SERIALIZERS_ENABLED=False)
+class CommentsViewSetQueryBudgetTests(APITestCase):
+    comments_url = reverse_lazy('posts:comments-list')
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ProfileFactory()
+        self._require_jwt(self.profile.user)
+
+    def test_list(self):
+        self.assertPageQueryBudget(4, self.comments_url, lambda count: create_posts(count, viewer=self.profile))
+
+    def test_create(self):
+        post = PostFactory(with_thumbnail=False)
+
+        self.assertQueryBudget(4, 'post', self.comments_url, {'body': 'Comment', 'post': post.slug})
+
+    @override_settings(VALUES_SERIALIZERS_ENABLED=True)
+    def test_list_values(self):
+        self.assertPageQueryBudget(4, self.comments_url, lambda count: create_posts(count, viewer=self.profile))
+
+
+class TagsViewSetQueryBudgetTests(APITestCase):
+    tags_url = reverse_lazy('posts:tags-list')
+
+    def test_list(self):
+        self.assertPageQueryBudget(2, self.tags_url, lambda count: Tag.objects.bulk_create(
+            Tag(tag=f'tag {index}', slug=f'tag-{index}', color='#000000')
+            for index in range(Tag.objects.count(), Tag.objects.count() + count)
+        ))
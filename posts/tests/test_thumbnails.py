@@ -0,0 +1,203 @@
+import base64
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+
+from core.shared.factories import PostFactory, ProfileFactory
+from core.shared.fields import decode_base64_to_file
+from core.shared.unit_tests import APITestCase, TearDownFilesMixin
+from posts.models import Post
+from posts.thumbnails import generate_thumbnail_variants, get_thumbnail_widths
+
+
+def get_image(width: int, height: int) -> bytes:
+    content = BytesIO()
+    Image.new('RGB', (width, height), color='red').save(content, format='png')
+    return content.getvalue()
+
+
+def get_base64_image(width: int, height: int) -> str:
+    return f'data:image/png;base64,{base64.b64encode(get_image(width, height)).decode()}'
+
+
+@override_settings(THUMBNAIL_VARIANT_WIDTHS=(320, 640), THUMBNAIL_WORKERS=0)
+class ThumbnailsTests(TearDownFilesMixin, APITestCase):
+    posts_url = reverse_lazy('posts:posts-list')
+
+    def test_get_thumbnail_widths(self):
+        self.assertEqual(get_thumbnail_widths(1000), [320, 640])
+        self.assertEqual(get_thumbnail_widths(500), [320, 500])
+        self.assertEqual(get_thumbnail_widths(100), [100])
+
+    def test_decode_base64_to_file_in_chunks(self):
+        data = base64.b64encode(bytes(range(256)) * 10).decode()
+        data = '\n'.join(data[i:i + 76] for i in range(0, len(data), 76))
+        file = BytesIO()
+
+        decode_base64_to_file(data, file, chunk_size=100)
+
+        self.assertEqual(file.getvalue(), bytes(range(256)) * 10)
+
+    def test_create_post_generates_thumbnail_variants(self):
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.posts_url, {
+                'title': 'Test title',
+                'description': 'Test description',
+                'body': 'Test body',
+                'tags': ['test'],
+                'thumbnail': get_base64_image(800, 400),
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        post = profile.posts.get()
+        self.assertEqual(post.thumbnail_variants['source'], post.thumbnail.name)
+        self.assertEqual(set(post.thumbnail_variants['formats']), {'webp', 'jpeg'})
+
+        for variant, width in zip(post.thumbnail_variants['formats']['webp'], [320, 640]):
+            self.assertEqual(variant['width'], width)
+            with default_storage.open(variant['name']) as file, Image.open(file) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertEqual(image.size, (width, width // 2))
+
+        response = self.client.get(reverse_lazy('posts:posts-detail', args=(post.slug,)))
+        srcset = response.json()['thumbnail_srcset']
+        self.assertEqual(set(srcset), {'webp', 'jpeg'})
+        self.assertTrue(srcset['webp'].endswith('-640w.webp 640w'))
+
+    def test_create_post_invalid_base64_thumbnail(self):
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+
+        response = self.client.post(self.posts_url, {
+            'title': 'Test title',
+            'description': 'Test description',
+            'body': 'Test body',
+            'tags': ['test'],
+            'thumbnail': 'data:image/png;base64,not*base64',
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('thumbnail', response.json())
+
+    def test_create_post_too_large_dimensions_base64_thumbnail(self):
+        profile = ProfileFactory()
+        self._require_jwt(profile.user)
+
+        response = self.client.post(self.posts_url, {
+            'title': 'Test title',
+            'description': 'Test description',
+            'body': 'Test body',
+            'tags': ['test'],
+            'thumbnail': get_base64_image(5000, 1),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('thumbnail', response.json())
+        self.assertFalse(Post.objects.exists())
+
+
+@override_settings(THUMBNAIL_VARIANT_WIDTHS=(100,), THUMBNAIL_WORKERS=0)
+class ThumbnailUploadTests(TearDownFilesMixin, APITestCase):
+
+    def _get_thumbnail_url(self, post) -> str:
+        return reverse_lazy('posts:posts-thumbnail', args=(post.slug,))
+
+    def test_upload_thumbnail_multipart(self):
+        post = PostFactory(with_thumbnail=False)
+        self._require_jwt(post.author.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self._get_thumbnail_url(post), {
+                'thumbnail': SimpleUploadedFile('image.png', get_image(200, 100), content_type='image/png'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnail.name.endswith('.png'))
+        self.assertEqual(post.thumbnail_variants['source'], post.thumbnail.name)
+        self.assertEqual(response.json()['thumbnail'], f'http://testserver/{post.thumbnail.name}')
+
+    def test_upload_thumbnail_raw_body(self):
+        post = PostFactory(with_thumbnail=False)
+        self._require_jwt(post.author.user)
+
+        response = self.client.post(
+            self._get_thumbnail_url(post), get_image(200, 100), content_type='image/png'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        post.refresh_from_db()
+        self.assertEqual((post.thumbnail.width, post.thumbnail.height), (200, 100))
+
+    def test_upload_thumbnail_not_author(self):
+        post = PostFactory(with_thumbnail=False)
+        self._require_jwt(ProfileFactory().user)
+
+        response = self.client.post(
+            self._get_thumbnail_url(post), get_image(200, 100), content_type='image/png'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(THUMBNAIL_MAX_UPLOAD_SIZE=100)
+    def test_upload_thumbnail_too_large_file(self):
+        post = PostFactory(with_thumbnail=False)
+        self._require_jwt(post.author.user)
+
+        response = self.client.post(
+            self._get_thumbnail_url(post), b'0' * 1000, content_type='image/png'
+        )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_upload_thumbnail_too_large_dimensions(self):
+        post = PostFactory(with_thumbnail=False)
+        self._require_jwt(post.author.user)
+
+        response = self.client.post(
+            self._get_thumbnail_url(post), get_image(5000, 1), content_type='image/png'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('thumbnail', response.json())
+
+
+@override_settings(THUMBNAIL_VARIANT_WIDTHS=(100,))
+class ThumbnailVariantsTests(TearDownFilesMixin, TestCase):
+
+    def test_replaced_thumbnail_variants_are_deleted(self):
+        post = PostFactory()
+        generate_thumbnail_variants(post.pk)
+        post.refresh_from_db()
+        old_names = [variant['name'] for variants in post.thumbnail_variants['formats'].values() for variant in variants]
+
+        post.thumbnail = PostFactory(author=post.author).thumbnail
+        post.save()
+        generate_thumbnail_variants(post.pk)
+        post.refresh_from_db()
+
+        self.assertEqual(post.thumbnail_variants['source'], post.thumbnail.name)
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+
+    def test_shared_thumbnail_variants_are_kept(self):
+        post = PostFactory()
+        generate_thumbnail_variants(post.pk)
+        post.refresh_from_db()
+        other_post = PostFactory(author=post.author, thumbnail=post.thumbnail.name)
+        Post.objects.filter(pk=other_post.pk).update(thumbnail_variants=post.thumbnail_variants)
+        names = [variant['name'] for variants in post.thumbnail_variants['formats'].values() for variant in variants]
+
+        post.thumbnail = PostFactory(author=post.author).thumbnail
+        post.save()
+        generate_thumbnail_variants(post.pk)
+
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+
+    def test_post_without_thumbnail(self):
+        post = PostFactory(with_thumbnail=False)
+        generate_thumbnail_variants(post.pk)
+        post.refresh_from_db()
+        self.assertEqual(post.thumbnail_variants, {})
@@ -0,0 +1,99 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.shared.factories import CommentFactory, PostFactory, ProfileFactory, TagFactory
+from core.shared.unit_tests import TearDownFilesMixin
+from posts.models import Comment, Post
+from posts.serializers import CommentSerializer
+from posts.serializers.comment import EmbeddedCommentSerializer
+from posts.serializers.post import PostListSerializer
+from posts.serializers.values import (
+    CommentValuesSerializer,
+    EmbeddedCommentValuesSerializer,
+    PostListValuesSerializer,
+)
+from posts.views import CommentsViewSet, PostsViewSet
+
+
+class ValuesSerializersEquivalenceTests(TearDownFilesMixin, TestCase):
+    """
+    Values serializers have to produce the same output as model serializers they replace.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = ProfileFactory()
+        tags = TagFactory.create_batch(3)
+
+        cls.posts = [
+            PostFactory(tags=tags),
+            PostFactory(tags=tags[:1], with_thumbnail=False),
+            PostFactory(tags=False, author=cls.viewer),
+            PostFactory(tags=tags[1:]),
+        ]
+        Post.objects.filter(pk=cls.posts[0].pk).update(thumbnail_variants={
+            'source': cls.posts[0].thumbnail.name,
+            'formats': {'webp': [{'width': 320, 'name': 'uploads/thumbnails/variants/a-320w.webp'}]},
+        })
+
+        cls.viewer.favourites.add(cls.posts[0], cls.posts[2])
+        cls.viewer.follow(cls.posts[3].author)
+        cls.posts[1].author.follow(cls.viewer)
+
+        for post in cls.posts[:2]:
+            CommentFactory(post=post, author=cls.viewer)
+            CommentFactory(post=post, author=cls.posts[3].author)
+
+    def _get_request(self, user) -> Request:
+        request = Request(APIRequestFactory().get('/'))
+        request.user = user
+        return request
+
+    def assertEquivalent(self, serializer_class, values_serializer_class, queryset):
+        for user in (self.viewer.user, AnonymousUser()):
+            with self.subTest(user=user):
+                expected = serializer_class(queryset, many=True, context={'request': self._get_request(user)}).data
+                data = values_serializer_class(queryset, context={'request': self._get_request(user)}).data
+
+                self.assertEqual(data, expected)
+                self.assertEqual([list(item) for item in data], [list(item) for item in expected])
+
+    def test_post_list(self):
+        queryset = Post.objects.select_related('author', 'author__user').prefetch_related('tags')
+        self.assertEquivalent(PostListSerializer, PostListValuesSerializer, queryset)
+
+    def test_comments(self):
+        queryset = Comment.objects.select_related('author', 'author__user', 'post')
+        self.assertEquivalent(CommentSerializer, CommentValuesSerializer, queryset)
+
+    def test_embedded_comments(self):
+        queryset = Comment.objects.filter(post=self.posts[0]).select_related('author', 'author__user')
+        self.assertEquivalent(EmbeddedCommentSerializer, EmbeddedCommentValuesSerializer, queryset)
+
+    def test_values_queryset(self):
+        queryset = Post.objects.filter(pk=self.posts[0].pk)
+        rows = PostListValuesSerializer(context={}).get_values_queryset(queryset)
+
+        self.assertEqual(
+            set(rows.get()),
+            {
+                'id', 'slug', 'title', 'description', 'body', 'is_published', 'favourites_count',
+                'thumbnail', 'thumbnail_variants', 'created_at', 'updated_at',
+                'author__id', 'author__user__username', 'author__user__email', 'author__image',
+            }
+        )
+
+
+class ValuesSerializersEnabledTests(TestCase):
+
+    def test_enabled_per_action(self):
+        self.assertIs(PostsViewSet(action='list').get_values_serializer_class(), PostListValuesSerializer)
+        self.assertIs(CommentsViewSet(action='list').get_values_serializer_class(), CommentValuesSerializer)
+        self.assertIsNone(PostsViewSet(action='retrieve').get_values_serializer_class())
+
+    @override_settings(VALUES_SERIALIZERS_ENABLED=False)
+    def test_disabled_by_setting(self):
+        self.assertIsNone(PostsViewSet(action='list').get_values_serializer_class())
+        self.assertIsNone(CommentsViewSet(action='list').get_values_serializer_class())
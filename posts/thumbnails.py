@@ -0,0 +1,110 @@
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_VARIANTS_DIRECTORY = 'uploads/thumbnails/variants'
+THUMBNAIL_FORMATS = {
+    # format: (extension, save options)
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_thumbnail_widths(width: int) -> list[int]:
+    """
+    Returns widths of variants for an image of given width, which are never upscaled.
+    """
+    widths = [w for w in settings.THUMBNAIL_VARIANT_WIDTHS if w < width]
+    return widths if len(widths) == len(settings.THUMBNAIL_VARIANT_WIDTHS) else [*widths, width]
+
+
+def generate_thumbnail_variants(post_id: int) -> None:
+    """
+    Generates resized variants of the post's thumbnail in every format of `THUMBNAIL_FORMATS`
+    and stores them in `Post.thumbnail_variants`, replacing variants of the previous thumbnail.
+    """
+    post = Post.objects.filter(pk=post_id).only('thumbnail', 'thumbnail_variants').first()
+
+    if post is None or post.thumbnail_variants.get('source') == (post.thumbnail.name or None):
+        return
+
+    variants = {'source': post.thumbnail.name or None, 'formats': {}}
+
+    if post.thumbnail:
+        with post.thumbnail.open('rb') as file, Image.open(file) as image:
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            stem = posixpath.splitext(posixpath.basename(post.thumbnail.name))[0]
+
+            for width in get_thumbnail_widths(image.width):
+                resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+                for image_format, (extension, options) in THUMBNAIL_FORMATS.items():
+                    content = BytesIO()
+                    resized.save(content, format=image_format, **options)
+                    name = default_storage.save(
+                        f'{THUMBNAIL_VARIANTS_DIRECTORY}/{stem}-{width}w.{extension}',
+                        ContentFile(content.getvalue()),
+                    )
+                    variants['formats'].setdefault(image_format, []).append({'width': width, 'name': name})
+
+    # compare-and-set: if thumbnail or its variants changed in the meantime, another job takes care of them
+    same_thumbnail = Q(thumbnail=post.thumbnail.name) if post.thumbnail else Q(thumbnail='') | Q(thumbnail=None)
+    updated = Post.objects.filter(
+        same_thumbnail, pk=post_id, thumbnail_variants=post.thumbnail_variants,
+    ).update(thumbnail_variants=variants)
+
+    stale_variants = post.thumbnail_variants if updated else variants
+
+    # variants of a thumbnail shared by other posts (e.g. fabricated ones) are still referenced by them
+    if updated and stale_variants.get('formats') and Post.objects.filter(
+        thumbnail_variants__source=stale_variants.get('source'),
+    ).exclude(pk=post_id).exists():
+        return
+
+    for format_variants in stale_variants.get('formats', {}).values():
+        for variant in format_variants:
+            default_storage.delete(variant['name'])
+
+
+def _run_thumbnail_job(post_id: int) -> None:
+    try:
+        generate_thumbnail_variants(post_id)
+    except Exception:
+        logger.exception('Failed to generate thumbnail variants of post %s', post_id)
+    finally:
+        # worker threads open their own connections
+        connections.close_all()
+
+
+def enqueue_thumbnail_variants(post_id: int) -> None:
+    """
+    Generates thumbnail variants once the current transaction commits,
+    in a pool of `THUMBNAIL_WORKERS` threads, or synchronously if it is 0.
+    """
+    global _executor
+
+    if not settings.THUMBNAIL_WORKERS:
+        transaction.on_commit(lambda: generate_thumbnail_variants(post_id))
+        return
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(settings.THUMBNAIL_WORKERS, thread_name_prefix='thumbnails')
+
+    transaction.on_commit(lambda: _executor.submit(_run_thumbnail_job, post_id))
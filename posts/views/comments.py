@@ -5,17 +5,22 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
 from core.shared.pagination import page_number_pagination_factory
+from core.shared.views import SparseFieldsMixin, ValuesListMixin
 from posts.filters.comments import CommentsFilterSet
 from posts.models import Comment
 from posts.serializers import CommentSerializer
 from posts.serializers.comment import CommentCreateSerializer
+from posts.serializers.values import CommentValuesSerializer
 
 CommentsPagination = page_number_pagination_factory(
-    page_size=25, max_page_size=50
+    page_size=25, max_page_size=50,
+    cursor_ordering=('-created_at', '-id'),
 )
 
 
 class CommentsViewSet(
+    ValuesListMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
@@ -27,6 +32,10 @@ class CommentsViewSet(
     ordering_fields = ['created_at', 'updated_at']
     search_fields = ('body', 'author__username', 'post__title')
     filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
+    deferrable_fields = ('body',)
+    values_serializer_classes = {
+        'list': CommentValuesSerializer,
+    }
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -35,7 +44,10 @@ class CommentsViewSet(
         return super().get_serializer_class()
 
     def get_queryset(self) -> QuerySet[Comment]:
-        return Comment.objects.select_related('author', 'author__user').all()
+        # only slugs of posts are serialized
+        return Comment.objects.select_related('author', 'author__user', 'post').defer(
+            'post__description', 'post__body', 'post__body_html', 'post__search_vector'
+        )
 
     def perform_create(self, serializer: CommentCreateSerializer) -> None:
         serializer.save(author=self.request.user.profile)
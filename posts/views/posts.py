@@ -1,10 +1,12 @@
 from typing import Any
 
+from django.conf import settings
 from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import (
     IsAuthenticated, IsAuthenticatedOrReadOnly
 )
@@ -12,30 +14,97 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from core.shared.pagination import page_number_pagination_factory
+from core.shared.uploads import LimitedTemporaryFileUploadHandler, RawImageUploadParser
+from core.shared.views import ConditionalResponseMixin, SparseFieldsMixin, ValuesListMixin
 from posts.filters.posts import PostsFilterSet
+from posts.filters.search import PostsSearchFilter
 from posts.models import Post, Comment
 from posts.permissions.comments import IsCommentsAuthorPermission
 from posts.permissions.post import IsPostAuthorPermission
 from posts.serializers import PostSerializer
 from posts.serializers.comment import EmbeddedCommentSerializer
+from posts.serializers.values import EmbeddedCommentValuesSerializer, PostListValuesSerializer
+from posts.serializers.resolvers import (
+    FAVOURITES_RESOLVER_CONTEXT_KEY,
+    FavouritesResolver,
+)
 from posts.serializers.post import (
     PostListSerializer,
     PostCreateSerializer,
     PostUpdateSerializer,
     PostFavouriteSerializer,
+    PostThumbnailSerializer,
+    get_post_etag_parts,
 )
+from profiles.models import FeedEntry
+
+
+class ThumbnailUploadParser(RawImageUploadParser):
+    file_field = 'thumbnail'
+
 
 PostsPagination = page_number_pagination_factory(
     page_size=25,
     max_page_size=1000,
+    cursor_ordering=('-created_at', '-id'),
 )
+
+
+class FeedPagination(PostsPagination):
+    """
+    Reads keyset pages of the viewer's home feed in order from the index of their feed entries,
+    merged with posts of authors pulled on read, instead of sorting all posts of the feed.
+    Entries are read in batches, their posts left out by the queryset (e.g. by filters) are skipped.
+    """
+    # fields of the cursor ordering denormalized onto feed entries
+    entry_fields = {'created_at': 'created_at', 'id': 'post_id'}
+
+    def get_keyset_page(self, queryset: QuerySet, ordering: list[str], position: list[Any] | None, limit: int) -> list:
+        profile = self.request.user.profile
+        pulled_posts = queryset.filter(author_id__in=FeedEntry.objects.get_pulled_author_ids(profile))
+        results = super().get_keyset_page(pulled_posts, ordering, position, limit)
+
+        entry_ordering = [
+            f"{'-' if field.startswith('-') else ''}{self.entry_fields[field.lstrip('-')]}" for field in ordering
+        ]
+        entry_names = [field.lstrip('-') for field in entry_ordering]
+        entries = FeedEntry.objects.filter(owner=profile).order_by(*entry_ordering).values_list(*entry_names)
+        entries_position = position
+        entries_results_count = 0
+
+        while entries_results_count < limit:
+            batch = entries
+            if entries_position is not None:
+                batch = batch.filter(self.get_cursor_filter(entry_ordering, entries_position))
+
+            batch = list(batch[:limit])
+            posts = list(queryset.filter(pk__in=[entry[entry_names.index('post_id')] for entry in batch]))
+            results.extend(posts)
+            entries_results_count += len(posts)
+
+            if len(batch) < limit:
+                break
+            entries_position = list(batch[-1])
+
+        def get_key(row: Post | dict) -> tuple:
+            return tuple(row[name] if isinstance(row, dict) else getattr(row, name) for name in self.entry_fields)
+
+        # posts of authors, who have been pulled on read since they were fanned out, come from both sources
+        unique_results = {get_key(row): row for row in results}.values()
+        return sorted(unique_results, key=get_key, reverse=ordering[0].startswith('-'))[:limit]
+
+
 CommentsPagination = page_number_pagination_factory(
     page_size=10,
     max_page_size=100,
+    cursor_ordering=('-created_at', '-id'),
 )
 
 
 class PostsViewSet(
+    ValuesListMixin,
+    ConditionalResponseMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -57,17 +126,27 @@ class PostsViewSet(
     PATCH   /api/posts/<str:slug>/
 
     DELETE  /api/posts/<str:slug>/
+
+    POST    /api/posts/<str:slug>/thumbnail/
     """
     permission_classes = [IsAuthenticatedOrReadOnly, IsPostAuthorPermission]
     serializer_class = PostSerializer
     pagination_class = PostsPagination
     filterset_class = PostsFilterSet
-    filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
+    filter_backends = [PostsSearchFilter, OrderingFilter, DjangoFilterBackend]
     search_fields = ('title', 'description', 'author__user__username', 'tags__tag')
     ordering_fields = ('id', 'created_at', 'updated_at')
     lookup_field = 'slug'
     lookup_url_kwarg = 'slug'
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
+    conditional_actions = ('list', 'list_feed', 'list_favourites', 'retrieve')
+    deferrable_fields = ('description', 'body', 'body_html')
+    values_serializer_classes = {
+        'list': PostListValuesSerializer,
+        'list_feed': PostListValuesSerializer,
+        'list_favourites': PostListValuesSerializer,
+        'comments': EmbeddedCommentValuesSerializer,
+    }
 
     def get_serializer_class(self):
         if self.action in ["list", "list_feed", "list_favourites"]:
@@ -82,20 +161,35 @@ class PostsViewSet(
         return super().get_serializer_class()
 
     def get_queryset(self) -> QuerySet[Post]:
+        if self.action in ["comments", "comments_detail"]:
+            slug = self.kwargs['slug']
+            return Comment.objects.filter(post__slug=slug).select_related('author', 'author__user')
+
         if self.action == "list_feed":
-            return Post.objects.filter(
-                author__in=self.request.user.profile.followed.all()
-            ).select_related('author', 'author__user').prefetch_related('tags')
+            queryset = FeedEntry.objects.get_feed(self.request.user.profile)
 
         elif self.action == "list_favourites":
-            return self.request.user.profile.favourites.select_related(
-                'author', 'author__user').prefetch_related('tags')
+            queryset = self.request.user.profile.favourites.all()
 
-        elif self.action in ["comments", "comments_detail"]:
-            slug = self.kwargs['slug']
-            return Comment.objects.filter(post__slug=slug).select_related('author', 'author__user')
+        else:
+            queryset = Post.objects.all()
+
+        queryset = queryset.select_related('author', 'author__user')
+        # tags are not loaded for sparse fieldsets without them
+        return queryset.prefetch_related('tags') if self.is_field_selected('tags') else queryset
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        context = super().get_serializer_context()
 
-        return Post.objects.select_related('author', 'author__user').prefetch_related('tags')
+        if self.action in ["list", "list_feed", "list_favourites"]:
+            # every post listed in favourites is favourited by the viewer,
+            # other lists resolve favourites of the whole page in one query
+            context[FAVOURITES_RESOLVER_CONTEXT_KEY] = FavouritesResolver.for_user(
+                self.request.user,
+                all_favourited=self.action == "list_favourites",
+            )
+
+        return context
 
     def get_serializer(self, *args: Any, **kwargs: Any):
         if self.action == "create":
@@ -103,9 +197,13 @@ class PostsViewSet(
 
         return super().get_serializer(*args, **kwargs)
 
+    def etag_parts_getter(self, instance: Post) -> tuple:
+        return get_post_etag_parts(instance, with_tags=self.is_field_selected('tags'))
+
     @action(
         methods=['GET'], detail=False,
         permission_classes=[IsAuthenticated],
+        pagination_class=FeedPagination,
         url_name='feed', url_path='feed',
     )
     def list_feed(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -135,6 +233,33 @@ class PostsViewSet(
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_200_OK, headers=headers)
 
+    @action(
+        methods=['POST'], detail=True,
+        url_name='thumbnail', url_path='thumbnail',
+        permission_classes=[IsAuthenticated, IsPostAuthorPermission],
+        serializer_class=PostThumbnailSerializer,
+        parser_classes=[MultiPartParser, ThumbnailUploadParser],
+    )
+    def thumbnail(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        post = self.get_object()
+        # files are streamed to disk in chunks, so that memory usage does not depend on their size
+        request.upload_handlers = [
+            LimitedTemporaryFileUploadHandler(request, max_size=settings.THUMBNAIL_MAX_UPLOAD_SIZE)
+        ]
+        try:
+            serializer = self.get_serializer(instance=post, data=request.data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        finally:
+            # storage moves uploaded temporary files away, so they have to be closed before they get collected
+            for file in request.FILES.values():
+                file.close()
+
+        return Response(
+            PostSerializer(post, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK
+        )
+
     @action(
         methods=['GET'], detail=True,
         url_name='comments', url_path='comments',
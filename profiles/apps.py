@@ -5,3 +5,6 @@ class ProfilesAppConfig(AppConfig):
     name = 'profiles'
     label = 'profiles'
     verbose_name = 'Profiles'
+
+    def ready(self):
+        import profiles.signals
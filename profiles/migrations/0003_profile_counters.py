@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 15:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_related(queryset, field_name: str):
+    """
+    Counts rows of `queryset` whose `field_name` references the outer row, in a subquery.
+    """
+    return Coalesce(Subquery(
+        queryset.filter(**{field_name: OuterRef('pk')}).order_by().values(field_name).annotate(
+            count=Count('*')
+        ).values('count')
+    ), 0)
+
+
+def recount_stats(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    Follows = Profile._meta.get_field('followed').remote_field.through
+    Favourites = Profile._meta.get_field('favourites').remote_field.through
+
+    Profile.objects.update(
+        posts_count=count_related(Post.objects.all(), 'author_id'),
+        followed_count=count_related(Follows.objects.all(), 'from_profile_id'),
+        followers_count=count_related(Follows.objects.all(), 'to_profile_id'),
+        favourites_count=count_related(Favourites.objects.all(), 'profile_id'),
+    )
+    Post.objects.update(
+        favourites_count=count_related(Favourites.objects.all(), 'post_id'),
+        comments_count=count_related(Comment.objects.all(), 'post_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_remove_profile_followers_profile_followed'),
+        ('posts', '0007_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='favourites_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-18 15:22
+
+from itertools import islice
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_feeds(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Post = apps.get_model('posts', 'Post')
+    FeedEntry = apps.get_model('profiles', 'FeedEntry')
+    Follows = Profile._meta.get_field('followed').remote_field.through
+
+    follows = Follows.objects.filter(
+        to_profile__followers_count__lt=settings.FEED_FAN_OUT_MAX_FOLLOWERS
+    ).values_list('from_profile_id', 'to_profile_id').iterator()
+    entries = (
+        FeedEntry(owner_id=owner_id, post_id=post_id, author_id=author_id)
+        for owner_id, author_id in follows
+        for post_id in Post.objects.filter(author_id=author_id).values_list('pk', flat=True)
+    )
+
+    while batch := list(islice(entries, 1000)):
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_search_vector'),
+        ('profiles', '0004_keyset_pagination_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profiles.profile')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='profiles.profile')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='posts.post')),
+            ],
+            options={
+                'verbose_name_plural': 'feed entries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['owner', 'author'], name='feed_entry_owner_author_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('owner', 'post'), name='feed_entry_owner_post_unique'),
+        ),
+        migrations.RunPython(fill_feeds, migrations.RunPython.noop),
+    ]
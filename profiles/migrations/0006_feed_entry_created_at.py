@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 18:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_posts_created_at(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    FeedEntry = apps.get_model('profiles', 'FeedEntry')
+    FeedEntry.objects.update(created_at=Subquery(
+        Post.objects.filter(pk=OuterRef('post_id')).values('created_at')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_body_html'),
+        ('profiles', '0005_feed_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedentry',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(copy_posts_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='feedentry',
+            name='created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['owner', '-created_at', '-post'], name='feed_entry_owner_created_idx'),
+        ),
+    ]
@@ -1 +1,2 @@
 from .profile import Profile
+from .feed import FeedEntry
@@ -0,0 +1,117 @@
+from collections.abc import Iterable
+from itertools import islice
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Exists, OuterRef, Q, QuerySet
+
+from posts.models import Post
+
+FEED_BATCH_SIZE = 1000
+
+
+def get_fan_out_limit() -> int:
+    """
+    Authors with at least that many followers are not fanned out on write,
+    their posts are pulled into the feeds on read instead.
+    """
+    return settings.FEED_FAN_OUT_MAX_FOLLOWERS
+
+
+class FeedEntryQuerySet(models.QuerySet):
+
+    def add_posts(self, owner_ids: Iterable[int], posts: QuerySet[Post]) -> None:
+        """
+        Inserts posts into the feeds of given profiles, skipping entries which already exist.
+        """
+        rows = list(posts.values_list('pk', 'author_id', 'created_at'))
+
+        if not rows:
+            return
+
+        entries = (
+            self.model(owner_id=owner_id, post_id=post_id, author_id=author_id, created_at=created_at)
+            for owner_id in owner_ids
+            for post_id, author_id, created_at in rows
+        )
+
+        while batch := list(islice(entries, FEED_BATCH_SIZE)):
+            self.bulk_create(batch, ignore_conflicts=True)
+
+    def backfill(self, owner_ids: Iterable[int], author_ids: Iterable[int]) -> None:
+        """
+        Copies all posts of given authors into the feeds of given profiles,
+        except for the authors pulled on read.
+        """
+        self.add_posts(owner_ids, Post.objects.filter(
+            author_id__in=author_ids,
+            author__followers_count__lt=get_fan_out_limit(),
+        ))
+
+    def prune(self, owner_ids: Iterable[int], author_ids: Iterable[int]) -> int:
+        """
+        Removes all posts of given authors from the feeds of given profiles.
+        """
+        deleted, _ = self.filter(owner_id__in=owner_ids, author_id__in=author_ids).delete()
+        return deleted
+
+    def get_pulled_author_ids(self, profile: models.Model) -> QuerySet:
+        """
+        Returns primary keys of authors followed by the profile, whose posts are pulled on read.
+        """
+        return profile.followed.filter(followers_count__gte=get_fan_out_limit()).values('pk')
+
+    def get_feed(self, profile: models.Model) -> QuerySet[Post]:
+        """
+        Returns posts from the profile's feed, merged with posts of followed authors pulled on read.
+
+        Entries are checked per post (by the unique owner and post index), so that the queryset can be
+        narrowed down to a few posts cheaply, e.g. to ones of entries read in order by `FeedPagination`.
+        """
+        return Post.objects.filter(
+            Q(Exists(self.filter(owner=profile, post_id=OuterRef('pk'))))
+            | Q(author_id__in=self.get_pulled_author_ids(profile))
+        )
+
+
+class FeedEntry(models.Model):
+    """
+    Post in the home feed of a profile, which follows the post's author.
+
+    Entries are written when a post is created (fan-out on write) and when a profile follows an author,
+    and deleted on unfollow. Posts of authors with very many followers are not fanned out,
+    see `get_fan_out_limit`.
+    """
+    owner = models.ForeignKey(
+        'profiles.Profile',
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    post = models.ForeignKey(
+        'posts.Post',
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    # denormalized post's author, so that unfollowing does not have to join posts
+    author = models.ForeignKey(
+        'profiles.Profile',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    # denormalized post's creation time, so that feeds are read in order from an index of entries
+    created_at = models.DateTimeField()
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'feed entries'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='feed_entry_owner_post_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'author'], name='feed_entry_owner_author_idx'),
+            models.Index(fields=['owner', '-created_at', '-post'], name='feed_entry_owner_created_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.owner_id} <- {self.post_id}'
@@ -1,10 +1,34 @@
 from django.db import models
+from django.db.models import OuterRef
 
-from core.shared.models import TimestampedModel
+from core.shared.expressions import SubqueryCount
+from core.shared.models import DenormalizedCountersMixin, TimestampedModel
 from posts.models import Post
 
+PROFILE_COUNTERS = ('posts_count', 'followed_count', 'followers_count', 'favourites_count')
 
-class Profile(TimestampedModel):
+
+class ProfileQuerySet(models.QuerySet):
+
+    def recount_stats(self, *counters: str) -> int:
+        """
+        Recalculates given (by default all) denormalized counters of profiles in a single UPDATE.
+        """
+        follows = self.model.followed.through.objects
+        favourites = self.model.favourites.through.objects
+        subqueries = {
+            'posts_count': lambda: Post.objects.filter(author_id=OuterRef('pk')),
+            'followed_count': lambda: follows.filter(from_profile_id=OuterRef('pk')),
+            'followers_count': lambda: follows.filter(to_profile_id=OuterRef('pk')),
+            'favourites_count': lambda: favourites.filter(profile_id=OuterRef('pk')),
+        }
+        return self.update(**{
+            counter: SubqueryCount(subqueries[counter]())
+            for counter in counters or PROFILE_COUNTERS
+        })
+
+
+class Profile(DenormalizedCountersMixin, TimestampedModel):
     user = models.OneToOneField(
         'accounts.User',
         on_delete=models.CASCADE
@@ -22,25 +46,24 @@ class Profile(TimestampedModel):
         related_name='favourited_by',
         blank=True
     )
+    # denormalized counters, maintained by signals
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    followed_count = models.PositiveIntegerField(default=0, editable=False)
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    favourites_count = models.PositiveIntegerField(default=0, editable=False)
 
-    def __str__(self) -> str:
-        return self.user.username
-
-    @property
-    def posts_count(self) -> int:
-        return self.posts.count()
+    counter_fields = PROFILE_COUNTERS
 
-    @property
-    def followed_count(self) -> int:
-        return self.followed.count()
+    objects = ProfileQuerySet.as_manager()
 
-    @property
-    def followers_count(self) -> int:
-        return self.followers.count()
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # backs keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='profile_created_at_id_idx'),
+        ]
 
-    @property
-    def favourites_count(self) -> int:
-        return self.favourites.count()
+    def __str__(self) -> str:
+        return self.user.username
 
     def follow(self, profile: 'Profile') -> None:
         self.followed.add(profile)
@@ -2,7 +2,21 @@ from django.contrib.auth.models import AnonymousUser
 from rest_framework import serializers
 
 from accounts.models import User
+from core.shared.serializers import PrefetchListSerializer
 from profiles.models import Profile
+from profiles.models.profile import PROFILE_COUNTERS
+from profiles.serializers.resolvers import get_follow_graph_resolver
+
+
+def get_profile_etag_parts(profile: Profile) -> tuple:
+    """
+    Versions of serialized fields of the profile, other than the viewer dependent ones.
+    `updated_at` does not change with counters and user fields, so they are included on their own.
+    """
+    return (
+        profile.pk, profile.updated_at, profile.user.username, profile.user.email,
+        *(getattr(profile, counter) for counter in PROFILE_COUNTERS),
+    )
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -30,26 +44,16 @@ class ProfileSerializer(serializers.ModelSerializer):
             'followers_count',
             'favourites_count',
         )
+        list_serializer_class = PrefetchListSerializer
 
-    def get_is_following_you(self, instance: Profile) -> bool:
-        user = self.user or self.context['request'].user
-
-        if user is None or not user.is_authenticated:
-            return False
+    def prefetch(self, instances: list[Profile]) -> None:
+        get_follow_graph_resolver(self).prefetch(profile.pk for profile in instances)
 
-        follower = instance
-        followee = user.profile
-        return follower.is_following(followee)
+    def get_is_following_you(self, instance: Profile) -> bool:
+        return get_follow_graph_resolver(self).is_following_viewer(instance.pk)
 
     def get_is_followed_by_you(self, instance: Profile) -> bool:
-        user = self.user or self.context['request'].user
-
-        if user is None or not user.is_authenticated:
-            return False
-
-        follower = user.profile
-        followee = instance
-        return followee.is_followed_by(follower)
+        return get_follow_graph_resolver(self).is_followed_by_viewer(instance.pk)
 
 
 class ProfileListSerializer(serializers.ModelSerializer):
@@ -70,26 +74,16 @@ class ProfileListSerializer(serializers.ModelSerializer):
             'is_following_you',
             'is_followed_by_you',
         )
+        list_serializer_class = PrefetchListSerializer
 
-    def get_is_following_you(self, instance: Profile) -> bool:
-        user = self.user or self.context['request'].user
-
-        if user is None or not user.is_authenticated:
-            return False
+    def prefetch(self, instances: list[Profile]) -> None:
+        get_follow_graph_resolver(self).prefetch(profile.pk for profile in instances)
 
-        follower = instance
-        followee = user.profile
-        return follower.is_following(followee)
+    def get_is_following_you(self, instance: Profile) -> bool:
+        return get_follow_graph_resolver(self).is_following_viewer(instance.pk)
 
     def get_is_followed_by_you(self, instance: Profile) -> bool:
-        user = self.user or self.context['request'].user
-
-        if user is None or not user.is_authenticated:
-            return False
-
-        follower = user.profile
-        followee = instance
-        return followee.is_followed_by(follower)
+        return get_follow_graph_resolver(self).is_followed_by_viewer(instance.pk)
 
 
 class EmbeddedProfileSerializer(ProfileSerializer):
@@ -104,3 +98,4 @@ class EmbeddedProfileSerializer(ProfileSerializer):
             'image',
             'is_followed_by_you',
         )
+        list_serializer_class = PrefetchListSerializer
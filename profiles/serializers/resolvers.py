@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+from rest_framework import serializers
+
+from accounts.models import User
+from core.shared.serializers import get_serializer_user
+from profiles.models import Profile
+
+FOLLOW_GRAPH_RESOLVER_CONTEXT_KEY = 'follow_graph_resolver'
+
+
+class FollowGraphResolver:
+    """
+    Resolves follow relations between a single viewer and many profiles.
+
+    Ids of profiles followed by and following the viewer are loaded with one query
+    (e.g. per page of profiles or post authors) and memoized, so that serializing a page
+    does not issue `is_following` / `is_followed_by` queries per profile.
+    """
+
+    def __init__(self, profile: Profile | None):
+        self.profile = profile
+        self._resolved_ids: set[int] = set()
+        self._followed_ids: set[int] = set()
+        self._follower_ids: set[int] = set()
+
+    @classmethod
+    def for_user(cls, user: User | AnonymousUser | None) -> 'FollowGraphResolver':
+        if user is None or not user.is_authenticated:
+            return cls(None)
+
+        return cls(user.profile)
+
+    def prefetch(self, profile_ids: Iterable[int]) -> None:
+        missing_ids = set(profile_ids) - self._resolved_ids
+
+        if not missing_ids or self.profile is None:
+            self._resolved_ids |= missing_ids
+            return
+
+        viewer_id = self.profile.pk
+        follows = Profile.followed.through.objects.filter(
+            Q(from_profile_id=viewer_id, to_profile_id__in=missing_ids) |
+            Q(to_profile_id=viewer_id, from_profile_id__in=missing_ids)
+        ).values_list('from_profile_id', 'to_profile_id')
+
+        for follower_id, followee_id in follows:
+            if follower_id == viewer_id:
+                self._followed_ids.add(followee_id)
+            if followee_id == viewer_id:
+                self._follower_ids.add(follower_id)
+
+        self._resolved_ids |= missing_ids
+
+    def _resolve(self, profile_id: int) -> bool:
+        if self.profile is None:
+            return False
+
+        if profile_id not in self._resolved_ids:
+            self.prefetch([profile_id])
+
+        return True
+
+    def is_followed_by_viewer(self, profile_id: int) -> bool:
+        return self._resolve(profile_id) and profile_id in self._followed_ids
+
+    def is_following_viewer(self, profile_id: int) -> bool:
+        return self._resolve(profile_id) and profile_id in self._follower_ids
+
+
+def get_follow_graph_resolver(serializer: serializers.BaseSerializer) -> FollowGraphResolver:
+    """
+    Returns resolver shared through the root serializer's context,
+    creating it for the serializer's user if it is not there yet.
+    """
+    context = serializer.context
+    resolver = context.get(FOLLOW_GRAPH_RESOLVER_CONTEXT_KEY)
+
+    if resolver is None:
+        resolver = FollowGraphResolver.for_user(get_serializer_user(serializer))
+        context[FOLLOW_GRAPH_RESOLVER_CONTEXT_KEY] = resolver
+
+    return resolver
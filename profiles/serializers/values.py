@@ -0,0 +1,47 @@
+from core.shared.values import ValuesSerializer
+from profiles.serializers.profile import EmbeddedProfileSerializer, ProfileListSerializer
+from profiles.serializers.resolvers import get_follow_graph_resolver
+
+
+class ProfileListValuesSerializer(ValuesSerializer):
+    serializer_class = ProfileListSerializer
+    fields = {
+        'id': 'id',
+        'username': 'user__username',
+        'image': 'image',
+    }
+    # cursor pagination reads positions from rows
+    extra_lookups = ('created_at',)
+
+    def prefetch(self, rows: list[dict]) -> None:
+        super().prefetch(rows)
+
+        if not (self.is_selected('is_following_you') or self.is_selected('is_followed_by_you')):
+            return
+
+        get_follow_graph_resolver(self).prefetch(row[f'{self.prefix}id'] for row in rows)
+
+    def get_is_following_you(self, row: dict) -> bool:
+        return get_follow_graph_resolver(self).is_following_viewer(row[f'{self.prefix}id'])
+
+    def get_is_followed_by_you(self, row: dict) -> bool:
+        return get_follow_graph_resolver(self).is_followed_by_viewer(row[f'{self.prefix}id'])
+
+
+class EmbeddedProfileValuesSerializer(ValuesSerializer):
+    serializer_class = EmbeddedProfileSerializer
+    fields = {
+        'id': 'id',
+        'username': 'user__username',
+        'email': 'user__email',
+        'image': 'image',
+    }
+
+    def prefetch(self, rows: list[dict]) -> None:
+        super().prefetch(rows)
+
+        if self.is_selected('is_followed_by_you'):
+            get_follow_graph_resolver(self).prefetch(row[f'{self.prefix}id'] for row in rows)
+
+    def get_is_followed_by_you(self, row: dict) -> bool:
+        return get_follow_graph_resolver(self).is_followed_by_viewer(row[f'{self.prefix}id'])
@@ -0,0 +1,206 @@
+from collections.abc import Iterable
+from typing import Any
+
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.shared.views import bump_viewer_versions
+from posts.models import Post
+from .models import FeedEntry, Profile
+from .models.feed import get_fan_out_limit
+
+Follows = Profile.followed.through
+Favourites = Profile.favourites.through
+
+
+def _get_changed_pks(instance: Profile | Post, accessor: str, action: str, pk_set: set[int] | None) -> set[int]:
+    # `clear()` does not pass primary keys of removed objects,
+    # so they are collected before the relation gets cleared
+    if action == 'pre_clear':
+        instance._cleared_pks = set(getattr(instance, accessor).values_list('pk', flat=True))
+        return set()
+
+    if action == 'post_clear':
+        return getattr(instance, '_cleared_pks', set())
+
+    return set(pk_set or ())
+
+
+@receiver(m2m_changed, sender=Follows)
+def update_follow_counters(
+        sender: type, instance: Profile, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if action not in ('pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+
+    accessor = 'followers' if reverse else 'followed'
+    changed_pks = _get_changed_pks(instance, accessor, action, pk_set)
+
+    if changed_pks:
+        Profile.objects.filter(pk__in={instance.pk, *changed_pks}).recount_stats(
+            'followed_count', 'followers_count'
+        )
+
+
+def _get_pulled_author_pks(author_pks: Iterable[int]) -> set[int]:
+    return set(Profile.objects.filter(
+        pk__in=author_pks, followers_count__gte=get_fan_out_limit()
+    ).values_list('pk', flat=True))
+
+
+def _fan_out_authors_below_limit(author_pks: Iterable[int]) -> None:
+    """
+    Copies posts of given authors, which used to be pulled on read, into the feeds of their followers
+    if they are no longer over the fan-out limit.
+    """
+    for author_pk in Profile.objects.filter(
+            pk__in=author_pks, followers_count__lt=get_fan_out_limit()
+    ).values_list('pk', flat=True):
+        FeedEntry.objects.backfill(
+            Follows.objects.filter(to_profile_id=author_pk).values_list('from_profile_id', flat=True),
+            [author_pk],
+        )
+
+
+@receiver(m2m_changed, sender=Follows)
+def update_feeds(
+        sender: type, instance: Profile, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    # connected after `update_follow_counters`, so that followers counts are already up to date
+    if action not in ('pre_remove', 'pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+
+    accessor = 'followers' if reverse else 'followed'
+    changed_pks = _get_changed_pks(instance, accessor, action, pk_set)
+
+    if action == 'pre_clear':
+        changed_pks = instance._cleared_pks
+
+    if not changed_pks:
+        return
+
+    owner_pks, author_pks = (changed_pks, {instance.pk}) if reverse else ({instance.pk}, changed_pks)
+
+    if action in ('pre_remove', 'pre_clear'):
+        # authors pulled on read before the change, any number of followers can be removed at once
+        instance._pulled_author_pks = _get_pulled_author_pks(author_pks)
+        return
+
+    if action == 'post_add':
+        FeedEntry.objects.backfill(owner_pks, author_pks)
+        return
+
+    FeedEntry.objects.prune(owner_pks, author_pks)
+    _fan_out_authors_below_limit(getattr(instance, '_pulled_author_pks', set()))
+
+
+@receiver(m2m_changed, sender=Follows)
+@receiver(m2m_changed, sender=Favourites)
+def invalidate_viewer_responses(
+        sender: type, instance: Profile | Post, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    # follows change responses of both sides (`is_followed_by_you` and `is_following_you`),
+    # favourites change responses of profiles who (un)favourited posts
+    if action not in ('pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+
+    if sender is Follows:
+        accessor = 'followers' if reverse else 'followed'
+    else:
+        accessor = 'favourited_by' if reverse else 'favourites'
+
+    changed_pks = _get_changed_pks(instance, accessor, action, pk_set)
+
+    if not changed_pks:
+        return
+
+    if sender is Follows:
+        bump_viewer_versions({instance.pk, *changed_pks})
+    else:
+        bump_viewer_versions(changed_pks if reverse else {instance.pk})
+
+
+@receiver(m2m_changed, sender=Favourites)
+def update_favourites_counters(
+        sender: type, instance: Profile | Post, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if action not in ('pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+
+    accessor = 'favourited_by' if reverse else 'favourites'
+    changed_pks = _get_changed_pks(instance, accessor, action, pk_set)
+
+    if not changed_pks:
+        return
+
+    profile_pks, post_pks = (changed_pks, {instance.pk}) if reverse else ({instance.pk}, changed_pks)
+    Profile.objects.filter(pk__in=profile_pks).recount_stats('favourites_count')
+    Post.objects.filter(pk__in=post_pks).recount_stats('favourites_count')
+
+
+@receiver(post_save, sender=Post)
+def increment_posts_count(sender: type, instance: Post, created: bool, **kwargs: Any) -> None:
+    if created:
+        Profile.objects.filter(pk=instance.author_id).update(posts_count=F('posts_count') + 1)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender: type, instance: Post, created: bool, **kwargs: Any) -> None:
+    if not created:
+        return
+
+    # empty for authors pulled on read
+    follower_pks = Follows.objects.filter(
+        to_profile_id=instance.author_id,
+        to_profile__followers_count__lt=get_fan_out_limit(),
+    ).values_list('from_profile_id', flat=True)
+    FeedEntry.objects.add_posts(follower_pks, Post.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=Post)
+def collect_post_favourites(sender: type, instance: Post, **kwargs: Any) -> None:
+    # favourites are deleted by cascade, which does not send `m2m_changed`
+    instance._favourited_by_pks = list(
+        Favourites.objects.filter(post_id=instance.pk).values_list('profile_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def decrement_posts_count(sender: type, instance: Post, **kwargs: Any) -> None:
+    Profile.objects.filter(pk=instance.author_id).update(
+        # rows created in bulk (without signals) may already have a zero counter
+        posts_count=Greatest(F('posts_count') - 1, 0)
+    )
+
+    if favourited_by_pks := getattr(instance, '_favourited_by_pks', None):
+        Profile.objects.filter(pk__in=favourited_by_pks).recount_stats('favourites_count')
+
+
+@receiver(pre_delete, sender=Profile)
+def collect_profile_relations(sender: type, instance: Profile, **kwargs: Any) -> None:
+    # follows and favourites are deleted by cascade, which does not send `m2m_changed`
+    instance._related_profile_pks = {
+        pk for pair in Follows.objects.filter(
+            Q(from_profile_id=instance.pk) | Q(to_profile_id=instance.pk)
+        ).values_list('from_profile_id', 'to_profile_id')
+        for pk in pair
+    }
+    instance._favourite_post_pks = list(
+        Favourites.objects.filter(profile_id=instance.pk).values_list('post_id', flat=True)
+    )
+    instance._pulled_author_pks = _get_pulled_author_pks(
+        Follows.objects.filter(from_profile_id=instance.pk).values_list('to_profile_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Profile)
+def recount_related_counters(sender: type, instance: Profile, **kwargs: Any) -> None:
+    if related_profile_pks := getattr(instance, '_related_profile_pks', None):
+        Profile.objects.filter(pk__in=related_profile_pks).recount_stats('followed_count', 'followers_count')
+        bump_viewer_versions(related_profile_pks - {instance.pk})
+        _fan_out_authors_below_limit(getattr(instance, '_pulled_author_pks', set()))
+
+    if favourite_post_pks := getattr(instance, '_favourite_post_pks', None):
+        Post.objects.filter(pk__in=favourite_post_pks).recount_stats('favourites_count')
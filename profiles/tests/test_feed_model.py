@@ -0,0 +1,118 @@
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from core.shared.factories import PostFactory, ProfileFactory
+from core.shared.unit_tests import TearDownFilesMixin
+from profiles.models import FeedEntry
+
+
+class FeedEntryModelTests(TearDownFilesMixin, TestCase):
+
+    def _feed_post_ids(self, profile) -> set[int]:
+        return set(FeedEntry.objects.get_feed(profile).values_list('pk', flat=True))
+
+    def test_post_is_fanned_out_to_followers(self):
+        author = ProfileFactory()
+        followers = ProfileFactory.create_batch(3)
+        author.followers.set(followers)
+
+        post = PostFactory(author=author)
+
+        for follower in followers:
+            self.assertEqual(self._feed_post_ids(follower), {post.pk})
+        self.assertEqual(self._feed_post_ids(author), set())
+
+    def test_follow_backfills_feed(self):
+        profile = ProfileFactory()
+        author = ProfileFactory()
+        posts = PostFactory.create_batch(3, author=author)
+        PostFactory()
+
+        profile.follow(author)
+
+        self.assertEqual(self._feed_post_ids(profile), {post.pk for post in posts})
+
+    def test_unfollow_prunes_feed(self):
+        profile = ProfileFactory()
+        author1, author2 = ProfileFactory.create_batch(2)
+        profile.followed.set([author1, author2])
+        PostFactory(author=author1)
+        post = PostFactory(author=author2)
+
+        profile.unfollow(author1)
+
+        self.assertEqual(self._feed_post_ids(profile), {post.pk})
+        self.assertFalse(FeedEntry.objects.filter(owner=profile, author=author1).exists())
+
+    def test_clear_followers_prunes_feeds(self):
+        author = ProfileFactory()
+        followers = ProfileFactory.create_batch(2)
+        author.followers.set(followers)
+        PostFactory(author=author)
+
+        author.followers.clear()
+
+        self.assertFalse(FeedEntry.objects.exists())
+
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=2)
+    def test_posts_of_authors_over_limit_are_pulled_on_read(self):
+        author = ProfileFactory()
+        followers = ProfileFactory.create_batch(2)
+        author.followers.set(followers)
+
+        post = PostFactory(author=author)
+
+        self.assertFalse(FeedEntry.objects.filter(post=post).exists())
+        for follower in followers:
+            self.assertEqual(self._feed_post_ids(follower), {post.pk})
+
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=2)
+    def test_author_dropping_below_limit_is_fanned_out(self):
+        author = ProfileFactory()
+        follower1, follower2 = ProfileFactory.create_batch(2)
+        author.followers.set([follower1, follower2])
+        post = PostFactory(author=author)
+
+        follower2.unfollow(author)
+
+        self.assertEqual(self._feed_post_ids(follower1), {post.pk})
+        self.assertTrue(FeedEntry.objects.filter(owner=follower1, post=post).exists())
+        self.assertEqual(self._feed_post_ids(follower2), set())
+
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=3)
+    def test_author_dropping_far_below_limit_is_fanned_out(self):
+        author = ProfileFactory()
+        remaining_follower, *followers = ProfileFactory.create_batch(4)
+        author.followers.set([remaining_follower, *followers])
+        post = PostFactory(author=author)
+
+        author.followers.remove(*followers)
+
+        self.assertEqual(self._feed_post_ids(remaining_follower), {post.pk})
+        self.assertTrue(FeedEntry.objects.filter(owner=remaining_follower, post=post).exists())
+
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=2)
+    def test_author_dropping_below_limit_by_clear_is_fanned_out(self):
+        author1, author2 = ProfileFactory.create_batch(2)
+        follower, other_follower = ProfileFactory.create_batch(2)
+        follower.followed.set([author1, author2])
+        other_follower.follow(author1)
+        post = PostFactory(author=author1)
+
+        follower.followed.clear()
+
+        self.assertEqual(self._feed_post_ids(other_follower), {post.pk})
+        self.assertTrue(FeedEntry.objects.filter(owner=other_follower, post=post).exists())
+        self.assertEqual(self._feed_post_ids(follower), set())
+
+    @override_settings(FEED_FAN_OUT_MAX_FOLLOWERS=3)
+    def test_author_dropping_below_limit_by_deleted_followers_is_fanned_out(self):
+        author = ProfileFactory()
+        remaining_follower, *followers = ProfileFactory.create_batch(4)
+        author.followers.set([remaining_follower, *followers])
+        post = PostFactory(author=author)
+
+        User.objects.filter(profile__in=followers).delete()
+
+        self.assertEqual(self._feed_post_ids(remaining_follower), {post.pk})
+        self.assertTrue(FeedEntry.objects.filter(owner=remaining_follower, post=post).exists())
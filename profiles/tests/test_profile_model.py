@@ -1,9 +1,11 @@
 from django.test import TestCase
 
 from core.shared.factories import ProfileFactory, PostFactory
+from core.shared.unit_tests import TearDownFilesMixin
+from profiles.models import Profile
 
 
-class ProfileModelTests(TestCase):
+class ProfileModelTests(TearDownFilesMixin, TestCase):
 
     def test_to_string(self):
         profile = ProfileFactory()
@@ -95,3 +97,60 @@ class ProfileModelTests(TestCase):
         self.assertFalse(profile.added_to_favourites(post))
         profile.remove_from_favourites(post)
         self.assertFalse(profile.added_to_favourites(post))
+
+    def test_followed_and_followers_count(self):
+        profile1, profile2, profile3 = ProfileFactory.create_batch(3)
+        profile1.follow(profile2)
+        profile1.follow(profile3)
+        profile2.followers.add(profile3)
+
+        for profile in (profile1, profile2, profile3):
+            profile.refresh_from_db()
+
+        self.assertEqual((profile1.followed_count, profile1.followers_count), (2, 0))
+        self.assertEqual((profile2.followed_count, profile2.followers_count), (0, 2))
+        self.assertEqual((profile3.followed_count, profile3.followers_count), (1, 1))
+
+        profile1.followed.clear()
+        profile2.delete()
+
+        profile1.refresh_from_db()
+        profile3.refresh_from_db()
+        self.assertEqual((profile1.followed_count, profile1.followers_count), (0, 0))
+        self.assertEqual((profile3.followed_count, profile3.followers_count), (0, 0))
+
+    def test_posts_and_favourites_count(self):
+        profile = ProfileFactory()
+        posts = PostFactory.create_batch(2, author=profile)
+        profile.favourites.add(*posts)
+        profile.refresh_from_db()
+        self.assertEqual(profile.posts_count, 2)
+        self.assertEqual(profile.favourites_count, 2)
+
+        posts[0].delete()
+        profile.refresh_from_db()
+        self.assertEqual(profile.posts_count, 1)
+        self.assertEqual(profile.favourites_count, 1)
+
+    def test_posts_count_does_not_go_below_zero(self):
+        profile = ProfileFactory()
+        post = PostFactory(author=profile)
+        Profile.objects.filter(pk=profile.pk).update(posts_count=0)
+
+        post.delete()
+        profile.refresh_from_db()
+        self.assertEqual(profile.posts_count, 0)
+
+    def test_recount_stats(self):
+        profile = ProfileFactory()
+        PostFactory(author=profile)
+        profile.followed.add(ProfileFactory())
+        Profile.objects.update(posts_count=10, followed_count=10, followers_count=10, favourites_count=10)
+
+        Profile.objects.all().recount_stats()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.posts_count, 1)
+        self.assertEqual(profile.followed_count, 1)
+        self.assertEqual(profile.followers_count, 0)
+        self.assertEqual(profile.favourites_count, 0)
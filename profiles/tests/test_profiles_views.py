@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 
@@ -106,7 +108,9 @@ class ProfileViewsTests(APITestCase):
             reverse_lazy('profiles:profiles-follow', kwargs={'username': profile2.user.username})
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile2.refresh_from_db()
         self.assertEqual(response.json(), ProfileSerializer(profile2, user=profile1.user).data)
+        self.assertEqual(response.json()['followers_count'], 1)
         self.assertTrue(profile1.is_following(profile2))
         self.assertTrue(profile2.is_followed_by(profile1))
 
@@ -130,7 +134,9 @@ class ProfileViewsTests(APITestCase):
             reverse_lazy('profiles:profiles-follow', kwargs={'username': profile2.user.username})
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile2.refresh_from_db()
         self.assertEqual(response.json(), ProfileSerializer(profile2, user=profile1.user).data)
+        self.assertEqual(response.json()['followers_count'], 0)
         self.assertFalse(profile1.is_following(profile2))
         self.assertFalse(profile2.is_followed_by(profile1))
 
@@ -150,7 +156,31 @@ class ProfileViewsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
     def test_list_followed(self):
-        pass
+        profile = ProfileFactory()
+        followed = ProfileFactory.create_batch(3)
+        profile.followed.set(followed)
+        followed[0].follow(profile)
+
+        self._require_jwt(profile.user)
+        response = self.client.get(
+            reverse_lazy('profiles:profiles-followed', kwargs={'username': profile.user.username})
+        )
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_json['count'], 3)
+        self.assertEqual(
+            response_json['results'],
+            ProfileListSerializer(profile.followed.all(), many=True, user=profile.user).data
+        )
+        self.assertEqual(
+            {result['id']: (result['is_followed_by_you'], result['is_following_you'])
+             for result in response_json['results']},
+            {
+                followed[0].id: (True, True),
+                followed[1].id: (True, False),
+                followed[2].id: (True, False),
+            }
+        )
 
     def test_list_followed_filter_by_username(self):
         pass
@@ -162,7 +192,86 @@ class ProfileViewsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
     def test_list_followers(self):
-        pass
+        profile = ProfileFactory()
+        followers = ProfileFactory.create_batch(3)
+        profile.followers.set(followers)
+
+        self._require_jwt(profile.user)
+        url = reverse_lazy('profiles:profiles-followers', kwargs={'username': profile.user.username})
+        # authenticated user is cached by the first request
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries_for_one_page_size:
+            self.client.get(url, {'page_size': 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        response_json = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_json['count'], 3)
+        self.assertEqual(
+            response_json['results'],
+            ProfileListSerializer(profile.followers.all(), many=True, user=profile.user).data
+        )
+        self.assertEqual(len(queries), len(queries_for_one_page_size))
 
     def test_list_followers_filter_by_username(self):
         pass
+
+
+class ProfileConditionalResponseTests(APITestCase):
+
+    def _get_profile_url(self, profile: Profile) -> str:
+        return reverse_lazy('profiles:profiles-detail', args=(profile.user.username,))
+
+    def test_retrieve_profile_not_modified(self):
+        profile = ProfileFactory()
+        etag = self.client.get(self._get_profile_url(profile))['ETag']
+
+        response = self.client.get(self._get_profile_url(profile), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_profile_etag_changes_with_follow(self):
+        profile = ProfileFactory()
+        viewer = ProfileFactory()
+        self._require_jwt(viewer.user)
+        etag = self.client.get(self._get_profile_url(profile))['ETag']
+
+        # changes `is_following_you` of the viewer
+        profile.follow(viewer)
+        response = self.client.get(self._get_profile_url(profile), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['is_following_you'])
+        self.assertEqual(response.json()['followed_count'], 1)
+
+    def test_retrieve_profile_etag_changes_with_username(self):
+        profile = ProfileFactory()
+        etag = self.client.get(self._get_profile_url(profile))['ETag']
+
+        profile.user.username = 'renamed'
+        profile.user.save()
+        response = self.client.get(self._get_profile_url(profile), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['username'], 'renamed')
+
+
+class ProfileSparseFieldsTests(APITestCase):
+
+    def test_retrieve_profile_omit_bio(self):
+        profile = ProfileFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse_lazy('profiles:profiles-detail', args=(profile.user.username,)), {'omit': 'bio'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('bio', response.json())
+        self.assertFalse(any('"profiles_profile"."bio"' in query['sql'] for query in queries))
+
+    def test_list_profiles_select_fields(self):
+        ProfileFactory.create_batch(3)
+
+        response = self.client.get(reverse_lazy('profiles:profiles-list'), {'fields': 'id,username'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(set(profile) == {'id', 'username'} for profile in response.json()['results']))
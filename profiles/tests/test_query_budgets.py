@@ -0,0 +1,86 @@
+from django.test import override_settings
+from rest_framework.reverse import reverse_lazy
+
+from core.shared.factories import PostFactory, ProfileFactory
+from core.shared.fabrication import fabricate_profiles
+from core.shared.unit_tests import APITestCase, TearDownFilesMixin
+from profiles.models import Profile
+
+
+@override_settings(VALUES_SERIALIZERS_ENABLED=False)
+class ProfilesViewSetQueryBudgetTests(TearDownFilesMixin, APITestCase):
+    profiles_url = reverse_lazy('profiles:profiles-list')
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ProfileFactory()
+        self._require_jwt(self.profile.user)
+
+    def create_followed_profiles(self, count: int, *, following_back: bool = False) -> list[int]:
+        """
+        Creates profiles followed by the viewer (following the viewer back, if requested),
+        so that `is_followed` has something to resolve.
+        """
+        profile_ids = fabricate_profiles(count, seed=Profile.objects.count())
+        Follows = Profile.followed.through
+        Follows.objects.bulk_create(
+            Follows(from_profile_id=self.profile.pk, to_profile_id=profile_id) for profile_id in profile_ids
+        )
+
+        if following_back:
+            Follows.objects.bulk_create(
+                Follows(from_profile_id=profile_id, to_profile_id=self.profile.pk) for profile_id in profile_ids
+            )
+
+        return profile_ids
+
+    def get_detail_url(self, action: str, profile: Profile) -> str:
+        return reverse_lazy(f'profiles:profiles-{action}', args=(profile.user.username,))
+
+    def test_list(self):
+        self.assertPageQueryBudget(4, self.profiles_url, self.create_followed_profiles)
+
+    def test_list_unauthorized(self):
+        self.client.credentials()
+        self.assertPageQueryBudget(2, self.profiles_url, self.create_followed_profiles)
+
+    def test_list_cursor_pagination(self):
+        self.assertPageQueryBudget(3, self.profiles_url, self.create_followed_profiles, {'pagination': 'cursor'})
+
+    def test_followed(self):
+        self.assertPageQueryBudget(6, self.get_detail_url('followed', self.profile), self.create_followed_profiles)
+
+    def test_followers(self):
+        self.assertPageQueryBudget(
+            6,
+            self.get_detail_url('followers', self.profile),
+            lambda count: self.create_followed_profiles(count, following_back=True),
+        )
+
+    @override_settings(VALUES_SERIALIZERS_ENABLED=True)
+    def test_list_values(self):
+        self.assertPageQueryBudget(4, self.profiles_url, self.create_followed_profiles)
+
+    @override_settings(VALUES_SERIALIZERS_ENABLED=True)
+    def test_followed_values(self):
+        self.assertPageQueryBudget(6, self.get_detail_url('followed', self.profile), self.create_followed_profiles)
+
+    @override_settings(VALUES_SERIALIZERS_ENABLED=True)
+    def test_followers_values(self):
+        self.assertPageQueryBudget(
+            6,
+            self.get_detail_url('followers', self.profile),
+            lambda count: self.create_followed_profiles(count, following_back=True),
+        )
+
+    def test_retrieve(self):
+        profile = PostFactory(with_thumbnail=False).author
+        self.profile.follow(profile)
+
+        self.assertQueryBudget(3, 'get', self.get_detail_url('detail', profile))
+
+    def test_follow(self):
+        url = self.get_detail_url('follow', ProfileFactory())
+
+        self.assertQueryBudget(8, 'post', url)
+        self.assertQueryBudget(8, 'delete', url)
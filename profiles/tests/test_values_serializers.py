@@ -0,0 +1,33 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.shared.factories import ProfileFactory
+from profiles.models import Profile
+from profiles.serializers import ProfileListSerializer
+from profiles.serializers.values import ProfileListValuesSerializer
+
+
+class ValuesSerializersEquivalenceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, *profiles = ProfileFactory.create_batch(4)
+        cls.viewer.follow(profiles[0])
+        profiles[1].follow(cls.viewer)
+        Profile.objects.filter(pk=profiles[2].pk).update(image='https://example.com/image.png')
+
+    def test_profile_list(self):
+        queryset = Profile.objects.select_related('user')
+
+        for user in (self.viewer.user, AnonymousUser()):
+            with self.subTest(user=user):
+                request = Request(APIRequestFactory().get('/'))
+                request.user = user
+
+                expected = ProfileListSerializer(queryset, many=True, context={'request': request}).data
+                data = ProfileListValuesSerializer(queryset, context={'request': request}).data
+
+                self.assertEqual(data, expected)
+                self.assertEqual([list(item) for item in data], [list(item) for item in expected])
@@ -8,20 +8,28 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from core.shared.pagination import page_number_pagination_factory
+from core.shared.views import ConditionalResponseMixin, SparseFieldsMixin, ValuesListMixin
 from profiles.filters.profile import ProfilesFilterSet
 from profiles.models import Profile
+from profiles.models.profile import PROFILE_COUNTERS
 from profiles.serializers import (
     ProfileSerializer,
     ProfileListSerializer
 )
+from profiles.serializers.profile import get_profile_etag_parts
+from profiles.serializers.values import ProfileListValuesSerializer
 
 ProfilesPagination = page_number_pagination_factory(
     page_size=25,
-    max_page_size=100
+    max_page_size=100,
+    cursor_ordering=('-created_at', '-id'),
 )
 
 
 class ProfilesViewSet(
+    ValuesListMixin,
+    ConditionalResponseMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
@@ -47,6 +55,13 @@ class ProfilesViewSet(
     pagination_class = ProfilesPagination
     lookup_url_kwarg = 'username'
     lookup_field = 'user__username'
+    deferrable_fields = ('bio',)
+    etag_parts_getter = staticmethod(get_profile_etag_parts)
+    values_serializer_classes = {
+        'list': ProfileListValuesSerializer,
+        'followers': ProfileListValuesSerializer,
+        'followed': ProfileListValuesSerializer,
+    }
 
     def get_queryset(self) -> QuerySet[Profile]:
         if self.action in ["followers", "followed"]:
@@ -77,6 +92,7 @@ class ProfilesViewSet(
         else:
             follower.unfollow(followee)
 
+        followee.refresh_from_db(fields=PROFILE_COUNTERS)
         serializer = self.get_serializer(followee)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -86,7 +102,7 @@ class ProfilesViewSet(
         permission_classes=[IsAuthenticated]
     )
     def followed(self, *args: Any, **kwargs: Any) -> Response:
-        queryset = self.get_object().followed.all()
+        queryset = self.get_object().followed.select_related('user')
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
@@ -97,7 +113,7 @@ class ProfilesViewSet(
         permission_classes=[IsAuthenticated]
     )
     def followers(self, *args: Any, **kwargs: Any) -> Response:
-        queryset = self.get_object().followers.all()
+        queryset = self.get_object().followers.select_related('user')
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)